@@ -1,6 +1,9 @@
 import fastapi
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 from pathlib import Path
 import dotenv
 
@@ -16,8 +19,27 @@ if not logging.getLogger().handlers:
     )
 logger = logging.getLogger(__name__)
 
+# Open connections to the provider APIs and Serper at startup
+HTTP_PREWARM_ENABLED = os.getenv("HTTP_PREWARM_ENABLED", "true").lower() == "true"
+
+@asynccontextmanager
+async def lifespan(app: fastapi.FastAPI):
+    # Resume parsing runs on a dedicated worker pool (PyMuPDF in its own processes)
+    resume_worker_pool.start(db.supabase, db.llm)
+    # Runs in the background so a slow or unreachable host doesn't hold up startup
+    prewarm_task = None
+    if HTTP_PREWARM_ENABLED:
+        prewarm_urls = [get_provider(name).api_base_url for name in PROVIDER_REGISTRY] + [SERPER_API_URL]
+        prewarm_task = asyncio.create_task(http_client.prewarm(prewarm_urls))
+    yield
+    if prewarm_task:
+        prewarm_task.cancel()
+    await resume_worker_pool.stop()
+    await http_client.close()
+
+
 # Creating the FastAPI backend
-app = fastapi.FastAPI()
+app = fastapi.FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -30,6 +52,10 @@ app.add_middleware(
 
 # Include routers
 from app.routes import auth, db, extension, discovery, sync, jobs
+from app.services.resume_worker import resume_worker_pool
+from app.services.http_client import http_client
+from app.services.job_providers import get_provider, PROVIDER_REGISTRY
+from app.services.serper import SERPER_API_URL
 
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(db.router, prefix="/db", tags=["db"])
@@ -0,0 +1,194 @@
+"""
+Main-content isolation for job pages.
+
+Sits between clean_content and extract_jd_fields so only the posting body reaches the
+LLM: a schema.org JobPosting JSON-LD block is used directly when the page
+embeds one, otherwise the cleaned text is reduced to its densest run of lines
+(navbars, cookie banners, "similar jobs" lists and footers score negative, while
+the short headings and bullets inside a posting are kept), and the result is
+capped at a hard token budget.
+"""
+from html import unescape
+from typing import Optional, List, Any
+import json
+import logging
+import re
+
+from app.html_text import html_to_text
+from app.prompt_builder import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+JD_CONTENT_TOKEN_BUDGET = 3000
+# Below this the density pick isn't trusted and the whole cleaned text is used
+MIN_ISOLATED_WORDS = 80
+# Lines shorter than this many words (nav links, buttons, menu items) score negative
+# outside the posting; inside a run they are neutral (headings, skill bullets)
+SHORT_LINE_WORDS = 5
+BOILERPLATE_PENALTY = 20
+# A longer streak of short lines inside a run is a link list, not bullets, and scores negative again
+MAX_NEUTRAL_SHORT_LINES = 30
+# Short lines just above the run (title, location, salary, first heading) that are kept with it
+MAX_LEADING_LINES = 5
+
+_JSON_LD_RE = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_BOILERPLATE_RE = re.compile(
+    r"\bcookies?\b|privacy (policy|notice)|terms of (use|service)|all rights reserved|©|"
+    r"\b(similar|related|other|more|recommended) (jobs|roles|openings|positions)\b|"
+    r"\b(sign|log) (in|up)\b|\bsubscribe\b|powered by|\bshare (this|on)\b|back to (all )?jobs|"
+    r"^\s*(accept|reject|decline)( all)?\s*$",
+    re.IGNORECASE,
+)
+
+
+def _iter_json_ld_nodes(data: Any):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_json_ld_nodes(data["@graph"])
+
+
+def _is_job_posting(node: dict) -> bool:
+    node_type = node.get("@type")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return "JobPosting" in types
+
+
+def find_job_posting_json_ld(html: str) -> Optional[dict]:
+    """The first schema.org JobPosting embedded as JSON-LD, or None."""
+    if not html or "ld+json" not in html:
+        return None
+    for match in _JSON_LD_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip(), strict=False)
+        except json.JSONDecodeError:
+            continue
+        for node in _iter_json_ld_nodes(data):
+            if _is_job_posting(node):
+                return node
+    return None
+
+
+def _location_text(posting: dict) -> Optional[str]:
+    locations = posting.get("jobLocation")
+    if isinstance(locations, dict):
+        locations = [locations]
+    parts: List[str] = []
+    for location in locations or []:
+        address = location.get("address") if isinstance(location, dict) else None
+        if isinstance(address, dict):
+            line = ", ".join(
+                str(address[k]) for k in ("addressLocality", "addressRegion", "addressCountry")
+                if isinstance(address.get(k), (str, int))
+            )
+            if line:
+                parts.append(line)
+        elif isinstance(address, str):
+            parts.append(address)
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        parts.append("Remote")
+    return "; ".join(parts) or None
+
+
+def job_posting_description_text(posting: dict) -> str:
+    """Plain text of a JobPosting description (which is usually HTML, often entity-escaped)."""
+    description = posting.get("description") or ""
+    if not isinstance(description, str):
+        return ""
+    if "&lt;" in description:
+        description = unescape(description)
+    return html_to_text(description)
+
+
+def job_posting_to_text(posting: dict) -> str:
+    """Render a JSON-LD JobPosting as compact labelled text for the JD prompt."""
+    organization = posting.get("hiringOrganization")
+    company = organization.get("name") if isinstance(organization, dict) else organization
+    employment_type = posting.get("employmentType")
+    if isinstance(employment_type, list):
+        employment_type = ", ".join(str(t) for t in employment_type)
+
+    header = [
+        ("Job title", posting.get("title")),
+        ("Company", company),
+        ("Date posted", posting.get("datePosted")),
+        ("Location", _location_text(posting)),
+        ("Employment type", employment_type),
+    ]
+    lines = [f"{label}: {value}" for label, value in header if isinstance(value, str) and value]
+    lines.append(job_posting_description_text(posting))
+    return "\n".join(lines)
+
+
+def select_main_content(text: str) -> str:
+    """
+    Text-density scoring over the cleaned page lines (one line per block element).
+    Each line scores its word count minus SHORT_LINE_WORDS, boilerplate lines score
+    strongly negative, and the maximum-sum run of consecutive lines is kept. Once a
+    run has started, short lines (section headings, one-word skill bullets) score
+    zero and extend it, so only boilerplate or a long link list ends the posting;
+    up to MAX_LEADING_LINES short lines right above the run (title, location,
+    salary) are kept too. The page's first line (the document title) is kept for
+    the company/job name.
+    """
+    lines = text.split("\n")
+    boilerplate = [bool(_BOILERPLATE_RE.search(line)) for line in lines]
+    best_sum, best_start, best_end = 0, 0, -1
+    run_sum, run_start, short_streak = 0, 0, 0
+    for i, line in enumerate(lines):
+        words = len(line.split())
+        if boilerplate[i]:
+            score = -(words + BOILERPLATE_PENALTY)
+        elif words >= SHORT_LINE_WORDS:
+            score = words - SHORT_LINE_WORDS
+        elif run_sum > 0 and short_streak < MAX_NEUTRAL_SHORT_LINES:
+            score = 0
+        else:
+            score = words - SHORT_LINE_WORDS
+        short_streak = short_streak + 1 if words < SHORT_LINE_WORDS else 0
+        if run_sum <= 0:
+            run_sum, run_start = score, i
+        else:
+            run_sum += score
+        # Ties extend the best run, so trailing neutral bullets stay in
+        if run_sum > best_sum or (run_sum == best_sum and best_end >= 0 and run_start == best_start):
+            best_sum, best_start, best_end = run_sum, run_start, i
+
+    if best_end < 0:
+        return text
+    start = best_start
+    while start > 1 and best_start - start < MAX_LEADING_LINES and not boilerplate[start - 1]:
+        start -= 1
+    selected = lines[start:best_end + 1]
+    if sum(len(line.split()) for line in selected) < MIN_ISOLATED_WORDS:
+        return text
+    if start > 0:
+        selected.insert(0, lines[0])
+    return "\n".join(selected)
+
+
+def isolate_job_content(html: Optional[str], cleaned_content: Optional[str] = None) -> str:
+    """
+    Reduce a job page to its posting body, capped at JD_CONTENT_TOKEN_BUDGET tokens.
+    `cleaned_content` is clean_content(html) when the caller already has it.
+    """
+    posting = find_job_posting_json_ld(html or "")
+    if posting and posting.get("description"):
+        content, source = job_posting_to_text(posting), "json-ld"
+    else:
+        if cleaned_content is None:
+            cleaned_content = html_to_text(html or "")
+        content, source = select_main_content(cleaned_content), "density"
+
+    isolated = truncate_to_tokens(content, JD_CONTENT_TOKEN_BUDGET) or ""
+    logger.info(
+        f"Isolated JD content via {source}: {len(isolated)} chars "
+        f"(cleaned: {len(cleaned_content) if cleaned_content is not None else 'n/a'} chars)"
+    )
+    return isolated
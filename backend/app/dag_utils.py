@@ -1,6 +1,9 @@
 from __future__ import annotations
-from typing import TypedDict, NotRequired, Optional, Literal, List, Dict, Any, Set
+from collections import defaultdict
+from functools import lru_cache
+from typing import TypedDict, NotRequired, Optional, Literal, List, Dict, Any, Set, Sequence, Tuple
 import logging
+import re
 from pydantic import BaseModel, Field
 
 
@@ -14,8 +17,8 @@ STANDARD_COUNTRIES = [
     "Bolivia", "Bosnia and Herzegovina", "Botswana", "Brazil", "Brunei", "Bulgaria",
     "Burkina Faso", "Burundi", "Cabo Verde", "Cambodia", "Cameroon", "Canada",
     "Central African Republic", "Chad", "Chile", "China", "Colombia", "Comoros",
-    "Congo", "Costa Rica", "Croatia", "Cuba", "Cyprus", "Czech Republic", "Czechia",
-    "Denmark", "Djibouti", "Dominica", "Dominican Republic", "Ecuador", "Egypt",
+    "Congo", "Costa Rica", "Cote d'Ivoire", "Croatia", "Cuba", "Cyprus", "Czech Republic", "Czechia",
+    "Democratic Republic of the Congo", "Denmark", "Djibouti", "Dominica", "Dominican Republic", "Ecuador", "Egypt",
     "El Salvador", "Equatorial Guinea", "Eritrea", "Estonia", "Eswatini", "Ethiopia",
     "Fiji", "Finland", "France", "Gabon", "Gambia", "Georgia", "Germany", "Ghana",
     "Greece", "Grenada", "Guatemala", "Guinea", "Guinea-Bissau", "Guyana", "Haiti",
@@ -43,7 +46,7 @@ STANDARD_COUNTRIES = [
 # enums for various state variables
 InputType = Literal["text", "textarea", "select", "radio", "checkbox", "date", "number", "email", "password", "file", "tel", "url", "hidden", "unknown"]
 AnswerAction = Literal["autofill", "suggest", "skip"]
-RunStatus = Literal["running", "completed", "failed"]
+RunStatus = Literal["running", "completed", "failed", "provisional"]
 
 # classes for DAG state representation
 class FormField(TypedDict):
@@ -59,7 +62,7 @@ class FormField(TypedDict):
 
 class FormFieldAnswer(TypedDict):
     value: Any
-    source: NotRequired[Literal["profile", "resume", "jd", "llm", "unknown"]]
+    source: NotRequired[Literal["profile", "resume", "jd", "llm", "prior_run", "unknown"]]
     confidence: float  # 0.0 to 1.0
     action: AnswerAction
 
@@ -243,6 +246,101 @@ def summarize_autofill_plan(plan_json: AutofillPlanJSON) -> AutofillPlanSummary:
     }
 
 
+def answers_from_plan(plan_json: Optional[AutofillPlanJSON]) -> Dict[str, FormFieldAnswer]:
+    """Recover per-field answers from a stored plan, keyed by question_signature."""
+    answers: Dict[str, FormFieldAnswer] = {}
+    for f in (plan_json or {}).get("fields", []):
+        sig = f.get("question_signature")
+        if not sig:
+            continue
+        answers[sig] = {
+            "value": f.get("value"),
+            "source": f.get("source") or "unknown",
+            "confidence": f.get("confidence") or 0.0,
+            "action": f.get("action") or "autofill",
+        }
+    return answers
+
+
+def reconcile_answers(
+    form_fields: List[FormField],
+    answers: Dict[str, FormFieldAnswer],
+) -> Dict[str, FormFieldAnswer]:
+    """
+    Re-map stored answers onto the given fields' options (the live page may
+    label or value its options differently from the page the answers were made for).
+    """
+    out: Dict[str, FormFieldAnswer] = {}
+    for f in form_fields:
+        sig = f.get("question_signature")
+        answer = answers.get(sig)
+        if answer is None:
+            continue
+        answer = dict(answer)
+        options = f.get("options") or []
+        if f.get("input_type") in {"select", "radio", "checkbox"} and options:
+            match = get_option_index(options).match(answer.get("value"), fuzzy=True)
+            if match is not None:
+                answer["value"] = match
+        out[sig] = answer
+    return out
+
+
+def reuse_prior_answers(
+    form_fields: List[FormField],
+    prior_plan_fields: Optional[List[PlanField]],
+) -> Tuple[Dict[str, FormFieldAnswer], List[FormField]]:
+    """
+    Diff the current fields against a previous run's plan fields.
+
+    A prior answer is reused when the question_signature, input_type and label all
+    match (signatures can be positional, e.g. field_{idx}, and collide across pages)
+    and it carried a value (or was a deliberate skip). Option answers are re-mapped
+    onto the current options. Returns (reused answers, fields still needing an answer).
+    """
+    prior_by_sig = {
+        f.get("question_signature"): f
+        for f in (prior_plan_fields or [])
+        if f.get("question_signature")
+    }
+    reusable: Dict[str, FormFieldAnswer] = {}
+    pending: List[FormField] = []
+    for f in form_fields:
+        sig = f.get("question_signature")
+        prior = prior_by_sig.get(sig)
+        if (
+            prior is None
+            or prior.get("input_type") != f.get("input_type")
+            or (prior.get("label") or "").strip() != (f.get("label") or "").strip()
+            or (prior.get("value") is None and prior.get("action") != "skip")
+        ):
+            pending.append(f)
+            continue
+        reusable[sig] = {
+            "value": prior.get("value"),
+            "source": "prior_run",
+            "confidence": prior.get("confidence") or 0.0,
+            "action": prior.get("action") or "autofill",
+        }
+
+    reused = reconcile_answers(form_fields, reusable)
+    # An option answer that no longer matches any current option is asked again
+    for f in form_fields:
+        sig = f.get("question_signature")
+        options = f.get("options") or []
+        answer = reused.get(sig)
+        if (
+            answer is not None
+            and answer.get("action") != "skip"
+            and f.get("input_type") in {"select", "radio"}
+            and options
+            and answer.get("value") not in options
+        ):
+            del reused[sig]
+            pending.append(f)
+    return reused, pending
+
+
 def _enrich_country_fields(fields: List[FormField]) -> List[FormField]:
     """
     Enrich select fields that appear to be country selectors with standard country options.
@@ -290,3 +388,227 @@ def _normalize_answer(answer: Optional[FormFieldAnswer]) -> FormFieldAnswer:
         "confidence": conf,
         "action": action,
     }
+
+
+# Option matching for select/radio/checkbox answers
+
+_OPTION_WS_RE = re.compile(r"\s+")
+_OPTION_STRIP_RE = re.compile(r"[^a-z0-9 ]+")
+
+# Country names and codes the LLM (or a profile) commonly answers with, normalized, mapped to
+# the STANDARD_COUNTRIES spelling. Used only when that country is among a field's options.
+# Two-letter codes that are also English words ("in", "no", "it", "is", "me") are left out
+COUNTRY_ALIASES: Dict[str, str] = {
+    "us": "United States", "u s": "United States", "usa": "United States", "u s a": "United States",
+    "united states of america": "United States", "america": "United States", "the united states": "United States",
+    "uk": "United Kingdom", "u k": "United Kingdom", "gb": "United Kingdom", "gbr": "United Kingdom",
+    "great britain": "United Kingdom", "britain": "United Kingdom", "england": "United Kingdom",
+    "scotland": "United Kingdom", "wales": "United Kingdom", "northern ireland": "United Kingdom",
+    "the united kingdom": "United Kingdom",
+    "uae": "United Arab Emirates", "u a e": "United Arab Emirates", "emirates": "United Arab Emirates",
+    "republic of korea": "South Korea", "korea republic of": "South Korea", "korea south": "South Korea",
+    "rok": "South Korea", "kor": "South Korea",
+    "democratic peoples republic of korea": "North Korea", "dprk": "North Korea", "korea north": "North Korea",
+    "russian federation": "Russia", "rus": "Russia",
+    "ivory coast": "Cote d'Ivoire", "cote divoire": "Cote d'Ivoire",
+    "drc": "Democratic Republic of the Congo", "dr congo": "Democratic Republic of the Congo",
+    "congo kinshasa": "Democratic Republic of the Congo", "republic of the congo": "Congo",
+    "congo brazzaville": "Congo",
+    "holland": "Netherlands", "the netherlands": "Netherlands", "nld": "Netherlands", "nl": "Netherlands",
+    "deutschland": "Germany", "de": "Germany", "deu": "Germany",
+    "fr": "France", "fra": "France",
+    "ca": "Canada", "can": "Canada",
+    "ind": "India", "bharat": "India",
+    "cn": "China", "chn": "China", "prc": "China", "peoples republic of china": "China",
+    "mainland china": "China",
+    "republic of china": "Taiwan", "twn": "Taiwan",
+    "jp": "Japan", "jpn": "Japan",
+    "au": "Australia", "aus": "Australia",
+    "nz": "New Zealand", "nzl": "New Zealand",
+    "mx": "Mexico", "mex": "Mexico",
+    "br": "Brazil", "bra": "Brazil", "brasil": "Brazil",
+    "es": "Spain", "esp": "Spain", "espana": "Spain",
+    "ie": "Ireland", "irl": "Ireland", "republic of ireland": "Ireland",
+    "ch": "Switzerland", "che": "Switzerland",
+    "se": "Sweden", "swe": "Sweden",
+    "sg": "Singapore", "sgp": "Singapore",
+    "il": "Israel", "isr": "Israel",
+    "pl": "Poland", "pol": "Poland",
+    "pt": "Portugal", "prt": "Portugal",
+    "ph": "Philippines", "phl": "Philippines",
+    "pk": "Pakistan", "pak": "Pakistan",
+    "ng": "Nigeria", "nga": "Nigeria",
+    "za": "South Africa", "zaf": "South Africa", "rsa": "South Africa",
+    "ua": "Ukraine", "ukr": "Ukraine",
+    "vn": "Vietnam", "viet nam": "Vietnam",
+    "turkiye": "Turkey",
+    "czech": "Czech Republic",
+    "macedonia": "North Macedonia",
+    "burma": "Myanmar",
+    "swaziland": "Eswatini",
+    "cape verde": "Cabo Verde",
+    "east timor": "Timor-Leste",
+    "holy see": "Vatican City",
+    "state of palestine": "Palestine",
+    "lao pdr": "Laos",
+    "syrian arab republic": "Syria",
+    "iran islamic republic of": "Iran",
+}
+
+# Answers meaning "no answer"; never mapped onto an option they merely resemble ("N/A" -> "Namibia")
+_NON_ANSWERS = frozenset({"n a", "na", "none", "null", "nil", "unknown", "not applicable", "prefer not to say"})
+
+# Max number of distinct option lists kept indexed (shared lists stay hot)
+OPTION_INDEX_CACHE_SIZE = 256
+# Shortest token prefix indexed, e.g. "ca" -> "Canada", "Cabo Verde"
+OPTION_PREFIX_MIN_LEN = 2
+# Minimum 1 - edit_distance / max_len for a fuzzy match ("Untied States" -> "United States")
+OPTION_FUZZY_MIN_SIMILARITY = 0.8
+
+
+def normalize_option_text(text: Any) -> str:
+    """Lowercase, collapse whitespace and strip everything but [a-z0-9 ]."""
+    text = "" if text is None else str(text)
+    text = _OPTION_WS_RE.sub(" ", text.strip().lower())
+    return _OPTION_STRIP_RE.sub("", text)
+
+
+def _bounded_edit_distance(a: str, b: str, max_dist: int) -> int:
+    """Levenshtein distance, returning max_dist + 1 as soon as it is exceeded."""
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > max_dist:
+            return max_dist + 1
+        previous = current
+    return previous[-1]
+
+
+class OptionIndex:
+    """
+    Lookup structure for matching a free-form answer onto a fixed option list.
+
+    Options are normalized once; matching then uses an exact-match hash, a
+    token index and a token-prefix index to find containment candidates, and
+    optionally falls back to edit-distance scoring. Build via get_option_index()
+    so identical option lists share one index.
+    """
+
+    def __init__(self, options: Sequence[str]):
+        self.options: Tuple[str, ...] = tuple(options)
+        self._normalized: List[str] = [normalize_option_text(opt) for opt in self.options]
+        self._exact: Dict[str, int] = {}
+        self._tokens: Dict[str, Set[int]] = defaultdict(set)
+        self._prefixes: Dict[str, Set[int]] = defaultdict(set)
+
+        for idx, norm in enumerate(self._normalized):
+            if not norm:
+                continue
+            self._exact.setdefault(norm, idx)
+            for token in norm.split():
+                self._tokens[token].add(idx)
+                for end in range(OPTION_PREFIX_MIN_LEN, len(token) + 1):
+                    self._prefixes[token[:end]].add(idx)
+
+    def match(
+        self,
+        value: Any,
+        fuzzy: bool = False,
+        min_similarity: float = OPTION_FUZZY_MIN_SIMILARITY,
+    ) -> Optional[str]:
+        """
+        Return the option best matching value, or None.
+
+        Order: exact normalized match, then a country alias or code ("USA", "UK")
+        whose country is an option, then the longest option contained in the value
+        (first option wins ties), then the only option containing the value (a
+        partial value found in several options, "Korea", is ambiguous and not
+        matched), then (if fuzzy) the most similar option by edit distance.
+        Non-answers such as "N/A" only match an option spelled the same way.
+        """
+        if value is None:
+            return None
+        target = normalize_option_text(value)
+        if not target:
+            return None
+
+        idx = self._exact.get(target)
+        if idx is not None:
+            return self.options[idx]
+        if target in _NON_ANSWERS:
+            return None
+
+        country = COUNTRY_ALIASES.get(target)
+        if country is not None:
+            country_target = normalize_option_text(country)
+            idx = self._exact.get(country_target)
+            if idx is not None:
+                return self.options[idx]
+            # e.g. "USA" against an option list spelling it "United States of America"
+            target = country_target
+
+        candidates: Set[int] = set()
+        for token in target.split():
+            candidates |= self._tokens.get(token, set())
+            candidates |= self._prefixes.get(token, set())
+
+        best = None
+        best_len = 0
+        containing = []
+        for idx in sorted(candidates):
+            norm = self._normalized[idx]
+            if norm in target:
+                if len(norm) > best_len:
+                    best = idx
+                    best_len = len(norm)
+            elif target in norm:
+                containing.append(idx)
+        if best is not None:
+            return self.options[best]
+        if len(containing) == 1:
+            return self.options[containing[0]]
+        if containing:
+            return None
+
+        if fuzzy:
+            return self._fuzzy_match(target, min_similarity)
+        return None
+
+    def _fuzzy_match(self, target: str, min_similarity: float) -> Optional[str]:
+        best = None
+        best_similarity = min_similarity
+        for idx, norm in enumerate(self._normalized):
+            if not norm:
+                continue
+            longest = max(len(norm), len(target))
+            max_dist = int(longest * (1 - min_similarity))
+            dist = _bounded_edit_distance(target, norm, max_dist)
+            if dist > max_dist:
+                continue
+            similarity = 1 - dist / longest
+            if similarity > best_similarity or (best is None and similarity >= best_similarity):
+                best = idx
+                best_similarity = similarity
+        return self.options[best] if best is not None else None
+
+
+@lru_cache(maxsize=OPTION_INDEX_CACHE_SIZE)
+def _cached_option_index(options: Tuple[str, ...]) -> OptionIndex:
+    return OptionIndex(options)
+
+
+def get_option_index(options: Sequence[str]) -> OptionIndex:
+    """Get the (cached) OptionIndex for an option list."""
+    return _cached_option_index(tuple(options))
+
+
+# Country selects are enriched with the same list on every form; index it once up front
+get_option_index(STANDARD_COUNTRIES)
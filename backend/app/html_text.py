@@ -0,0 +1,130 @@
+"""
+Single-pass HTML-to-text extraction for job pages.
+
+One compiled lexer walks the document once, left to right: script/style/
+noscript/svg/template bodies are skipped by jumping straight to their closing
+tag, block-level tags become line breaks, other tags and comments are dropped,
+and each text run is entity-decoded and whitespace-collapsed as it is emitted.
+Only the output text is allocated, instead of a full copy of the DOM per regex
+substitution.
+"""
+from html import unescape
+from typing import List
+import re
+
+# Elements whose content never belongs in the page text
+SKIPPED_TAGS = ("script", "style", "noscript", "svg", "template", "iframe", "object")
+
+# Elements that start/end a line
+BLOCK_TAGS = (
+    "address", "article", "aside", "blockquote", "br", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "option", "p", "pre", "section", "summary",
+    "table", "tbody", "td", "tfoot", "th", "thead", "title", "tr", "ul",
+)
+
+_SKIP_ALT = "|".join(SKIPPED_TAGS)
+_BLOCK_ALT = "|".join(BLOCK_TAGS)
+
+# A text run is text plus any inline tags up to the next block tag, skipped tag or
+# comment, so a paragraph with links and emphasis is one token rather than one per tag
+_TOKEN_RE = re.compile(
+    r"(?P<text>(?:[^<]+|<(?!/?(?:" + _BLOCK_ALT + "|" + _SKIP_ALT + r")\b)[!?/]?[a-zA-Z][^>]*>)+)"
+    r"|<(?P<skip>" + _SKIP_ALT + r")\b[^>]*>"
+    r"|(?P<block></?(?:" + _BLOCK_ALT + r")\b[^>]*>)"
+    r"|(?P<comment><!--)"
+    r"|(?P<other></?[a-zA-Z][^>]*>)"
+    r"|<",
+    re.IGNORECASE,
+)
+_INLINE_TAG_RE = re.compile(r"<[^>]*>")
+_CLOSING_TAG_RES = {tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in SKIPPED_TAGS}
+
+
+def _skip_element(content: str, tag: str, pos: int) -> int:
+    """Position just past the closing tag of a skipped element (or end of input)."""
+    close = content.find(f"</{tag}", pos)
+    if close != -1:
+        end = content.find(">", close)
+        return len(content) if end == -1 else end + 1
+    # Uppercase or otherwise unusual closing tag
+    match = _CLOSING_TAG_RES[tag].search(content, pos)
+    return match.end() if match else len(content)
+
+
+def html_to_text(content: str) -> str:
+    """Visible text of an HTML document, one line per block-level element."""
+    parts: List[str] = []
+    pending_space = False
+    pending_newline = False
+    pos = 0
+    size = len(content)
+
+    while pos < size:
+        match = _TOKEN_RE.match(content, pos)
+        pos = match.end()
+        kind = match.lastgroup
+
+        if kind == "block":
+            pending_newline = True
+            continue
+        if kind == "skip":
+            if not match.group(0).endswith("/>"):
+                pos = _skip_element(content, match.group("skip").lower(), pos)
+            continue
+        if kind == "comment":
+            end = content.find("-->", pos)
+            pos = size if end == -1 else end + 3
+            continue
+        if kind == "other":
+            continue
+        if kind == "text":
+            text = match.group("text")
+            if "<" in text:
+                text = _INLINE_TAG_RE.sub("", text)
+        else:
+            text = "<"  # stray '<' that doesn't open a tag
+
+        if "&" in text:
+            text = unescape(text)
+        words = text.split()
+        if not words:
+            pending_space = pending_space or bool(text)
+            continue
+        if parts:
+            if pending_newline:
+                parts.append("\n")
+            elif pending_space or text[0].isspace():
+                parts.append(" ")
+        parts.append(" ".join(words))
+        pending_newline = False
+        pending_space = text[-1].isspace()
+
+    return "".join(parts)
+
+
+def fragment_text(content: str) -> str:
+    """Single-line plain text of an HTML or text fragment (a provider job description)."""
+    # Greenhouse returns posting content entity-escaped (&lt;p&gt;...)
+    if "&lt;" in content:
+        content = unescape(content)
+    text = html_to_text(content) if "<" in content else unescape(content)
+    return " ".join(text.split())
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Cut text at a word boundary with an ellipsis when longer than max_chars."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars - 1
+    return text[:cut].rstrip(" ,;:-") + "…"
+
+
+def text_snippet(content: str, max_chars: int) -> str:
+    """
+    Single-line plain-text preview of an HTML or text fragment, cut at a word
+    boundary with an ellipsis when longer than max_chars.
+    """
+    return truncate_text(fragment_text(content), max_chars)
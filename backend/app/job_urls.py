@@ -0,0 +1,186 @@
+"""
+Job URL classification and canonicalization shared by discovery, ingest and
+status lookups.
+
+The hostname picks the provider from a dict (no per-provider regex attempts),
+then one precompiled path pattern for that provider yields the board
+identifier, posting id and page type in a single match. normalize_url builds
+the dedupe key stored as job_applications.normalized_url.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, unquote_plus, quote_plus
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from (compared lowercased)
+TRACKING_PARAMS = frozenset({
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "utm_id", "utm_source_platform", "utm_creative_format",
+    "gh_src", "source", "ref", "referrer", "referer",
+    "fbclid", "gclid", "msclkid", "twclid",
+    "li_fat_id", "trackingid", "trk", "trkinfo",
+    "_ga", "_gid", "mc_cid", "mc_eid",
+    "icid", "ncid",
+    "campaign_id", "ad_id", "adgroup_id",
+    "lever-source", "lever-origin",
+})
+
+# Hosts serving the same pages under another name -> the canonical one
+CANONICAL_HOST_ALIASES = {
+    "job-boards.greenhouse.io": "boards.greenhouse.io",
+}
+
+NORMALIZE_URL_CACHE_SIZE = 4096
+
+# Hosted board hosts -> provider
+PROVIDER_HOSTS = {
+    "jobs.ashbyhq.com": "ashby",
+    "jobs.lever.co": "lever",
+    "boards.greenhouse.io": "greenhouse",
+    "job-boards.greenhouse.io": "greenhouse",
+}
+
+# Host used for canonical board URLs
+CANONICAL_BOARD_HOSTS = {
+    "ashby": "jobs.ashbyhq.com",
+    "lever": "jobs.lever.co",
+    "greenhouse": "boards.greenhouse.io",
+}
+
+# Path (trailing slash stripped) -> board, posting id and the application-page suffix
+_PATH_PATTERNS = {
+    "ashby": re.compile(r"/(?P<board>[^/]+)(?:/(?P<job>[0-9a-fA-F-]{36})(?P<app>/application)?)?(?P<rest>/.*)?"),
+    "lever": re.compile(r"/(?P<board>[^/]+)(?:/(?P<job>[0-9a-fA-F-]{36})(?P<app>/apply)?)?(?P<rest>/.*)?"),
+    "greenhouse": re.compile(r"/(?P<board>[^/]+)(?:/jobs/(?P<job>\d+))?(?P<rest>/.*)?"),
+}
+
+# Postings on Greenhouse have the description and form on one page
+_COMBINED_PAGE_PROVIDERS = {"greenhouse"}
+
+# Non-board sites with their own job_site_type
+_SITE_TYPE_DOMAINS = (
+    ("linkedin.com", "linkedin"),
+    ("ycombinator.com", "y-combinator"),
+)
+
+
+@dataclass(frozen=True)
+class JobUrl:
+    """
+    Classification of a job-related URL.
+
+    page_type:
+      board       - board root (https://jobs.lever.co/{site})
+      jd          - posting description (Lever/Ashby)
+      application - posting application form (Lever /apply, Ashby /application)
+      combined    - posting with description and form on one page (Greenhouse)
+      unknown     - anything else (other deep links, other sites)
+    """
+    provider: Optional[str]
+    board_identifier: Optional[str]
+    job_id: Optional[str]
+    page_type: str
+    site_type: str
+    base_url: str  # scheme://host/path without query, fragment or application suffix
+
+
+def _site_type(host: str, provider: Optional[str]) -> str:
+    if provider:
+        return "job-board"
+    for domain, site_type in _SITE_TYPE_DOMAINS:
+        if host == domain or host.endswith("." + domain):
+            return site_type
+    return "careers page"
+
+
+def classify_job_url(url: str) -> JobUrl:
+    """Provider, board identifier, posting id and page type of a URL in one pass."""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    path = parts.path.rstrip("/")
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+
+    provider = PROVIDER_HOSTS.get(host) if scheme in ("http", "https") else None
+    match = _PATH_PATTERNS[provider].fullmatch(path) if provider else None
+    if not match:
+        return JobUrl(
+            provider=provider,
+            board_identifier=None,
+            job_id=None,
+            page_type="unknown",
+            site_type=_site_type(host, provider),
+            base_url=f"{scheme}://{netloc}{path or '/'}",
+        )
+
+    job_id = match.group("job")
+    app_suffix = match.groupdict().get("app")
+    if job_id:
+        if provider in _COMBINED_PAGE_PROVIDERS:
+            page_type = "combined"
+        else:
+            job_id = job_id.lower()
+            page_type = "application" if app_suffix and not match.group("rest") else "jd"
+    else:
+        page_type = "unknown" if match.group("rest") else "board"
+
+    base_path = path[:-len(app_suffix)] if page_type == "application" else path
+    return JobUrl(
+        provider=provider,
+        board_identifier=match.group("board"),
+        job_id=job_id,
+        page_type=page_type,
+        site_type="job-board",
+        base_url=f"{scheme}://{netloc}{base_path or '/'}",
+    )
+
+
+def _filtered_query(query: str) -> str:
+    """
+    Drop tracking and blank parameters and sort by name (values keep their order),
+    re-encoding the way parse_qs + urlencode(doseq=True) would.
+    """
+    pairs = []
+    for piece in query.split("&"):
+        name, sep, value = piece.partition("=")
+        if not sep or not value:
+            continue
+        name = unquote_plus(name)
+        if name.lower() in TRACKING_PARAMS:
+            continue
+        pairs.append((name, unquote_plus(value)))
+    if not pairs:
+        return ""
+    pairs.sort(key=itemgetter(0))
+    return "&".join(f"{quote_plus(name)}={quote_plus(value)}" for name, value in pairs)
+
+
+@lru_cache(maxsize=NORMALIZE_URL_CACHE_SIZE)
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL by:
+    - Removing tracking parameters (utm_*, gh_src, source, ref, etc.)
+    - Normalizing trailing slashes
+    - Removing fragments
+    - Lowercasing the scheme and netloc
+    - Mapping host aliases to one canonical host (job-boards.greenhouse.io -> boards.greenhouse.io)
+    - Sorting query parameters
+
+    This helps prevent duplicate entries from URLs that differ only by tracking params.
+    Results are memoized (the same URL is normalized on ingest and twice per status check).
+    """
+    try:
+        parts = urlsplit(url)
+        netloc = parts.netloc.lower()
+        netloc = CANONICAL_HOST_ALIASES.get(netloc, netloc)
+        path = parts.path.rstrip("/") or "/"
+        query = _filtered_query(parts.query) if parts.query else ""
+        return urlunsplit((parts.scheme.lower(), netloc, path, query, ""))
+    except Exception as e:
+        logger.warning("Failed to normalize URL %s: %s, returning original", url, e)
+        return url
@@ -0,0 +1,132 @@
+"""
+Word-boundary keyword matching of JD keywords against a resume.
+
+The resume digest's skills and keyword_text are tokenized once per user and
+cached until the digest changes; the set of n-word phrases is built for a given n
+the first time a keyword of that length is looked up, so a resume is never
+expanded into phrases longer than the JD keywords it is matched against. A JD
+keyword set is normalized once into lookup phrases, and matching is then one set
+lookup per keyword instead of a substring scan of the whole resume text per
+keyword. Phrases only match whole tokens, so "go" no longer
+matches "good" and "java" no longer matches "javascript"; "c++" and "c#" stay
+distinct tokens.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import threading
+
+from app.skill_vectors import canonical_skill, normalize_skill
+
+# Longest keyword (in words) answered from the phrase set; longer ones fall back to a
+# scan of the normalized text, which is still whole-token because tokens are space-joined
+MAX_PHRASE_WORDS = 5
+RESUME_INDEX_CACHE_SIZE = 1024
+KEYWORD_SET_CACHE_SIZE = 1024
+WORD_TOKEN_CACHE_SIZE = 16384
+
+
+@dataclass(frozen=True)
+class ResumeTermIndex:
+    skills: FrozenSet[str]  # normalized resume skills
+    tokens: Tuple[str, ...]  # normalized tokens of the resume text
+    padded_text: str  # " token token ... " for keywords longer than MAX_PHRASE_WORDS
+    canonical_skills: Tuple[str, ...]  # alias-canonical skills for vector matching (skill_vectors)
+    _phrases: Dict[int, FrozenSet[str]] = field(default_factory=dict, compare=False, repr=False)
+
+    def phrases(self, words: int) -> FrozenSet[str]:
+        """Every `words`-token phrase of the resume text, built on first use."""
+        phrases = self._phrases.get(words)
+        if phrases is None:
+            # A concurrent first use builds the same set twice at worst
+            tokens = self.tokens
+            if words == 1:
+                phrases = frozenset(tokens)
+            else:
+                phrases = frozenset(" ".join(tokens[i:i + words]) for i in range(len(tokens) - words + 1))
+            self._phrases[words] = phrases
+        return phrases
+
+
+@lru_cache(maxsize=WORD_TOKEN_CACHE_SIZE)
+def _word_tokens(word: str) -> Tuple[str, ...]:
+    # Per whitespace-separated word, so a word's leading dot survives (".net")
+    return tuple(normalize_skill(word).split())
+
+
+def build_resume_index(skills: Iterable[str], keyword_text: str) -> ResumeTermIndex:
+    """Tokenize a resume digest's skills and keyword text (one pass over the text)."""
+    tokens = tuple(token for word in keyword_text.split() for token in _word_tokens(word))
+    skills = [s for s in skills if s]
+    return ResumeTermIndex(
+        skills=frozenset(filter(None, (normalize_skill(s) for s in skills))),
+        tokens=tokens,
+        padded_text=f" {' '.join(tokens)} ",
+        canonical_skills=tuple(dict.fromkeys(canonical_skill(s) for s in skills)),
+    )
+
+
+class ResumeIndexCache:
+    """Per-user ResumeTermIndex, rebuilt when the user's digest text or skills change."""
+
+    def __init__(self, max_entries: int = RESUME_INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, ResumeTermIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, resume_digest: Optional[dict]) -> ResumeTermIndex:
+        skills = tuple((resume_digest or {}).get("skills") or [])
+        keyword_text = (resume_digest or {}).get("keyword_text") or ""
+        fingerprint = hash((skills, keyword_text))
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None and cached[0] == fingerprint:
+                self._entries.move_to_end(user_id)
+                return cached[1]
+
+        index = build_resume_index(skills, keyword_text)
+        with self._lock:
+            self._entries[user_id] = (fingerprint, index)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+
+resume_index_cache = ResumeIndexCache()
+
+
+@lru_cache(maxsize=KEYWORD_SET_CACHE_SIZE)
+def compile_keywords(keywords: Tuple[str, ...]) -> Tuple[Tuple[str, str, int], ...]:
+    """
+    Deduplicated (keyword, normalized phrase, phrase word count) triples for a JD's
+    keywords, in first-seen order.
+    Keywords that normalize to nothing (punctuation only) are dropped.
+    """
+    seen = set()
+    compiled = []
+    for keyword in keywords:
+        keyword = (keyword or "").lower().strip()
+        phrase = normalize_skill(keyword)
+        if phrase and keyword not in seen:
+            seen.add(keyword)
+            compiled.append((keyword, phrase, phrase.count(" ") + 1))
+    return tuple(compiled)
+
+
+def match_keywords(keywords: Sequence[str], index: ResumeTermIndex) -> Tuple[List[str], List[str]]:
+    """Split JD keywords into (found in resume skills or text, not found)."""
+    matched: List[str] = []
+    missing: List[str] = []
+    for keyword, phrase, words in compile_keywords(tuple(keywords)):
+        if phrase in index.skills:
+            matched.append(keyword)
+        elif words <= MAX_PHRASE_WORDS and phrase in index.phrases(words):
+            matched.append(keyword)
+        elif words > MAX_PHRASE_WORDS and f" {phrase} " in index.padded_text:
+            matched.append(keyword)
+        else:
+            missing.append(keyword)
+    return matched, missing
@@ -1,11 +1,11 @@
 from fastapi import File
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Any
 
 class JD(BaseModel):
     job_title: str
     company: str
-    job_posted: str
+    job_posted: Optional[str] = None  # None when the posting doesn't give a date
     job_description: str
     required_skills: list[str]
     preferred_skills: list[str]
@@ -13,7 +13,7 @@ class JD(BaseModel):
     experience_requirements: list[str]
     keywords: list[str]
     job_site_type: str
-    open_to_visa_sponsorship: bool
+    open_to_visa_sponsorship: Optional[bool] = None  # None when the posting doesn't say
 
 class RequestBody(BaseModel):
     email: str
@@ -87,6 +87,9 @@ class JobsIngestRequestBody(BaseModel):
     job_link: str
     dom_html: Optional[str] = None
 
+class JobsBatchIngestRequestBody(BaseModel):
+    items: list[JobsIngestRequestBody] = Field(min_length=1, max_length=50)
+
 class ExtractedFormField(BaseModel):
     """Field extracted by browser extension's DOMParser"""
     type: str  # "input", "textarea", "select", "combobox", etc.
@@ -140,6 +143,9 @@ class AutofillAgentInput(BaseModel):
     page_url: str
     dom_html: str  # Keep for storage/debugging
     extracted_fields: Optional[list[ExtractedFormField]] = None  # Extracted by browser
+    provisional: bool = False  # Speculative plan warmed at ingest time (stored as status 'provisional')
+    parent_run_id: Optional[str] = None  # Previous run for this job application (delta planning)
+    prior_plan_fields: Optional[list[dict]] = None  # Parent run's plan fields; matching answers are reused
     
     #job details
     job_title: Optional[str] = None
@@ -166,6 +172,7 @@ class AutofillAgentInput(BaseModel):
     other_url: Optional[str] = None
     resume_file_path: Optional[str] = None
     resume_profile: Optional[ExtractedResumeModel] = None 
+    resume_digest: Optional[dict] = None  # Precomputed ResumeDigest (see app/resume_digest.py)
     address: Optional[str] = None
     city: Optional[str] = None
     state: Optional[str] = None
@@ -186,6 +193,7 @@ class AutofillAgentOutput(BaseModel):
     status: str
     plan_json: Optional[dict] = None
     plan_summary: Optional[dict] = None
+    prompt_metrics: Optional[dict] = None  # { prompt_tokens, baseline_tokens, saved_tokens, ... }
 
 
 class JobStatusRequest(BaseModel):
@@ -250,7 +258,10 @@ class DiscoveryRunRequest(BaseModel):
         default=[JobBoardProvider.ASHBY, JobBoardProvider.LEVER, JobBoardProvider.GREENHOUSE],
         description="Providers to search"
     )
-    max_results: int = Field(default=50, ge=1, le=200, description="Max SERP results per provider")
+    max_results: int = Field(default=50, ge=1, le=500, description="Max SERP results per provider and query (paged past 100)")
+    roles: list[str] = Field(default=[], max_length=20, description="Role variants to expand the query with")
+    locations: list[str] = Field(default=[], max_length=20, description="Location variants to expand the query with")
+    max_queries: int = Field(default=10, ge=1, le=50, description="Max expanded queries to run")
 
 
 class DiscoveredBoard(BaseModel):
@@ -269,6 +280,9 @@ class DiscoveryRunResponse(BaseModel):
     new_boards_created: int
     existing_boards_updated: int
     boards: list[DiscoveredBoard]
+    queries: list[str] = []  # expanded query plan that was run
+    serp_paid_requests: int = 0
+    serp_cache_hits: int = 0
     errors: list[str] = []
 
 
@@ -292,6 +306,7 @@ class BoardSyncResult(BaseModel):
     jobs_created: int
     jobs_updated: int
     success: bool
+    skipped: bool = False  # provider host's circuit breaker was open; board not counted as failed
     error: Optional[str] = None
 
 
@@ -302,9 +317,31 @@ class SyncRunResponse(BaseModel):
     total_jobs_created: int
     total_jobs_updated: int
     failed_boards: int
+    skipped_boards: int = 0
     results: list[BoardSyncResult]
 
 
+class HostPoolStats(BaseModel):
+    """Connections to one host in the shared HTTP client pool"""
+    idle: int
+    acquired: int
+    waiting: int
+
+
+class HTTPPoolStatsResponse(BaseModel):
+    """Response from GET /sync/http-pool"""
+    session_open: bool
+    limit: int
+    limit_per_host: int
+    keepalive_timeout: float
+    dns_cache_ttl: int
+    open: int
+    idle: int
+    acquired: int
+    waiting: int
+    hosts: dict[str, HostPoolStats]
+
+
 # --- Jobs Public Endpoint Models ---
 
 class DiscoveredJobResponse(BaseModel):
@@ -320,10 +357,15 @@ class DiscoveredJobResponse(BaseModel):
     department: Optional[str]
     team: Optional[str]
     apply_url: str
-    description: Optional[str]
+    description_snippet: Optional[str]  # plain-text preview; full text from GET /jobs/{id}
     posted_at: Optional[datetime]
 
 
+class DiscoveredJobDetailResponse(DiscoveredJobResponse):
+    """Response from GET /jobs/{job_id}"""
+    description: Optional[str]  # full posting body as provider HTML (Greenhouse entities decoded)
+
+
 class JobsListResponse(BaseModel):
     """Response from GET /jobs"""
     jobs: list[DiscoveredJobResponse]
@@ -331,3 +373,30 @@ class JobsListResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
+
+
+class RecommendedJobResponse(DiscoveredJobResponse):
+    """A discovered job ranked against the user's resume"""
+    score: float
+    matched_skills: list[str]
+    location_match: bool
+
+
+class JobRecommendationsResponse(BaseModel):
+    """Response from GET /jobs/recommendations"""
+    jobs: list[RecommendedJobResponse]
+    resume_skills: list[str]  # canonical skills the ranking used
+
+
+class JobFacetBucket(BaseModel):
+    """Number of matching jobs for one facet value"""
+    value: str
+    count: int
+
+
+class JobFacetsResponse(BaseModel):
+    """Response from GET /jobs/facets"""
+    total_count: int
+    providers: list[JobFacetBucket]
+    remote: list[JobFacetBucket]  # value: "remote" | "onsite"
+    locations: list[JobFacetBucket]
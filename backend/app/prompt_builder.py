@@ -0,0 +1,355 @@
+"""
+Compact prompt construction for the autofill answer generation step.
+
+The generate_answers prompt only carries the context the current form needs:
+null keys are dropped, long free text is truncated to a token budget measured
+with tiktoken, and resume sections are selected from the fields present.
+"""
+from __future__ import annotations
+from functools import lru_cache
+from typing import TypedDict, Optional, List, Dict, Any, Tuple
+import json
+import logging
+import os
+import random
+import re
+
+import tiktoken
+
+from app.dag_utils import FormField, STANDARD_COUNTRIES
+
+logger = logging.getLogger(__name__)
+
+# Tokenizer used for budgeting (Gemini has no public tokenizer; cl100k is a close proxy)
+TOKEN_ENCODING = "cl100k_base"
+
+# Token budgets for free-text context
+JOB_DESCRIPTION_TOKEN_BUDGET = 600
+RESUME_SUMMARY_TOKEN_BUDGET = 120
+ENTRY_DESCRIPTION_TOKEN_BUDGET = 80
+MAX_LIST_ITEMS = 30
+
+# Fraction of prompts whose uncompacted baseline is also tokenized for saved_tokens.
+# Serializing and tokenizing the full profile and option lists costs about as much as the
+# prompt itself, so it is sampled rather than done on every autofill
+PROMPT_BASELINE_SAMPLE_RATE = float(os.getenv("PROMPT_BASELINE_SAMPLE_RATE", "0.05"))
+
+USER_CONTEXT_KEYS = (
+    "full_name", "first_name", "last_name", "email", "phone_number",
+    "linkedin_url", "github_url", "portfolio_url", "other_url",
+    "address", "city", "state", "zip_code", "country",
+    "authorized_to_work_in_us", "visa_sponsorship", "visa_sponsorship_type",
+    "desired_salary", "desired_location",
+    "gender", "race", "veteran_status", "disability_status",
+)
+
+JOB_CONTEXT_KEYS = (
+    "job_title", "company", "job_posted", "job_description",
+    "required_skills", "preferred_skills", "education_requirements",
+    "experience_requirements", "keywords", "open_to_visa_sponsorship",
+    "job_site_type",
+)
+
+# Resume sections pulled in only when a field label hints at them.
+# summary and skills are always included.
+RESUME_SECTION_KEYWORDS = {
+    "experience": (
+        "experience", "employer", "employment", "company", "title", "position",
+        "role", "work", "years", "current", "previous", "manager", "responsibilit",
+    ),
+    "education": (
+        "education", "school", "university", "college", "degree", "gpa",
+        "graduat", "major", "study", "studies", "academic",
+    ),
+    "projects": ("project", "portfolio", "built", "accomplish", "achievement"),
+    "certifications": ("certif", "license", "licence", "credential"),
+}
+
+# Free-text fields ("why do you want to work here?") draw on experience and projects
+OPEN_ENDED_INPUT_TYPES = {"textarea"}
+OPEN_ENDED_SECTIONS = ("experience", "projects")
+
+ANSWER_RULES = [
+    "Answer every field in form_fields; action is always 'autofill' (never 'skip' or 'suggest').",
+    "Unknown answer: value='' with confidence 0.0-0.3. Missing EEO/demographic info: value='' with confidence 0.1.",
+    "select/radio/checkbox: value must be exactly one of the field's options; pick the closest with lower confidence if none fits.",
+    "text/textarea: answer from user_ctx, resume_ctx or job_ctx.",
+    "Never invent sensitive data (SSN, bank details).",
+]
+
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s)")
+
+
+class PromptMetrics(TypedDict):
+    prompt_tokens: int
+    baseline_tokens: Optional[int]  # None when the baseline wasn't sampled
+    saved_tokens: Optional[int]
+    section_tokens: Dict[str, int]
+    resume_sections: List[str]
+    field_count: int
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use; fall back to a char estimate offline
+        logger.warning(f"tiktoken encoding '{TOKEN_ENCODING}' unavailable, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text (approximated as chars/4 when tiktoken is unavailable)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: Optional[str], budget: int) -> Optional[str]:
+    """
+    Truncate text to at most `budget` tokens, preferring to cut at a sentence
+    boundary. Text already within budget is returned unchanged.
+    """
+    if not text or budget <= 0:
+        return text
+    encoding = _get_encoding()
+    if encoding is None:
+        max_chars = budget * 4
+        if len(text) <= max_chars:
+            return text
+        truncated = text[:max_chars]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= budget:
+            return text
+        truncated = encoding.decode(tokens[:budget])
+
+    # Prefer the last full sentence if it keeps most of the budget
+    sentence_ends = [m.end() for m in _SENTENCE_END_RE.finditer(truncated)]
+    if sentence_ends and sentence_ends[-1] >= len(truncated) // 2:
+        truncated = truncated[:sentence_ends[-1]]
+    else:
+        truncated = truncated.rsplit(" ", 1)[0] if " " in truncated else truncated
+    return truncated.rstrip() + " …"
+
+
+def drop_empty(value: Any) -> Any:
+    """Recursively drop None, empty strings, empty lists and empty dicts."""
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            v = drop_empty(v)
+            if v is None or v == "" or v == [] or v == {}:
+                continue
+            out[k] = v
+        return out
+    if isinstance(value, list):
+        items = [drop_empty(v) for v in value]
+        return [v for v in items if not (v is None or v == "" or v == [] or v == {})]
+    return value
+
+
+def _to_dict(value: Any) -> Optional[dict]:
+    if value is None:
+        return None
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return value
+    return None
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def select_resume_sections(form_fields: List[FormField]) -> List[str]:
+    """Return the resume sections (beyond summary/skills) relevant to the given fields."""
+    selected = set()
+    for f in form_fields:
+        if f.get("input_type") in OPEN_ENDED_INPUT_TYPES:
+            selected.update(OPEN_ENDED_SECTIONS)
+        text = f"{f.get('label') or ''} {f.get('question_signature') or ''}".lower()
+        for section, keywords in RESUME_SECTION_KEYWORDS.items():
+            if section not in selected and any(kw in text for kw in keywords):
+                selected.add(section)
+    return [s for s in RESUME_SECTION_KEYWORDS if s in selected]
+
+
+def _compact_resume_entry(entry: dict) -> dict:
+    entry = dict(entry)
+    if entry.get("description"):
+        entry["description"] = truncate_to_tokens(entry["description"], ENTRY_DESCRIPTION_TOKEN_BUDGET)
+    # Credential ids/urls never help answer application questions
+    entry.pop("credential_id", None)
+    entry.pop("credential_url", None)
+    return entry
+
+
+def build_resume_context(
+    resume_profile: Any,
+    sections: List[str],
+    resume_digest: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Build a compact resume context holding only the requested sections.
+
+    When a precomputed resume digest is available its summary, skills, latest
+    role and one-line education summaries are used as-is; the full profile is
+    only read for the sections the form asks about. Those include education, whose
+    dates, GPA and description the digest lines leave out.
+    """
+    profile = _to_dict(resume_profile) or {}
+    if not profile and not resume_digest:
+        return None
+
+    if resume_digest:
+        ctx: Dict[str, Any] = {
+            "summary": resume_digest.get("summary"),
+            "skills": (resume_digest.get("skills") or [])[:MAX_LIST_ITEMS],
+            "years_of_experience": resume_digest.get("years_of_experience"),
+            "latest_title": resume_digest.get("latest_title"),
+            "latest_company": resume_digest.get("latest_company"),
+            "education": resume_digest.get("education"),
+        }
+    else:
+        ctx = {
+            "summary": truncate_to_tokens(profile.get("summary"), RESUME_SUMMARY_TOKEN_BUDGET),
+            "skills": (profile.get("skills") or [])[:MAX_LIST_ITEMS],
+        }
+
+    for section in sections:
+        entries = [_compact_resume_entry(e) for e in profile.get(section) or [] if isinstance(e, dict)]
+        # Full entries replace the digest's education lines unless the profile has none
+        if entries or section not in ctx:
+            ctx[section] = entries
+    return drop_empty(ctx)
+
+
+def build_job_context(input_data: dict) -> dict:
+    ctx = {key: input_data.get(key) for key in JOB_CONTEXT_KEYS}
+    ctx["job_description"] = truncate_to_tokens(ctx.get("job_description"), JOB_DESCRIPTION_TOKEN_BUDGET)
+    for key in ("required_skills", "preferred_skills", "keywords"):
+        if ctx.get(key):
+            ctx[key] = ctx[key][:MAX_LIST_ITEMS]
+    return drop_empty(ctx)
+
+
+def build_user_context(input_data: dict) -> dict:
+    return drop_empty({key: input_data.get(key) for key in USER_CONTEXT_KEYS})
+
+
+def build_fields_spec(form_fields: List[FormField]) -> List[dict]:
+    """
+    Compact per-field spec. The injected standard country list is replaced by a
+    hint since the option matcher maps country names, common aliases and codes
+    back onto it (dag_utils.COUNTRY_ALIASES).
+    """
+    specs = []
+    for f in form_fields:
+        sig = f.get("question_signature")
+        spec: Dict[str, Any] = {"question_signature": sig, "input_type": f.get("input_type")}
+        label = f.get("label")
+        if label and label != sig:
+            spec["label"] = label
+        if f.get("required"):
+            spec["required"] = True
+        options = f.get("options") or []
+        if options == STANDARD_COUNTRIES:
+            spec["options_hint"] = "full English country name, e.g. 'United States'"
+        elif options:
+            spec["options"] = options
+        specs.append(spec)
+    return specs
+
+
+def _baseline_tokens(input_data: dict, form_fields: List[FormField]) -> int:
+    """Token count of the uncompacted context (what the prompt used to carry)."""
+    baseline = {
+        "user_ctx": {key: input_data.get(key) for key in USER_CONTEXT_KEYS},
+        "job_ctx": {key: input_data.get(key) for key in JOB_CONTEXT_KEYS},
+        "resume_ctx": _to_dict(input_data.get("resume_profile")),
+        "form_fields": [
+            {
+                "question_signature": f.get("question_signature"),
+                "label": f.get("label"),
+                "input_type": f.get("input_type"),
+                "required": f.get("required"),
+                "options": f.get("options", []),
+            }
+            for f in form_fields
+        ],
+    }
+    return count_tokens(json.dumps(baseline, ensure_ascii=False, default=str))
+
+
+def build_answers_prompt(
+    input_data: dict,
+    form_fields: List[FormField],
+    measure_baseline: Optional[bool] = None,
+) -> Tuple[str, PromptMetrics]:
+    """
+    Build the compact generate_answers prompt.
+
+    Returns:
+        Tuple of (prompt, metrics). metrics.baseline_tokens is the size of the
+        uncompacted context, so saved_tokens tracks the reduction per call; it is
+        measured for PROMPT_BASELINE_SAMPLE_RATE of calls unless measure_baseline
+        is given, and None otherwise.
+    """
+    sections = select_resume_sections(form_fields)
+    user_ctx = build_user_context(input_data)
+    job_ctx = build_job_context(input_data)
+    resume_ctx = build_resume_context(
+        input_data.get("resume_profile"),
+        sections,
+        resume_digest=input_data.get("resume_digest"),
+    )
+    fields_spec = build_fields_spec(form_fields)
+
+    prompt_obj = drop_empty({
+        "task": f"Generate answers for ALL {len(fields_spec)} job application form fields.",
+        "rules": ANSWER_RULES,
+        "context": {
+            "page_url": input_data.get("page_url"),
+            "user_ctx": user_ctx,
+            "job_ctx": job_ctx,
+            "resume_ctx": resume_ctx,
+        },
+        "form_fields": fields_spec,
+        "output_format": {
+            "answers": {
+                "<question_signature>": {
+                    "value": "string|number|boolean|''",
+                    "action": "autofill",
+                    "confidence": "0.0-1.0",
+                    "source": "profile|resume|jd|llm|unknown",
+                }
+            }
+        },
+        "final_reminder": f"Return exactly {len(fields_spec)} answer objects.",
+    })
+    prompt = _dumps(prompt_obj)
+
+    prompt_tokens = count_tokens(prompt)
+    if measure_baseline is None:
+        measure_baseline = random.random() < PROMPT_BASELINE_SAMPLE_RATE
+    baseline_tokens = _baseline_tokens(input_data, form_fields) if measure_baseline else None
+    metrics: PromptMetrics = {
+        "prompt_tokens": prompt_tokens,
+        "baseline_tokens": baseline_tokens,
+        "saved_tokens": max(0, baseline_tokens - prompt_tokens) if measure_baseline else None,
+        "section_tokens": {
+            "user_ctx": count_tokens(_dumps(user_ctx)),
+            "job_ctx": count_tokens(_dumps(job_ctx)),
+            "resume_ctx": count_tokens(_dumps(resume_ctx)) if resume_ctx else 0,
+            "form_fields": count_tokens(_dumps(fields_spec)),
+        },
+        "resume_sections": ["summary", "skills"] + sections,
+        "field_count": len(fields_spec),
+    }
+    return prompt, metrics
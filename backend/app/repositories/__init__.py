@@ -7,10 +7,12 @@ from app.repositories.base import get_cursor
 from app.repositories.users import UserRepository
 from app.repositories.job_applications import JobApplicationRepository
 from app.repositories.autofill import AutofillRepository
+from app.repositories.serp_cache import SerpCacheRepository
 
 __all__ = [
     "get_cursor",
     "UserRepository",
     "JobApplicationRepository",
     "AutofillRepository",
+    "SerpCacheRepository",
 ]
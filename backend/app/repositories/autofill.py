@@ -60,6 +60,36 @@ class AutofillRepository:
             """, (job_application_id, user_id, page_url))
             return cursor.fetchone()
 
+    def get_provisional_plan(self, job_application_id: str, user_id: str, page_url: str) -> dict | None:
+        """Get the speculative plan warmed at ingest time for a job application + page."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute("""
+                SELECT id, status, plan_json, plan_summary
+                FROM autofill_runs
+                WHERE job_application_id = %s AND user_id = %s AND page_url = %s
+                  AND plan_json IS NOT NULL AND status = 'provisional'
+                ORDER BY created_at DESC LIMIT 1
+            """, (job_application_id, user_id, page_url))
+            return cursor.fetchone()
+
+    def promote_provisional_run(
+        self,
+        run_id: str,
+        plan_json: dict,
+        plan_summary: dict,
+        dom_html: str,
+        dom_html_hash: str,
+    ) -> None:
+        """Mark a provisional run completed with the plan rebuilt against the live page."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute("""
+                UPDATE autofill_runs
+                SET status = 'completed', plan_json = %s, plan_summary = %s,
+                    dom_html = %s, dom_html_hash = %s, dom_captured_at = NOW(), updated_at = NOW()
+                WHERE id = %s AND status = 'provisional'
+            """, (json.dumps(plan_json), json.dumps(plan_summary), dom_html, dom_html_hash, run_id))
+            pass  # commit handled by get_cursor pool context manager
+
     def get_latest_completed_run_id(self, job_application_id: str, user_id: str) -> str | None:
         """Get the most recent completed run ID for a job application."""
         with get_cursor(self.pool) as cursor:
@@ -83,6 +113,18 @@ class AutofillRepository:
             """, (job_application_id, user_id, page_url))
             return cursor.fetchone()
 
+    def get_latest_plan_for_application(self, job_application_id: str, user_id: str) -> dict | None:
+        """Get the most recent completed (or submitted) plan for a job application, on any page."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute("""
+                SELECT id, status, page_url, plan_json, plan_summary
+                FROM autofill_runs
+                WHERE job_application_id = %s AND user_id = %s
+                  AND plan_json IS NOT NULL AND status IN ('completed', 'submitted')
+                ORDER BY created_at DESC LIMIT 1
+            """, (job_application_id, user_id))
+            return cursor.fetchone()
+
     def create_run(
         self,
         user_id: str,
@@ -90,15 +132,16 @@ class AutofillRepository:
         page_url: str,
         dom_html: str,
         dom_html_hash: str,
+        parent_run_id: str | None = None,
     ) -> str:
         """Create a new autofill run. Returns the new ID."""
         with get_cursor(self.pool) as cursor:
             cursor.execute("""
                 INSERT INTO autofill_runs
-                (user_id, job_application_id, page_url, dom_html, dom_html_hash, dom_captured_at, status, created_at)
-                VALUES (%s, %s, %s, %s, %s, NOW(), 'running', NOW())
+                (user_id, job_application_id, page_url, dom_html, dom_html_hash, dom_captured_at, status, parent_run_id, created_at)
+                VALUES (%s, %s, %s, %s, %s, NOW(), 'running', %s, NOW())
                 RETURNING id
-            """, (user_id, job_application_id, page_url, dom_html, dom_html_hash))
+            """, (user_id, job_application_id, page_url, dom_html, dom_html_hash, parent_run_id))
             result = cursor.fetchone()
             pass  # commit handled by get_cursor pool context manager
             return str(result["id"])
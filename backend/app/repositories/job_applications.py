@@ -27,6 +27,22 @@ class JobApplicationRepository:
             )
             return cursor.fetchone()
 
+    def get_by_normalized_urls(self, user_id: str, normalized_urls: list[str]) -> dict[str, dict]:
+        """Find a user's job applications for many normalized URLs in one query, keyed by normalized URL."""
+        if not normalized_urls:
+            return {}
+        with get_cursor(self.pool) as cursor:
+            cursor.execute(
+                """
+                SELECT DISTINCT ON (normalized_url) id, job_title, company, url, normalized_url
+                FROM job_applications
+                WHERE user_id = %s AND normalized_url = ANY(%s)
+                ORDER BY normalized_url, created_at
+                """,
+                (user_id, list(normalized_urls))
+            )
+            return {row["normalized_url"]: row for row in cursor.fetchall()}
+
     def get_status_by_normalized_url(self, user_id: str, normalized_url: str) -> dict | None:
         """Get job application status info by normalized URL."""
         with get_cursor(self.pool) as cursor:
@@ -0,0 +1,38 @@
+"""
+SERP cache repository for database operations on serp_cache table.
+"""
+import json
+from app.repositories.base import get_cursor
+
+
+class SerpCacheRepository:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def get_page(self, query: str, site_filter: str, num: int, page: int, max_age_hours: float) -> list[str] | None:
+        """Get the cached result URLs for one SERP page, or None if missing or older than max_age_hours."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute(
+                """
+                SELECT urls FROM serp_cache
+                WHERE query = %s AND site_filter = %s AND num = %s AND page = %s
+                  AND fetched_at > NOW() - make_interval(secs => %s)
+                """,
+                (query, site_filter, num, page, max_age_hours * 3600)
+            )
+            row = cursor.fetchone()
+            return row["urls"] if row else None
+
+    def save_page(self, query: str, site_filter: str, num: int, page: int, urls: list[str]) -> None:
+        """Store (or refresh) the result URLs for one SERP page."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute(
+                """
+                INSERT INTO serp_cache (query, site_filter, num, page, urls, fetched_at)
+                VALUES (%s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (query, site_filter, num, page)
+                DO UPDATE SET urls = EXCLUDED.urls, fetched_at = NOW()
+                """,
+                (query, site_filter, num, page, json.dumps(urls))
+            )
+            pass  # commit handled by get_cursor pool context manager
@@ -4,6 +4,7 @@ User repository for database operations on users table.
 from typing import Any
 import json
 from app.repositories.base import get_cursor, build_update_query
+from app.resume_digest import build_resume_digest
 
 
 class UserRepository:
@@ -54,13 +55,55 @@ class UserRepository:
                     return None
             return profile
 
+    def get_resume_digest(self, user_id: str) -> dict | None:
+        """Get user's precomputed resume digest (JSON)."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute("SELECT resume_digest FROM users WHERE id = %s", (user_id,))
+            row = cursor.fetchone()
+            if not row or not row["resume_digest"]:
+                return None
+            digest = row["resume_digest"]
+            if isinstance(digest, str):
+                try:
+                    return json.loads(digest)
+                except json.JSONDecodeError:
+                    return None
+            return digest
+
+    def get_recommendation_profile(self, user_id: str) -> dict | None:
+        """Get resume digest, desired locations and sponsorship need for job recommendations."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute(
+                "SELECT resume_digest, desired_location, visa_sponsorship FROM users WHERE id = %s",
+                (user_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            row = dict(row)
+            if isinstance(row["resume_digest"], str):
+                try:
+                    row["resume_digest"] = json.loads(row["resume_digest"])
+                except json.JSONDecodeError:
+                    row["resume_digest"] = None
+            return row
+
+    def update_resume_digest(self, user_id: str, resume_digest: dict) -> None:
+        """Store a rebuilt resume digest without touching the parse status."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute(
+                "UPDATE users SET resume_digest = %s WHERE id = %s",
+                (json.dumps(resume_digest), user_id)
+            )
+            pass  # commit handled by get_cursor pool context manager
+
     def get_for_autofill(self, user_id: str) -> dict | None:
         """Get all user fields needed for autofill agent."""
         with get_cursor(self.pool) as cursor:
             cursor.execute("""
                 SELECT email, full_name, first_name, last_name, phone_number,
                        linkedin_url, github_url, portfolio_url, other_url, resume,
-                       resume_profile, address, city, state, zip_code, country,
+                       resume_profile, resume_digest, address, city, state, zip_code, country,
                        authorized_to_work_in_us, visa_sponsorship, visa_sponsorship_type,
                        desired_salary, desired_location, gender, race, veteran_status,
                        disability_status
@@ -98,11 +141,78 @@ class UserRepository:
             cursor.execute(query, params)
             pass  # commit handled by get_cursor pool context manager
 
+    def save_parsed_resume(
+        self,
+        user_id: str,
+        content_hash: str,
+        resume_text: str,
+        resume_profile: dict,
+        cache_parse: bool = True,
+    ) -> bool:
+        """
+        Store a parsed resume (text, profile, digest) and mark parsing Completed.
+        The result is also cached under the file's content hash (unless cache_parse
+        is False). The user row is skipped if the user's current resume has a
+        different content hash, i.e. it was replaced while parsing. Returns True if stored.
+        """
+        resume_digest = build_resume_digest(resume_profile)
+        with get_cursor(self.pool) as cursor:
+            if cache_parse:
+                cursor.execute(
+                    """
+                    INSERT INTO resume_parse_cache (user_id, content_hash, resume_text, resume_profile)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (user_id, content_hash)
+                    DO UPDATE SET resume_text = EXCLUDED.resume_text, resume_profile = EXCLUDED.resume_profile, created_at = NOW()
+                    """,
+                    (user_id, content_hash, resume_text, json.dumps(resume_profile))
+                )
+            cursor.execute(
+                """
+                UPDATE users
+                SET resume_text = %s, resume_profile = %s, resume_digest = %s,
+                    resume_parse_status = 'Completed', resume_parsed_at = NOW()
+                WHERE id = %s AND resume_content_hash = %s
+                """,
+                (resume_text, json.dumps(resume_profile), json.dumps(resume_digest) if resume_digest else None, user_id, content_hash)
+            )
+            pass  # commit handled by get_cursor pool context manager
+            return cursor.rowcount > 0
+
+    def get_cached_resume_parse(self, user_id: str, content_hash: str) -> dict | None:
+        """Get a previous parse of a resume file with this content hash (resume_text, resume_profile)."""
+        with get_cursor(self.pool) as cursor:
+            cursor.execute(
+                "SELECT resume_text, resume_profile FROM resume_parse_cache WHERE user_id = %s AND content_hash = %s",
+                (user_id, content_hash)
+            )
+            return cursor.fetchone()
+
+    def mark_resume_parse_failed(self, user_id: str, content_hash: str | None = None) -> None:
+        """
+        Mark resume parsing as failed. With a content hash, only if that is still the
+        user's current resume, so a failed parse of a replaced upload doesn't mark the
+        newer one Failed (the same guard as save_parsed_resume).
+        """
+        with get_cursor(self.pool) as cursor:
+            if content_hash is None:
+                cursor.execute(
+                    "UPDATE users SET resume_parse_status = 'Failed' WHERE id = %s",
+                    (user_id,)
+                )
+            else:
+                cursor.execute(
+                    "UPDATE users SET resume_parse_status = 'Failed' WHERE id = %s AND resume_content_hash = %s",
+                    (user_id, content_hash)
+                )
+            pass  # commit handled by get_cursor pool context manager
+
     def update_resume_profile(self, user_id: str, resume_profile: dict) -> None:
-        """Update user's parsed resume profile."""
+        """Update user's parsed resume profile and its digest."""
+        resume_digest = build_resume_digest(resume_profile)
         with get_cursor(self.pool) as cursor:
             cursor.execute(
-                "UPDATE users SET resume_profile = %s, resume_parse_status = 'Done', updated_at = NOW() WHERE id = %s",
-                (json.dumps(resume_profile), user_id)
+                "UPDATE users SET resume_profile = %s, resume_digest = %s, resume_parse_status = 'Done', updated_at = NOW() WHERE id = %s",
+                (json.dumps(resume_profile), json.dumps(resume_digest) if resume_digest else None, user_id)
             )
             pass  # commit handled by get_cursor pool context manager
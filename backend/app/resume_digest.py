@@ -0,0 +1,192 @@
+"""
+Compact per-user resume digest.
+
+Built once after a resume is parsed (or the profile JSON is edited) and stored
+in users.resume_digest, so autofill prompts and resume matching read a small
+precomputed structure instead of re-walking the full resume_profile.
+"""
+from __future__ import annotations
+from datetime import date
+from typing import TypedDict, Optional, List, Any, Tuple
+import logging
+import re
+
+from app.prompt_builder import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Bump when the digest shape changes so stale digests get rebuilt
+RESUME_DIGEST_VERSION = 2
+DIGEST_SUMMARY_TOKEN_BUDGET = 150
+DIGEST_SUMMARY_SKILLS = 12
+
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+_MONTH_RE = re.compile(r"\b(19|20)\d{2}-(\d{1,2})\b")
+_MONTH_NAMES = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+# Whole words only: "unknown" contains "now" but isn't an ongoing role
+_CURRENT_RE = re.compile(r"\b(present|current|currently|now|ongoing|today)\b")
+
+
+class ResumeDigest(TypedDict):
+    version: int
+    skills: List[str]  # stripped, deduplicated case-insensitively, original casing (matching lowercases)
+    years_of_experience: float
+    latest_title: Optional[str]
+    latest_company: Optional[str]
+    education: List[str]  # e.g. "BS Computer Science, Stanford University (2020)"
+    summary: str  # token-budgeted one-paragraph summary
+    keyword_text: str  # lowercase positions, descriptions and projects for keyword matching
+
+
+def _parse_month(value: Optional[str], is_end: bool) -> Optional[int]:
+    """Parse a loose resume date into a month ordinal (year * 12 + month - 1)."""
+    if value is None:
+        return _month_ordinal(date.today()) if is_end else None
+    text = str(value).strip().lower()
+    if not text or _CURRENT_RE.search(text):
+        return _month_ordinal(date.today()) if is_end else None
+
+    year_match = _YEAR_RE.search(text)
+    if not year_match:
+        return None
+    year = int(year_match.group(0))
+
+    month = None
+    iso_match = _MONTH_RE.search(text)
+    if iso_match:
+        month = int(iso_match.group(2))
+    else:
+        for name, number in _MONTH_NAMES.items():
+            if name in text:
+                month = number
+                break
+    if month is None or not 1 <= month <= 12:
+        month = 12 if is_end else 1
+    return year * 12 + month - 1
+
+
+def _month_ordinal(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _total_years(experience: List[dict]) -> float:
+    """Total years of experience with overlapping roles merged."""
+    intervals: List[Tuple[int, int]] = []
+    for exp in experience:
+        start = _parse_month(exp.get("start_date"), is_end=False)
+        end = _parse_month(exp.get("end_date"), is_end=True)
+        if start is None or end is None or end < start:
+            continue
+        intervals.append((start, end + 1))
+
+    months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return round(months / 12, 1)
+
+
+def _latest_experience(experience: List[dict]) -> Optional[dict]:
+    """Most recent role: a current role if any, otherwise the latest end date."""
+    best, best_key = None, None
+    for exp in experience:
+        end = _parse_month(exp.get("end_date"), is_end=True) or 0
+        start = _parse_month(exp.get("start_date"), is_end=False) or 0
+        key = (end, start)
+        if best_key is None or key > best_key:
+            best, best_key = exp, key
+    return best
+
+
+def _education_line(edu: dict) -> str:
+    degree = " ".join(p for p in (edu.get("degree"), edu.get("field_of_study")) if p)
+    line = ", ".join(p for p in (degree, edu.get("institution")) if p)
+    year = _YEAR_RE.search(str(edu.get("end_date") or ""))
+    if year:
+        line = f"{line} ({year.group(0)})"
+    return line
+
+
+def _normalize_skills(skills: List[Any]) -> List[str]:
+    """Stripped skills in their original casing ("PostgreSQL" for prompts), first spelling of each kept."""
+    seen = set()
+    out = []
+    for skill in skills:
+        text = str(skill).strip() if skill is not None else ""
+        key = text.lower()
+        if text and key not in seen:
+            seen.add(key)
+            out.append(text)
+    return out
+
+
+def build_resume_digest(resume_profile: Any) -> Optional[ResumeDigest]:
+    """
+    Build a ResumeDigest from a parsed resume profile (dict or ExtractedResumeModel).
+    Returns None when there is no profile.
+    """
+    if resume_profile is None:
+        return None
+    profile = resume_profile.model_dump() if hasattr(resume_profile, "model_dump") else resume_profile
+    if not isinstance(profile, dict):
+        return None
+
+    experience = [e for e in (profile.get("experience") or []) if isinstance(e, dict)]
+    education = [e for e in (profile.get("education") or []) if isinstance(e, dict)]
+    projects = [p for p in (profile.get("projects") or []) if isinstance(p, dict)]
+
+    skills = _normalize_skills(profile.get("skills") or [])
+    years = _total_years(experience)
+    latest = _latest_experience(experience)
+    latest_title = latest.get("position") if latest else None
+    latest_company = latest.get("company") if latest else None
+    education_lines = [line for line in (_education_line(e) for e in education) if line]
+
+    # Same text get_resume_match has always searched: positions/descriptions and projects
+    keyword_parts = []
+    for exp in experience:
+        keyword_parts.append(f"{exp.get('position') or ''} {exp.get('description') or ''}")
+    for proj in projects:
+        keyword_parts.append(f"{proj.get('name') or ''} {proj.get('description') or ''}")
+    keyword_text = " ".join(keyword_parts).lower()
+
+    headline = []
+    if latest_title and latest_company:
+        headline.append(f"{latest_title} at {latest_company}")
+    elif latest_title or latest_company:
+        headline.append(latest_title or latest_company)
+    if years:
+        headline.append(f"{years:g} years of experience")
+    if education_lines:
+        headline.append(education_lines[0])
+    if skills:
+        headline.append("skills: " + ", ".join(skills[:DIGEST_SUMMARY_SKILLS]))
+    summary = "; ".join(headline)
+    if profile.get("summary"):
+        summary = f"{summary}. {profile['summary']}" if summary else profile["summary"]
+
+    return {
+        "version": RESUME_DIGEST_VERSION,
+        "skills": skills,
+        "years_of_experience": years,
+        "latest_title": latest_title,
+        "latest_company": latest_company,
+        "education": education_lines,
+        "summary": truncate_to_tokens(summary, DIGEST_SUMMARY_TOKEN_BUDGET) or "",
+        "keyword_text": keyword_text,
+    }
+
+
+def is_current_digest(digest: Any) -> bool:
+    """True if digest exists and was built with the current digest version."""
+    return isinstance(digest, dict) and digest.get("version") == RESUME_DIGEST_VERSION
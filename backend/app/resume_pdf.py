@@ -0,0 +1,14 @@
+"""
+PDF text extraction for resume parsing.
+
+Kept free of app-level imports (DB pool, Supabase, LLM clients) because it
+runs inside the resume worker's process pool, where each worker process
+imports only this module.
+"""
+import fitz
+
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Concatenated text of every page in the PDF."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return "".join(page.get_text() for page in doc)
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query, Header, Form, File, UploadFile, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, Header, Form, File, UploadFile
 from typing import Optional
 import aiohttp
 import logging
 import json
 import os
+import hashlib
 from app.services.supabase import Supabase
 from app.services.llm import LLM
 from app.repositories import UserRepository, JobApplicationRepository
-from app.utils import parse_resume
+from app.services.resume_worker import resume_worker_pool, ResumeParseJob, ResumeQueueFullError
+from app.resume_digest import build_resume_digest
 
 # initialize LLM client
 llm = LLM()
@@ -129,7 +131,6 @@ async def update_profile(
     disability_status: Optional[str] = Form(None),
     open_to_relocation: Optional[bool] = Form(None),
     resume_profile: Optional[str] = Form(None),  # JSON string from frontend
-    background_tasks: BackgroundTasks = None
 ):
     try:
         if not authorization or not authorization.startswith("Bearer "):
@@ -144,19 +145,31 @@ async def update_profile(
         user_id = user_response.user.id
         resume_url = None
         uploaded_file_path = None
+        previous_resume_path = None
+        cached_resume_parse = None
 
         # Handle optional resume upload
         if resume is not None:
+            # Read file contents
+            file_contents = await resume.read()
+
+            # An identical file parsed before is served from the content-addressed cache
+            resume_hash = hashlib.sha256(file_contents).hexdigest()
+            cached_resume_parse = user_repo.get_cached_resume_parse(user_id, resume_hash)
+
+            # Refuse before uploading rather than storing a resume that can't be parsed
+            if cached_resume_parse is None and not resume_worker_pool.has_capacity():
+                raise HTTPException(status_code=503, detail="Resume processing is busy, please try again shortly")
             try:
-                # Read file contents
-                file_contents = await resume.read()
-                
                 # Sanitize filename
                 filename = os.path.basename(resume.filename) if resume.filename else "resume.pdf"
                 
-                # Construct file path
-                file_path = f"resumes/{user_id}/{filename}"
-                uploaded_file_path = file_path
+                # Content-addressed path: a changed file never overwrites the object the
+                # current resume (and any in-flight parse or signed URL) points at
+                file_path = f"resumes/{user_id}/{resume_hash[:16]}/{filename}"
+                previous_resume_path = user_repo.get_resume_path(user_id)
+                if file_path != previous_resume_path:
+                    uploaded_file_path = file_path
                 
                 # Upload to Supabase storage
                 resume_upload_response = supabase.client.storage.from_("user-documents").upload(
@@ -177,11 +190,7 @@ async def update_profile(
                 else:
                     # Fallback: construct path manually
                     resume_url = file_path
-                
-                # If resume was updated, trigger background task to parse it
-                if resume_url is not None:
-                    background_tasks.add_task(parse_resume, user_id, resume_url, llm)
-                    
+
             except Exception as upload_error:
                 logger.error(f"Error uploading resume: {str(upload_error)}")
                 raise HTTPException(status_code=500, detail=f"Failed to upload resume: {str(upload_error)}")
@@ -196,9 +205,14 @@ async def update_profile(
 
         # Parse resume_profile if provided (JSON string from form)
         resume_profile_parsed = None
+        resume_digest_parsed = None
         if resume_profile is not None:
             try:
-                resume_profile_parsed = json.dumps(json.loads(resume_profile))
+                resume_profile_obj = json.loads(resume_profile)
+                resume_profile_parsed = json.dumps(resume_profile_obj)
+                # Keep the precomputed digest in sync with manual profile edits
+                resume_digest = build_resume_digest(resume_profile_obj)
+                resume_digest_parsed = json.dumps(resume_digest) if resume_digest else None
             except json.JSONDecodeError:
                 logger.warning("Invalid JSON for resume_profile, skipping")
 
@@ -214,6 +228,8 @@ async def update_profile(
             "portfolio_url": portfolio_url,
             "other_url": other_url,
             "resume": resume_url,
+            # Written with the path so the resume worker's stale-parse guard compares file contents
+            "resume_content_hash": resume_hash if resume_url is not None else None,
             "address": address,
             "city": city,
             "state": state,
@@ -230,6 +246,7 @@ async def update_profile(
             "disability_status": disability_status,
             "open_to_relocation": open_to_relocation,
             "resume_profile": resume_profile_parsed,
+            "resume_digest": resume_digest_parsed,
         }
 
         # Filter out None values
@@ -242,7 +259,7 @@ async def update_profile(
         try:
             user_repo.update(user_id, updates)
         except Exception as db_error:
-            # Rollback: delete uploaded file if DB update fails
+            # Rollback: delete uploaded file if DB update fails (never the current resume)
             if uploaded_file_path:
                 try:
                     supabase.client.storage.from_("user-documents").remove([uploaded_file_path])
@@ -251,6 +268,30 @@ async def update_profile(
             logger.error(f"Database update error: {str(db_error)}")
             raise HTTPException(status_code=500, detail=f"Failed to update profile: {str(db_error)}")
 
+        # The replaced resume's object is no longer referenced
+        if uploaded_file_path and previous_resume_path:
+            try:
+                supabase.client.storage.from_("user-documents").remove([previous_resume_path])
+            except Exception as delete_error:
+                logger.warning(f"Failed to delete replaced resume {previous_resume_path}: {str(delete_error)}")
+
+        # If resume was updated, queue it for parsing (after the new content hash is committed,
+        # since the worker only stores results for the user's current resume)
+        if resume_url is not None and cached_resume_parse is not None:
+            user_repo.save_parsed_resume(
+                user_id, resume_hash, cached_resume_parse["resume_text"], cached_resume_parse["resume_profile"],
+                cache_parse=False,
+            )
+            logger.info(f"Resume for user {user_id} unchanged (sha256 {resume_hash[:12]}), reused cached parse")
+        elif resume_url is not None:
+            try:
+                resume_worker_pool.enqueue(ResumeParseJob(
+                    user_id=user_id, resume_path=resume_url, file_bytes=file_contents, content_hash=resume_hash,
+                ))
+            except ResumeQueueFullError as queue_error:
+                logger.error(f"Could not queue resume parse for user {user_id}: {str(queue_error)}")
+                user_repo.mark_resume_parse_failed(user_id, resume_hash)
+
         return {"message": "Profile updated successfully"}
     except HTTPException:
         raise
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 import logging
 import asyncio
+import psycopg2.extras
 
 from app.models import (
     DiscoveryRunRequest,
@@ -12,13 +13,18 @@ from app.models import (
     DiscoveredBoard,
     JobBoardProvider,
 )
-from app.services.serper import serper_client
+from app.repositories import SerpCacheRepository
+from app.services.serper import serper_client, expand_query_plan
 from app.services.supabase import Supabase
 from app.utils import parse_job_board_url, verify_internal_api_key, infer_company_name_from_identifier
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 supabase = Supabase()
+serp_cache_repo = SerpCacheRepository(supabase.db_pool)
+
+# Concurrent Serper searches per discovery run (queries x providers)
+SERPER_CONCURRENCY = 5
 
 
 @router.post("/run", response_model=DiscoveryRunResponse)
@@ -29,35 +35,49 @@ async def run_discovery(
     """
     Run job board discovery using Serper.dev SERP API.
 
-    - Searches Google for job board URLs matching the query
+    - Expands the query into role/location variants (deduped)
+    - Searches Google for job board URLs matching each variant, reusing cached SERP pages
     - Parses URLs to extract board identifiers
     - Validates only canonical board root URLs (rejects deep links)
-    - Upserts discovered boards to company_boards table
+    - Upserts discovered boards to company_boards table (single statement)
 
     Requires: X-Internal-API-Key header
     """
     try:
         all_urls: List[str] = []
         errors: List[str] = []
+        paid_requests = 0
+        cache_hits = 0
+
+        queries = expand_query_plan(body.query, body.roles, body.locations, body.max_queries)
+        semaphore = asyncio.Semaphore(SERPER_CONCURRENCY)
 
-        # Search each provider in parallel
-        async def search_provider(provider: JobBoardProvider) -> List[str]:
+        # Search each query/provider pair in parallel
+        async def search_provider(query: str, provider: JobBoardProvider) -> List[str]:
+            nonlocal paid_requests, cache_hits
             try:
-                return await serper_client.search(body.query, provider.value, body.max_results)
+                async with semaphore:
+                    result = await serper_client.search(query, provider.value, body.max_results, cache=serp_cache_repo)
+                paid_requests += result.paid_requests
+                cache_hits += result.cache_hits
+                return result.urls
             except Exception as e:
-                error_msg = f"Serper search failed for {provider.value}: {str(e)}"
+                error_msg = f"Serper search failed for {provider.value} ({query}): {str(e)}"
                 logger.error(error_msg)
                 errors.append(error_msg)
                 return []
 
         results = await asyncio.gather(*[
-            search_provider(p) for p in body.providers
+            search_provider(q, p) for q in queries for p in body.providers
         ])
 
         for urls in results:
             all_urls.extend(urls)
 
-        logger.info(f"Total URLs found from SERP: {len(all_urls)}")
+        logger.info(
+            f"Total URLs found from SERP: {len(all_urls)} across {len(queries)} queries "
+            f"({paid_requests} paid pages, {cache_hits} cached)"
+        )
 
         # Parse and validate URLs
         parsed_boards: List[DiscoveredBoard] = []
@@ -86,45 +106,38 @@ async def run_discovery(
 
         logger.info(f"Valid boards parsed: {len(parsed_boards)}")
 
-        # Upsert to database
+        # Upsert to database in one statement; xmax = 0 only for rows this statement inserted
         new_count = 0
         updated_count = 0
 
-        with supabase.get_raw_cursor() as cursor:
-            for board in parsed_boards:
-                # Check if exists
-                cursor.execute(
-                    "SELECT id FROM company_boards WHERE provider = %s AND board_identifier = %s",
-                    (board.provider.value, board.board_identifier)
-                )
-                existing = cursor.fetchone()
-
-                if existing:
-                    # Update updated_at timestamp
-                    cursor.execute(
-                        """
-                        UPDATE company_boards
-                        SET updated_at = NOW()
-                        WHERE provider = %s AND board_identifier = %s
-                        """,
-                        (board.provider.value, board.board_identifier)
-                    )
-                    updated_count += 1
-                    board.is_new = False
-                else:
-                    # Insert new board
-                    cursor.execute(
-                        """
-                        INSERT INTO company_boards
-                        (provider, board_identifier, canonical_url, company_name, discovered_at, is_active)
-                        VALUES (%s, %s, %s, %s, NOW(), true)
-                        """,
+        if parsed_boards:
+            with supabase.get_raw_cursor() as cursor:
+                rows = psycopg2.extras.execute_values(
+                    cursor,
+                    """
+                    INSERT INTO company_boards
+                    (provider, board_identifier, canonical_url, company_name, discovered_at, is_active)
+                    VALUES %s
+                    ON CONFLICT (provider, board_identifier) DO UPDATE SET updated_at = NOW()
+                    RETURNING provider, board_identifier, (xmax = 0) AS is_new
+                    """,
+                    [
                         (board.provider.value, board.board_identifier, board.canonical_url, board.company_name)
-                    )
-                    new_count += 1
-                    board.is_new = True
+                        for board in parsed_boards
+                    ],
+                    template="(%s, %s, %s, %s, NOW(), true)",
+                    page_size=len(parsed_boards),
+                    fetch=True,
+                )
+                pass  # commit handled by get_raw_cursor context manager
 
-            pass  # commit handled by get_raw_cursor context manager
+            is_new_by_board = {(provider, board_identifier): is_new for provider, board_identifier, is_new in rows}
+            for board in parsed_boards:
+                board.is_new = is_new_by_board.get((board.provider.value, board.board_identifier), False)
+                if board.is_new:
+                    new_count += 1
+                else:
+                    updated_count += 1
 
         logger.info(f"Discovery complete: {new_count} new, {updated_count} updated")
 
@@ -134,6 +147,9 @@ async def run_discovery(
             new_boards_created=new_count,
             existing_boards_updated=updated_count,
             boards=parsed_boards,
+            queries=queries,
+            serp_paid_requests=paid_requests,
+            serp_cache_hits=cache_hits,
             errors=errors,
         )
 
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, Header
-from app.models import ExchangeRequestBody, JobsIngestRequestBody, AutofillPlanRequest, AutofillPlanResponse, AutofillAgentInput, AutofillAgentOutput, AutofillEventRequest, AutofillFeedbackRequest, AutofillSubmitRequest, JobStatusRequest, JobStatusResponse, ResumeMatchRequest, ResumeMatchResponse, AutofillEventResponse, AutofillEventsListResponse
+from fastapi import APIRouter, HTTPException, Header, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from app.models import ExchangeRequestBody, JobsIngestRequestBody, JobsBatchIngestRequestBody, AutofillPlanRequest, AutofillPlanResponse, AutofillAgentInput, AutofillAgentOutput, AutofillEventRequest, AutofillFeedbackRequest, AutofillSubmitRequest, JobStatusRequest, JobStatusResponse, ResumeMatchRequest, ResumeMatchResponse, AutofillEventResponse, AutofillEventsListResponse
 from app.services.supabase import Supabase
 from app.services.llm import LLM
 from app.services.autofill_agent_dag import DAG
+from app.services.http_client import http_client, HTTPClientError
 from app.repositories import UserRepository, JobApplicationRepository, AutofillRepository
 import logging
 import secrets
@@ -13,8 +15,14 @@ import dotenv
 import os
 import json
 from jose import JWTError, jwt
-from app.utils import clean_content, extract_jd, normalize_url, infer_job_site_type, extract_job_url_info
-import aiohttp
+from app.utils import clean_content, normalize_url, infer_job_site_type, extract_job_url_info
+from app.resume_digest import build_resume_digest, is_current_digest
+from app.skill_vectors import canonical_skill, best_similarities, warm_skill_vectors, SEMANTIC_MATCH_THRESHOLD
+from app.keyword_match import resume_index_cache, match_keywords
+from app.structured_jd import extract_jd_fast_path
+from app.dag_utils import convert_js_fields_to_form_fields, answers_from_plan, reconcile_answers, build_autofill_plan, summarize_autofill_plan
+from app.services.application_forms import build_application_url, parse_application_form
+import asyncio
 
 # Loading the env variables from backend directory
 BASE_DIR = Path(__file__).parent.parent
@@ -22,6 +30,14 @@ dotenv.load_dotenv(BASE_DIR / ".env")
 
 logger = logging.getLogger(__name__)
 
+# Warm a provisional autofill plan for the application page right after ingest
+AUTOFILL_PREFETCH_ENABLED = os.getenv("AUTOFILL_PREFETCH_ENABLED", "false").lower() == "true"
+PREFETCH_FETCH_TIMEOUT = 15  # seconds
+# Fetching job pages when the extension didn't send the DOM
+INGEST_FETCH_TIMEOUT = int(os.getenv("INGEST_FETCH_TIMEOUT", "20"))  # seconds
+INGEST_FETCH_RETRIES = 1
+INGEST_MAX_BODY_BYTES = int(os.getenv("INGEST_MAX_BODY_BYTES", str(5 * 1024 * 1024)))
+
 # Initialize LLM client
 llm = LLM()
 # Initialize Supabase client
@@ -136,8 +152,73 @@ def fetch_user_using_extension_token(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Invalid token")
     
 
+async def _ingest_new_job(user_id: str, job_link: str, dom_html: str | None, normalized_url: str) -> dict:
+    """Fetch (if no DOM was captured), extract and store a job the user hasn't ingested yet."""
+    if dom_html:
+        logger.info(f"Successfully fetched the content from the DOM!")
+        cleaned_content = await asyncio.to_thread(clean_content, dom_html)
+        jd_dom_html = dom_html
+    else:
+        # Shared keep-alive session: repeat fetches from the same career site reuse the connection
+        try:
+            content = await http_client.request(
+                "GET",
+                job_link,
+                timeout=INGEST_FETCH_TIMEOUT,
+                max_retries=INGEST_FETCH_RETRIES,
+                response_type="text",
+                max_bytes=INGEST_MAX_BODY_BYTES,
+            )
+        except HTTPClientError as e:
+            logger.info(f"Failed to fetch content from the URL: {str(e)}")
+            if e.status_code:
+                raise HTTPException(status_code=e.status_code, detail=f"Failed to fetch content from the URL: {e.status_code}")
+            raise HTTPException(status_code=400, detail=f"Error fetching URL: {str(e)}")
+        jd_dom_html = content
+        logger.info(f"Successfully fetched the content from the URL!")
+        cleaned_content = await asyncio.to_thread(clean_content, content)
+
+    # Structured data first (JSON-LD, provider API, OpenGraph); the LLM only fills the gaps,
+    # reading the posting body rather than the whole page
+    jd = await extract_jd_fast_path(jd_dom_html, cleaned_content, job_link, llm)
+    logger.info(f"Successfully extracted the job description!")
+
+    job_site_type = infer_job_site_type(job_link)
+
+    # Create new job application (sync psycopg2; off the loop so concurrent ingests proceed)
+    job_application_id = await asyncio.to_thread(
+        job_app_repo.create,
+        user_id=user_id,
+        job_title=jd.job_title,
+        company=jd.company,
+        url=job_link,
+        normalized_url=normalized_url,
+        jd_dom_html=jd_dom_html,
+        job_posted=jd.job_posted,
+        job_description=jd.job_description,
+        required_skills=jd.required_skills,
+        preferred_skills=jd.preferred_skills,
+        education_requirements=jd.education_requirements,
+        experience_requirements=jd.experience_requirements,
+        keywords=jd.keywords,
+        job_site_type=job_site_type,
+        open_to_visa_sponsorship=jd.open_to_visa_sponsorship,
+    )
+    logger.info(f"Successfully created new job application in DB!")
+
+    # Resume match compares these skills by vector; compute them now rather than on first match
+    await asyncio.to_thread(warm_skill_vectors, jd.required_skills + jd.preferred_skills + jd.keywords)
+
+    return {
+        "job_application_id": job_application_id,
+        "url": job_link,
+        "job_title": jd.job_title,
+        "company": jd.company
+    }
+
+
 @router.post("/jobs/ingest")
-async def ingest_job_via_extension(body: JobsIngestRequestBody, authorization: str = Header(None)):
+async def ingest_job_via_extension(body: JobsIngestRequestBody, background_tasks: BackgroundTasks, authorization: str = Header(None)):
     try:
         if not authorization or not authorization.startswith("Bearer "):
             raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
@@ -160,7 +241,7 @@ async def ingest_job_via_extension(body: JobsIngestRequestBody, authorization: s
 
         # Check if job application already exists for this user and normalized URL
         # Do this BEFORE the expensive LLM extraction call
-        existing_job = job_app_repo.get_by_normalized_url(user_id, normalized_url)
+        existing_job = await asyncio.to_thread(job_app_repo.get_by_normalized_url, user_id, normalized_url)
         if existing_job:
             logger.info(f"Job application already exists with id={existing_job['id']}. Returning existing data.")
             return {
@@ -171,58 +252,12 @@ async def ingest_job_via_extension(body: JobsIngestRequestBody, authorization: s
             }
 
         # Job doesn't exist - proceed with extraction
-        if body.dom_html:
-            logger.info(f"Successfully fetched the content from the DOM!")
-            cleaned_content = clean_content(body.dom_html)
-            jd_dom_html = body.dom_html
-        else:
-            # Creating a async context manager that creates and manages HTTP client session
-            async with aiohttp.ClientSession() as session:
-                # Creating a context manager that manages the HTTP response
-                async with session.get(body.job_link) as response:
-                    if response.status != 200:
-                        logger.info(f"Failed to fetch content from the URL: {response.status}")
-                        raise HTTPException(status_code=response.status, detail=f"Failed to fetch content from the URL: {response.status}")
-                    content = await response.text()
-                    jd_dom_html = content
-                    logger.info(f"Successfully fetched the content from the URL!")
-                    cleaned_content = clean_content(content)
-
-        # Extract JD using LLM
-        jd = extract_jd(cleaned_content, llm, body.job_link)
-        logger.info(f"Successfully extracted the job description!")
-
-        job_site_type = infer_job_site_type(body.job_link)
-
-        # Create new job application
-        job_application_id = job_app_repo.create(
-            user_id=user_id,
-            job_title=jd.job_title,
-            company=jd.company,
-            url=body.job_link,
-            normalized_url=normalized_url,
-            jd_dom_html=jd_dom_html,
-            job_posted=jd.job_posted,
-            job_description=jd.job_description,
-            required_skills=jd.required_skills,
-            preferred_skills=jd.preferred_skills,
-            education_requirements=jd.education_requirements,
-            experience_requirements=jd.experience_requirements,
-            keywords=jd.keywords,
-            job_site_type=job_site_type,
-            open_to_visa_sponsorship=jd.open_to_visa_sponsorship,
-        )
-        logger.info(f"Successfully created new job application in DB!")
+        result = await _ingest_new_job(user_id, body.job_link, body.dom_html, normalized_url)
 
-        return {
-            "job_application_id": job_application_id,
-            "url": body.job_link,
-            "job_title": jd.job_title,
-            "company": jd.company
-        }
-    except aiohttp.ClientError as e:
-        logger.info(f"Invalid job_link URL provided: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Error fetching URL: {str(e)}")
+        if AUTOFILL_PREFETCH_ENABLED:
+            background_tasks.add_task(prefetch_autofill_plan, user_id, result["job_application_id"], body.job_link)
+
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -230,6 +265,172 @@ async def ingest_job_via_extension(body: JobsIngestRequestBody, authorization: s
         raise HTTPException(status_code=500, detail="Unable to ingest job")
 
 
+@router.post("/jobs/ingest/batch")
+async def batch_ingest_jobs_via_extension(body: JobsBatchIngestRequestBody, background_tasks: BackgroundTasks, authorization: str = Header(None)):
+    """
+    Ingest several job links at once, streaming one NDJSON line per item as it finishes.
+
+    Existing jobs are resolved with a single query up front, duplicate links in the
+    batch are extracted once, and the new ones run concurrently (their JD LLM calls
+    are bounded by JD_LLM_CONCURRENCY). A failed item is reported in its line and
+    doesn't fail the batch.
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
+
+    token = authorization.split("Bearer ")[1]
+    secret_key = os.getenv("SECRET_KEY")
+    algorithm = os.getenv("ALGORITHM")
+
+    # Decode and verify the JWT token
+    try:
+        payload = jwt.decode(token, secret_key, algorithms=[algorithm], audience='applyai-extension', issuer='applyai-api')
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # Group item indexes by normalized URL so each job is looked up and extracted once
+    indexes_by_url: dict[str, list[int]] = {}
+    for index, item in enumerate(body.items):
+        indexes_by_url.setdefault(normalize_url(item.job_link), []).append(index)
+
+    try:
+        existing_jobs = await asyncio.to_thread(job_app_repo.get_by_normalized_urls, user_id, list(indexes_by_url))
+    except Exception as e:
+        logger.info(f"Unable to look up existing jobs for batch ingest: {str(e)}")
+        raise HTTPException(status_code=500, detail="Unable to ingest jobs")
+
+    logger.info(f"Batch ingest for user {user_id}: {len(body.items)} items, {len(indexes_by_url)} unique, {len(existing_jobs)} existing")
+
+    def item_line(index: int, status: str, job: dict | None = None, error: str | None = None) -> str:
+        job = job or {}
+        return json.dumps({
+            "index": index,
+            "job_link": body.items[index].job_link,
+            "status": status,
+            "job_application_id": job.get("job_application_id"),
+            "job_title": job.get("job_title"),
+            "company": job.get("company"),
+            "error": error,
+        }) + "\n"
+
+    async def ingest_one(normalized_url: str) -> tuple[str, dict | None, str | None]:
+        # The first item carrying the URL supplies the link and captured DOM
+        item = body.items[indexes_by_url[normalized_url][0]]
+        try:
+            return normalized_url, await _ingest_new_job(user_id, item.job_link, item.dom_html, normalized_url), None
+        except HTTPException as e:
+            return normalized_url, None, str(e.detail)
+        except Exception as e:
+            logger.info(f"Unable to ingest job {item.job_link}: {str(e)}")
+            return normalized_url, None, "Unable to ingest job"
+
+    async def stream_results():
+        for normalized_url, job in existing_jobs.items():
+            existing = {"job_application_id": job["id"], "job_title": job["job_title"], "company": job["company"]}
+            for index in indexes_by_url[normalized_url]:
+                yield item_line(index, "existing", existing)
+
+        tasks = [
+            asyncio.create_task(ingest_one(normalized_url))
+            for normalized_url in indexes_by_url if normalized_url not in existing_jobs
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                normalized_url, result, error = await next_done
+                for index in indexes_by_url[normalized_url]:
+                    if result:
+                        yield item_line(index, "created", result)
+                    else:
+                        yield item_line(index, "failed", error=error)
+                if result and AUTOFILL_PREFETCH_ENABLED:
+                    background_tasks.add_task(prefetch_autofill_plan, user_id, result["job_application_id"], result["url"])
+        finally:
+            # Client went away mid-stream; don't leave extractions running
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+def _has_autofill_plan(job_application_id: str, user_id: str, page_url: str) -> bool:
+    return bool(
+        autofill_repo.get_completed_plan(job_application_id, user_id, page_url)
+        or autofill_repo.get_provisional_plan(job_application_id, user_id, page_url)
+    )
+
+
+def _plan_prefetched_form(user_id: str, job_application_id: str, job_board: str, application_url: str, page_url: str, html: str) -> None:
+    """Parse the fetched application form, store a provisional run and run the DAG (blocking)."""
+    extracted_fields = parse_application_form(job_board, html)
+    if not extracted_fields:
+        logger.info(f"Prefetch skipped, no form fields parsed from {application_url}")
+        return
+
+    run_id = autofill_repo.create_run(
+        user_id=user_id,
+        job_application_id=job_application_id,
+        page_url=page_url,
+        dom_html=html,
+        dom_html_hash=hashlib.sha256(html.encode('utf-8')).hexdigest(),
+    )
+    agent_input = _build_autofill_agent_input(
+        run_id=run_id,
+        job_application_id=job_application_id,
+        user_id=user_id,
+        page_url=page_url,
+        dom_html=html,
+        extracted_fields=extracted_fields,
+        provisional=True,
+    )
+    dag_result = dag.app.invoke({"input_data": agent_input.model_dump()})
+    logger.info(f"Prefetched provisional autofill plan run_id={run_id} for job_application_id={job_application_id}: status={dag_result.get('status')}")
+
+
+async def prefetch_autofill_plan(user_id: str, job_application_id: str, job_link: str) -> None:
+    """
+    Speculatively plan the application form for a freshly ingested job.
+
+    For boards with a separate application page (Lever /apply, Ashby /application)
+    the form is fetched and parsed server-side and the DAG runs ahead of time.
+    The run is stored as 'provisional' and promoted by /autofill/plan once the
+    extension confirms the live page has no fields the plan is missing.
+    """
+    try:
+        url_info = extract_job_url_info(job_link)
+        application_url = build_application_url(url_info["job_board"], url_info["base_url"])
+        if not application_url:
+            return
+
+        page_url = normalize_url(application_url)
+        # Repository calls are blocking psycopg2; batch ingest runs one prefetch per new job
+        if await asyncio.to_thread(_has_autofill_plan, job_application_id, user_id, page_url):
+            return
+
+        try:
+            html = await http_client.request(
+                "GET",
+                application_url,
+                timeout=PREFETCH_FETCH_TIMEOUT,
+                max_retries=INGEST_FETCH_RETRIES,
+                response_type="text",
+                max_bytes=INGEST_MAX_BODY_BYTES,
+            )
+        except HTTPClientError as e:
+            logger.info(f"Prefetch skipped, application page fetch failed ({str(e)}): {application_url}")
+            return
+
+        # Form parsing, the run insert, the JD/user reads and the DAG's LLM/DB calls all block
+        await asyncio.to_thread(
+            _plan_prefetched_form, user_id, job_application_id, url_info["job_board"], application_url, page_url, html,
+        )
+
+    except Exception as e:
+        logger.warning(f"Autofill prefetch failed for job_application_id={job_application_id}: {str(e)}")
+
+
 @router.post("/jobs/status")
 def get_job_status(body: JobStatusRequest, authorization: str = Header(None)):
     """
@@ -313,6 +514,90 @@ def get_job_status(body: JobStatusRequest, authorization: str = Header(None)):
         raise HTTPException(status_code=500, detail="Unable to get job status")
 
 
+def _build_autofill_agent_input(
+    run_id: str,
+    job_application_id: str,
+    user_id: str,
+    page_url: str,
+    dom_html: str,
+    extracted_fields: list[dict],
+    provisional: bool = False,
+    parent_run: dict | None = None,
+) -> AutofillAgentInput:
+    """Build the autofill DAG input from the stored JD and the user's profile."""
+    autofill_agent_input = AutofillAgentInput(
+        run_id=run_id,
+        job_application_id=job_application_id,
+        user_id=user_id,
+        page_url=page_url,
+        dom_html=dom_html,
+        extracted_fields=extracted_fields,
+        provisional=provisional,
+    )
+    if parent_run:
+        autofill_agent_input.parent_run_id = str(parent_run["id"])
+        autofill_agent_input.prior_plan_fields = (parent_run.get("plan_json") or {}).get("fields")
+
+    # Fetch the extracted JD details
+    jd_record = job_app_repo.get_for_autofill(job_application_id)
+    if jd_record:
+        autofill_agent_input.job_title = jd_record["job_title"]
+        autofill_agent_input.company = jd_record["company"]
+        autofill_agent_input.job_posted = jd_record["job_posted"]
+        autofill_agent_input.job_description = jd_record["job_description"]
+        autofill_agent_input.job_site_type = jd_record["job_site_type"]
+        autofill_agent_input.required_skills = jd_record["required_skills"]
+        autofill_agent_input.preferred_skills = jd_record["preferred_skills"]
+        autofill_agent_input.education_requirements = jd_record["education_requirements"]
+        autofill_agent_input.experience_requirements = jd_record["experience_requirements"]
+        autofill_agent_input.keywords = jd_record["keywords"]
+        autofill_agent_input.open_to_visa_sponsorship = jd_record["open_to_visa_sponsorship"]
+
+    # Fetch user details and resume information
+    user_record = user_repo.get_for_autofill(user_id)
+    if user_record:
+        autofill_agent_input.email = user_record["email"]
+        autofill_agent_input.full_name = user_record["full_name"]
+        autofill_agent_input.first_name = user_record["first_name"]
+        autofill_agent_input.last_name = user_record["last_name"]
+        autofill_agent_input.phone_number = user_record["phone_number"]
+        autofill_agent_input.linkedin_url = user_record["linkedin_url"]
+        autofill_agent_input.github_url = user_record["github_url"]
+        autofill_agent_input.portfolio_url = user_record["portfolio_url"]
+        autofill_agent_input.other_url = user_record["other_url"]
+        autofill_agent_input.resume_file_path = user_record["resume"]
+        resume_profile = user_record["resume_profile"]
+        if isinstance(resume_profile, str):
+            try:
+                resume_profile = json.loads(resume_profile)
+            except json.JSONDecodeError:
+                resume_profile = None
+        autofill_agent_input.resume_profile = resume_profile
+        resume_digest = user_record.get("resume_digest")
+        if not is_current_digest(resume_digest) and resume_profile:
+            # Digest missing (parsed before digests existed) or stale: rebuild and store it
+            resume_digest = build_resume_digest(resume_profile)
+            if resume_digest:
+                user_repo.update_resume_digest(user_id, resume_digest)
+        autofill_agent_input.resume_digest = resume_digest if is_current_digest(resume_digest) else None
+        autofill_agent_input.address = user_record["address"]
+        autofill_agent_input.city = user_record["city"]
+        autofill_agent_input.state = user_record["state"]
+        autofill_agent_input.zip_code = user_record["zip_code"]
+        autofill_agent_input.country = user_record["country"]
+        autofill_agent_input.authorized_to_work_in_us = user_record["authorized_to_work_in_us"]
+        autofill_agent_input.visa_sponsorship = user_record["visa_sponsorship"]
+        autofill_agent_input.visa_sponsorship_type = user_record["visa_sponsorship_type"]
+        autofill_agent_input.desired_salary = user_record["desired_salary"]
+        autofill_agent_input.desired_location = user_record["desired_location"]
+        autofill_agent_input.gender = user_record["gender"]
+        autofill_agent_input.race = user_record["race"]
+        autofill_agent_input.veteran_status = user_record["veteran_status"]
+        autofill_agent_input.disability_status = user_record["disability_status"]
+
+    return autofill_agent_input
+
+
 @router.post("/autofill/plan")
 def get_autofill_plan(body: AutofillPlanRequest, authorization: str = Header(None)):
     try:
@@ -357,9 +642,14 @@ def get_autofill_plan(body: AutofillPlanRequest, authorization: str = Header(Non
         except Exception as e:
             logger.warning(f"Could not generate resume signed URL: {e}")
 
-        # Check if an autofill plan already exists for this job application + page
+        extracted_fields = [field.model_dump() for field in body.extracted_fields]
+        form_fields = convert_js_fields_to_form_fields(extracted_fields)
+        signatures = {f["question_signature"] for f in form_fields}
+
+        # Check if an autofill plan already exists for this job application + page.
+        # It is reused as-is unless the form has since revealed fields it doesn't cover.
         existing_plan = autofill_repo.get_completed_plan(body.job_application_id, user_id, normalized_job_url)
-        if existing_plan:
+        if existing_plan and signatures <= set(answers_from_plan(existing_plan["plan_json"])):
             response = AutofillPlanResponse(
                 run_id=existing_plan["id"],
                 status=existing_plan["status"],
@@ -369,7 +659,38 @@ def get_autofill_plan(body: AutofillPlanRequest, authorization: str = Header(Non
             )
             logger.info("Autofill plan response: %s", json.dumps(response.model_dump(), ensure_ascii=False))
             return response
-        
+
+        # A plan warmed at ingest time is served if it answers every field the page actually has
+        provisional_plan = autofill_repo.get_provisional_plan(body.job_application_id, user_id, normalized_job_url)
+        if provisional_plan:
+            provisional_answers = answers_from_plan(provisional_plan["plan_json"])
+            if form_fields and signatures <= set(provisional_answers):
+                plan_json = build_autofill_plan(
+                    form_fields,
+                    reconcile_answers(form_fields, provisional_answers),
+                    str(provisional_plan["id"]),
+                    normalized_job_url,
+                )
+                plan_summary = summarize_autofill_plan(plan_json)
+                autofill_repo.promote_provisional_run(
+                    provisional_plan["id"], plan_json, plan_summary, body.dom_html, dom_html_hashed
+                )
+                logger.info(f"Promoted provisional autofill run {provisional_plan['id']} for job_application_id={body.job_application_id}")
+                response = AutofillPlanResponse(
+                    run_id=str(provisional_plan["id"]),
+                    status="completed",
+                    plan_json=plan_json,
+                    plan_summary=plan_summary,
+                    resume_url=resume_signed_url,
+                )
+                logger.info("Autofill plan response: %s", json.dumps(response.model_dump(), ensure_ascii=False))
+                return response
+
+        # Delta planning: the new run is a child of the latest plan for this application
+        # (the next page of a multi-page form, or the same page after it expanded), and
+        # only fields without a reusable answer go to the LLM
+        parent_run = existing_plan or autofill_repo.get_latest_plan_for_application(body.job_application_id, user_id)
+
         # Create a new autofill run
         autofill_run_id = autofill_repo.create_run(
             user_id=user_id,
@@ -377,75 +698,29 @@ def get_autofill_plan(body: AutofillPlanRequest, authorization: str = Header(Non
             page_url=normalized_job_url,
             dom_html=body.dom_html,
             dom_html_hash=dom_html_hashed,
+            parent_run_id=str(parent_run["id"]) if parent_run else None,
         )
 
-        # Build the input for the DAG
-        autofill_agent_input = AutofillAgentInput(
+        autofill_agent_input = _build_autofill_agent_input(
             run_id=autofill_run_id,
             job_application_id=body.job_application_id,
             user_id=user_id,
             page_url=normalized_job_url,
             dom_html=body.dom_html,
-            extracted_fields=[field.model_dump() for field in body.extracted_fields],
+            extracted_fields=extracted_fields,
+            parent_run=parent_run,
         )
 
-        # Fetch the extracted JD details
-        jd_record = job_app_repo.get_for_autofill(body.job_application_id)
-        if jd_record:
-            autofill_agent_input.job_title = jd_record["job_title"]
-            autofill_agent_input.company = jd_record["company"]
-            autofill_agent_input.job_posted = jd_record["job_posted"]
-            autofill_agent_input.job_description = jd_record["job_description"]
-            autofill_agent_input.job_site_type = jd_record["job_site_type"]
-            autofill_agent_input.required_skills = jd_record["required_skills"]
-            autofill_agent_input.preferred_skills = jd_record["preferred_skills"]
-            autofill_agent_input.education_requirements = jd_record["education_requirements"]
-            autofill_agent_input.experience_requirements = jd_record["experience_requirements"]
-            autofill_agent_input.keywords = jd_record["keywords"]
-            autofill_agent_input.open_to_visa_sponsorship = jd_record["open_to_visa_sponsorship"]
-
-        # Fetch user details and resume information
-        user_record = user_repo.get_for_autofill(user_id)
-        if user_record:
-            autofill_agent_input.email = user_record["email"]
-            autofill_agent_input.full_name = user_record["full_name"]
-            autofill_agent_input.first_name = user_record["first_name"]
-            autofill_agent_input.last_name = user_record["last_name"]
-            autofill_agent_input.phone_number = user_record["phone_number"]
-            autofill_agent_input.linkedin_url = user_record["linkedin_url"]
-            autofill_agent_input.github_url = user_record["github_url"]
-            autofill_agent_input.portfolio_url = user_record["portfolio_url"]
-            autofill_agent_input.other_url = user_record["other_url"]
-            autofill_agent_input.resume_file_path = user_record["resume"]
-            resume_profile = user_record["resume_profile"]
-            if isinstance(resume_profile, str):
-                try:
-                    resume_profile = json.loads(resume_profile)
-                except json.JSONDecodeError:
-                    resume_profile = None
-            autofill_agent_input.resume_profile = resume_profile
-            autofill_agent_input.address = user_record["address"]
-            autofill_agent_input.city = user_record["city"]
-            autofill_agent_input.state = user_record["state"]
-            autofill_agent_input.zip_code = user_record["zip_code"]
-            autofill_agent_input.country = user_record["country"]
-            autofill_agent_input.authorized_to_work_in_us = user_record["authorized_to_work_in_us"]
-            autofill_agent_input.visa_sponsorship = user_record["visa_sponsorship"]
-            autofill_agent_input.visa_sponsorship_type = user_record["visa_sponsorship_type"]
-            autofill_agent_input.desired_salary = user_record["desired_salary"]
-            autofill_agent_input.desired_location = user_record["desired_location"]
-            autofill_agent_input.gender = user_record["gender"]
-            autofill_agent_input.race = user_record["race"]
-            autofill_agent_input.veteran_status = user_record["veteran_status"]
-            autofill_agent_input.disability_status = user_record["disability_status"]
-
         # Trigger the autofill agent DAG
         dag_result = dag.app.invoke({"input_data": autofill_agent_input.model_dump()})
         autofill_agent_output = AutofillAgentOutput(
             status=dag_result.get("status"),
             plan_json=dag_result.get("plan_json"),
             plan_summary=dag_result.get("plan_summary"),
+            prompt_metrics=dag_result.get("prompt_metrics"),
         )
+        if autofill_agent_output.prompt_metrics:
+            logger.info("Autofill prompt metrics for run_id=%s: %s", autofill_agent_input.run_id, json.dumps(autofill_agent_output.prompt_metrics))
         
         # return the autofill plan response
         response = AutofillPlanResponse(
@@ -568,6 +843,10 @@ def submit_autofill_application(body: AutofillSubmitRequest, authorization: str
 def get_resume_match(body: ResumeMatchRequest, authorization: str = Header(None)):
     """
     Compare user's resume against a job description and return match score with keywords.
+
+    A JD keyword matches when it appears as whole tokens in the resume skills or text
+    (app/keyword_match.py), or when its alias-canonical form is vector-similar to a resume
+    skill (app/skill_vectors.py).
     """
     try:
         if not authorization or not authorization.startswith("Bearer "):
@@ -597,42 +876,32 @@ def get_resume_match(body: ResumeMatchRequest, authorization: str = Header(None)
         preferred_skills = jd_row["preferred_skills"] or []
         keywords = jd_row["keywords"] or []
 
-        # Get user's resume profile
-        resume_profile = user_repo.get_resume_profile(user_id)
-
-        # Extract resume skills and text
-        resume_skills = []
-        resume_text = ""
-        if resume_profile:
-            resume_skills = resume_profile.get("skills") or []
-            # Build searchable text from experience and projects
-            for exp in resume_profile.get("experience") or []:
-                resume_text += f" {exp.get('position', '')} {exp.get('description', '')}"
-            for proj in resume_profile.get("projects") or []:
-                resume_text += f" {proj.get('name', '')} {proj.get('description', '')}"
-            resume_text = resume_text.lower()
-
-        # Combine all JD keywords (deduplicated)
-        jd_keywords = list(set(
-            [s.lower().strip() for s in required_skills] +
-            [s.lower().strip() for s in preferred_skills] +
-            [k.lower().strip() for k in keywords]
-        ))
-
-        # Normalize resume skills for matching
-        resume_skills_lower = [s.lower().strip() for s in resume_skills]
-
-        matched = []
+        # Get user's precomputed resume digest (normalized skills + searchable text)
+        resume_digest = user_repo.get_resume_digest(user_id)
+        if not is_current_digest(resume_digest):
+            resume_digest = build_resume_digest(user_repo.get_resume_profile(user_id))
+            if resume_digest:
+                user_repo.update_resume_digest(user_id, resume_digest)
+
+        # Tokenized resume (cached per user until the digest changes)
+        resume_index = resume_index_cache.get(user_id, resume_digest)
+
+        # All JD keywords; compile_keywords deduplicates and normalizes them once per keyword set
+        jd_keywords = list(required_skills) + list(preferred_skills) + list(keywords)
+
+        # Whole-token matches against resume skills or text ("go" doesn't match "good")
+        matched, unmatched = match_keywords(jd_keywords, resume_index)
         missing = []
 
-        for kw in jd_keywords:
-            if not kw:
-                continue
-            # Check if keyword is in resume skills or text
-            if kw in resume_skills_lower or kw in resume_text:
-                matched.append(kw)
-            else:
-                missing.append(kw)
+        # Synonyms and spelling variants ("k8s" vs "kubernetes", "micro services" vs
+        # "microservices"): alias-canonicalized skills compared by hashed trigram vectors
+        if unmatched:
+            similarities = best_similarities([canonical_skill(kw) for kw in unmatched], resume_index.canonical_skills)
+            for kw, similarity in zip(unmatched, similarities):
+                if similarity >= SEMANTIC_MATCH_THRESHOLD:
+                    matched.append(kw)
+                else:
+                    missing.append(kw)
 
         # Calculate score
         total = len(matched) + len(missing)
@@ -1,27 +1,138 @@
 """
 Public jobs endpoint for searching discovered jobs.
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response
+from pydantic import BaseModel
+from typing import Optional, List, Tuple, Callable, Hashable
 from datetime import datetime
+from html import unescape
+from uuid import UUID
 import logging
 
 from app.models import (
     JobBoardProvider,
     DiscoveredJobResponse,
+    DiscoveredJobDetailResponse,
     JobsListResponse,
+    RecommendedJobResponse,
+    JobRecommendationsResponse,
+    JobFacetBucket,
+    JobFacetsResponse,
 )
+from app.repositories import UserRepository
+from app.resume_digest import build_resume_digest, is_current_digest
+from app.services.jobs_cache import jobs_cache, etag_matches
 from app.services.supabase import Supabase
+from app.skill_vectors import canonical_skill
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 supabase = Supabase()
+user_repo = UserRepository(supabase.db_pool)
+
+# ts_rank normalization: divide by 1 + log(document length) so long descriptions don't
+# outrank short titles, then rank / (rank + 1) to keep scores in [0, 1)
+RANK_NORMALIZATION = 1 | 32
+
+# Location buckets returned by /jobs/facets (most common first)
+DEFAULT_FACET_LOCATIONS = 20
+
+# Recommendation score multiplier for jobs in one of the user's desired locations
+LOCATION_MATCH_BOOST = 1.5
+
+
+def _like_pattern(value: str) -> str:
+    """Substring ILIKE pattern with the user's %, _ and \\ matched literally."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _job_filters(
+    keyword: Optional[str],
+    provider: Optional[JobBoardProvider],
+    company: Optional[str],
+    location: Optional[str],
+    remote: Optional[bool],
+    posted_after: Optional[datetime],
+) -> Tuple[str, str, list]:
+    """
+    FROM and WHERE clauses (and their params, in order) shared by search and facets.
+
+    The keyword is parsed once with websearch_to_tsquery (quoted phrases, OR, -exclude)
+    and joined as q.query, so matching and ranking reuse the same tsquery. The substring
+    filters use ILIKE, which the trigram indexes on location and company_name serve.
+    """
+    from_clause = "discovered_jobs dj JOIN company_boards cb ON dj.board_id = cb.id"
+    conditions = ["dj.is_active = true", "cb.is_active = true"]
+    params: list = []
+
+    # Full-text search
+    if keyword:
+        from_clause += " CROSS JOIN websearch_to_tsquery('english', %s) AS q(query)"
+        params.append(keyword)
+        conditions.append("dj.search_vector @@ q.query")
+
+    # Provider filter
+    if provider:
+        conditions.append("cb.provider = %s")
+        params.append(provider.value)
+
+    # Company filter (case-insensitive substring)
+    if company:
+        conditions.append("cb.company_name ILIKE %s")
+        params.append(_like_pattern(company))
+
+    # Location filter (case-insensitive substring)
+    if location:
+        conditions.append("dj.location ILIKE %s")
+        params.append(_like_pattern(location))
+
+    # Remote filter
+    if remote is not None:
+        conditions.append("dj.is_remote = %s")
+        params.append(remote)
+
+    # Posted after filter
+    if posted_after:
+        conditions.append("dj.posted_at >= %s")
+        params.append(posted_after)
+
+    return from_clause, " AND ".join(conditions), params
+
+
+def _normalize_text_filter(value: Optional[str]) -> Optional[str]:
+    """Collapse whitespace and case so equivalent filters share a cache entry (matching is case-insensitive)."""
+    if value is None:
+        return None
+    return " ".join(value.split()).lower() or None
+
+
+def _cached_json_response(request: Request, key: Hashable, build: Callable[[], BaseModel]) -> Response:
+    """
+    Serve the serialized response for key from jobs_cache, building it on a miss.
+
+    The ETag is a hash of the body, so If-None-Match gets a 304 whenever the content is
+    unchanged. Cache-Control: no-cache makes browsers revalidate on every request.
+    """
+    entry = jobs_cache.get(key)
+    cache_status = "HIT"
+    if entry is None:
+        cache_status = "MISS"
+        generation = jobs_cache.generation
+        entry = jobs_cache.put(key, build().model_dump_json().encode(), generation)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": cache_status}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 
 @router.get("", response_model=JobsListResponse)
 def search_jobs(
+    request: Request,
     keyword: Optional[str] = Query(None, max_length=200, description="Full-text search keyword"),
     provider: Optional[JobBoardProvider] = Query(None, description="Filter by provider"),
+    company: Optional[str] = Query(None, max_length=100, description="Company name substring filter"),
     location: Optional[str] = Query(None, max_length=100, description="Location substring filter"),
     remote: Optional[bool] = Query(None, description="Filter remote jobs"),
     posted_after: Optional[datetime] = Query(None, description="Filter by posted date"),
@@ -31,61 +142,50 @@ def search_jobs(
     """
     Search discovered jobs with filtering and full-text search.
 
-    - keyword: Full-text search on title, description, location, department
+    - keyword: Web-search syntax ("exact phrase", or, -exclude) over title, department/team,
+      location and description, ranked with title matches first
     - provider: Filter by job board provider (ashby, lever, greenhouse)
+    - company: Case-insensitive substring match on company name
     - location: Case-insensitive substring match on location
     - remote: Filter for remote jobs only
     - posted_after: Filter jobs posted after this date
+
+    Each job carries a plain-text description_snippet; GET /jobs/{job_id} has the full description.
+    Responses are cached briefly per filter set and carry an ETag (If-None-Match -> 304).
     """
-    try:
-        # Build query dynamically
-        conditions = ["dj.is_active = true", "cb.is_active = true"]
-        params = []
+    keyword, company, location = (_normalize_text_filter(v) for v in (keyword, company, location))
+    key = ("search", keyword, provider, company, location, remote, posted_after, limit, offset)
+    return _cached_json_response(
+        request,
+        key,
+        lambda: _search_jobs(keyword, provider, company, location, remote, posted_after, limit, offset),
+    )
 
-        # Full-text search
-        if keyword:
-            conditions.append("dj.search_vector @@ plainto_tsquery('english', %s)")
-            params.append(keyword)
-
-        # Provider filter
-        if provider:
-            conditions.append("cb.provider = %s")
-            params.append(provider.value)
-
-        # Location filter (case-insensitive substring)
-        if location:
-            conditions.append("LOWER(dj.location) LIKE LOWER(%s)")
-            params.append(f"%{location}%")
-
-        # Remote filter
-        if remote is not None:
-            conditions.append("dj.is_remote = %s")
-            params.append(remote)
-
-        # Posted after filter
-        if posted_after:
-            conditions.append("dj.posted_at >= %s")
-            params.append(posted_after)
-
-        where_clause = " AND ".join(conditions)
-
-        # Count query
-        count_query = f"""
-            SELECT COUNT(*)
-            FROM discovered_jobs dj
-            JOIN company_boards cb ON dj.board_id = cb.id
-            WHERE {where_clause}
-        """
 
-        # Main query with ordering and pagination
+def _search_jobs(
+    keyword: Optional[str],
+    provider: Optional[JobBoardProvider],
+    company: Optional[str],
+    location: Optional[str],
+    remote: Optional[bool],
+    posted_after: Optional[datetime],
+    limit: int,
+    offset: int,
+) -> JobsListResponse:
+    try:
+        from_clause, where_clause, params = _job_filters(
+            keyword, provider, company, location, remote, posted_after
+        )
+
         # Order by relevance if keyword search, otherwise by posted_at
         if keyword:
-            order_clause = "ts_rank(dj.search_vector, plainto_tsquery('english', %s)) DESC, dj.posted_at DESC NULLS LAST"
-            order_params = [keyword]
+            rank_column = f",\n                ts_rank(dj.search_vector, q.query, {RANK_NORMALIZATION}) AS rank"
+            order_clause = "rank DESC, dj.posted_at DESC NULLS LAST"
         else:
+            rank_column = ""
             order_clause = "dj.posted_at DESC NULLS LAST"
-            order_params = []
 
+        # The total comes from a window over the filtered rows, so one scan serves both
         main_query = f"""
             SELECT
                 dj.id,
@@ -99,24 +199,28 @@ def search_jobs(
                 dj.department,
                 dj.team,
                 dj.apply_url,
-                dj.description,
-                dj.posted_at
-            FROM discovered_jobs dj
-            JOIN company_boards cb ON dj.board_id = cb.id
+                dj.description_snippet,
+                dj.posted_at,
+                COUNT(*) OVER () AS total_count{rank_column}
+            FROM {from_clause}
             WHERE {where_clause}
             ORDER BY {order_clause}
             LIMIT %s OFFSET %s
         """
 
         with supabase.get_raw_cursor() as cursor:
-            # Get total count
-            cursor.execute(count_query, params)
-            total_count = cursor.fetchone()[0]
-
-            # Get jobs
-            cursor.execute(main_query, params + order_params + [limit, offset])
+            cursor.execute(main_query, params + [limit, offset])
             rows = cursor.fetchall()
 
+            if rows:
+                total_count = rows[0][13]
+            elif offset > 0:
+                # Paged past the end: no row carries the window count
+                cursor.execute(f"SELECT COUNT(*) FROM {from_clause} WHERE {where_clause}", params)
+                total_count = cursor.fetchone()[0]
+            else:
+                total_count = 0
+
         jobs = []
         for row in rows:
             jobs.append(DiscoveredJobResponse(
@@ -131,7 +235,7 @@ def search_jobs(
                 department=row[8],
                 team=row[9],
                 apply_url=row[10],
-                description=row[11],
+                description_snippet=row[11],
                 posted_at=row[12],
             ))
 
@@ -146,3 +250,302 @@ def search_jobs(
     except Exception as e:
         logger.error(f"Job search failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Job search failed")
+
+
+@router.get("/facets", response_model=JobFacetsResponse)
+def get_job_facets(
+    request: Request,
+    keyword: Optional[str] = Query(None, max_length=200, description="Full-text search keyword"),
+    provider: Optional[JobBoardProvider] = Query(None, description="Filter by provider"),
+    company: Optional[str] = Query(None, max_length=100, description="Company name substring filter"),
+    location: Optional[str] = Query(None, max_length=100, description="Location substring filter"),
+    remote: Optional[bool] = Query(None, description="Filter remote jobs"),
+    posted_after: Optional[datetime] = Query(None, description="Filter by posted date"),
+    location_limit: int = Query(DEFAULT_FACET_LOCATIONS, ge=1, le=100, description="Max location buckets"),
+):
+    """
+    Job counts per provider, remote/onsite and location for the same filters as GET /jobs.
+
+    All buckets and the total come from one GROUPING SETS aggregation over the filtered
+    jobs. Locations are the most common exact location strings, up to location_limit.
+    Cached and revalidated like GET /jobs.
+    """
+    keyword, company, location = (_normalize_text_filter(v) for v in (keyword, company, location))
+    key = ("facets", keyword, provider, company, location, remote, posted_after, location_limit)
+    return _cached_json_response(
+        request,
+        key,
+        lambda: _job_facets(keyword, provider, company, location, remote, posted_after, location_limit),
+    )
+
+
+def _job_facets(
+    keyword: Optional[str],
+    provider: Optional[JobBoardProvider],
+    company: Optional[str],
+    location: Optional[str],
+    remote: Optional[bool],
+    posted_after: Optional[datetime],
+    location_limit: int,
+) -> JobFacetsResponse:
+    try:
+        from_clause, where_clause, params = _job_filters(
+            keyword, provider, company, location, remote, posted_after
+        )
+
+        facets_query = f"""
+            WITH filtered AS (
+                SELECT
+                    cb.provider::text AS provider,
+                    COALESCE(dj.is_remote, false) AS is_remote,
+                    dj.location
+                FROM {from_clause}
+                WHERE {where_clause}
+            ),
+            buckets AS (
+                SELECT
+                    CASE
+                        WHEN GROUPING(provider) = 0 THEN 'provider'
+                        WHEN GROUPING(is_remote) = 0 THEN 'remote'
+                        WHEN GROUPING(location) = 0 THEN 'location'
+                        ELSE 'total'
+                    END AS facet,
+                    CASE
+                        WHEN GROUPING(is_remote) = 0 THEN CASE WHEN is_remote THEN 'remote' ELSE 'onsite' END
+                        ELSE COALESCE(provider, location)
+                    END AS value,
+                    COUNT(*) AS job_count
+                FROM filtered
+                GROUP BY GROUPING SETS ((provider), (is_remote), (location), ())
+            ),
+            ranked AS (
+                SELECT
+                    facet,
+                    value,
+                    job_count,
+                    ROW_NUMBER() OVER (PARTITION BY facet ORDER BY job_count DESC, value) AS bucket_rank
+                FROM buckets
+                WHERE facet <> 'location' OR value IS NOT NULL
+            )
+            SELECT facet, value, job_count
+            FROM ranked
+            WHERE facet <> 'location' OR bucket_rank <= %s
+            ORDER BY facet, bucket_rank
+        """
+
+        with supabase.get_raw_cursor() as cursor:
+            cursor.execute(facets_query, params + [location_limit])
+            rows = cursor.fetchall()
+
+        total_count = 0
+        buckets: dict[str, List[JobFacetBucket]] = {"provider": [], "remote": [], "location": []}
+        for facet, value, job_count in rows:
+            if facet == "total":
+                total_count = job_count
+            else:
+                buckets[facet].append(JobFacetBucket(value=value, count=job_count))
+
+        return JobFacetsResponse(
+            total_count=total_count,
+            providers=buckets["provider"],
+            remote=buckets["remote"],
+            locations=buckets["location"],
+        )
+
+    except Exception as e:
+        logger.error(f"Job facets failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Job facets failed")
+
+
+@router.get("/recommendations", response_model=JobRecommendationsResponse)
+def get_job_recommendations(
+    authorization: str = Header(None),
+    limit: int = Query(20, ge=1, le=100, description="Number of jobs to return"),
+):
+    """
+    Active discovered jobs ranked against the user's resume skills, desired locations and
+    visa needs.
+
+    Candidates come from job_skill_index (skills extracted from each posting at sync
+    time), looked up by the user's canonical resume skills, so only jobs sharing at least
+    one skill are scored. Score = matched skill weight / sqrt(the job's total skill
+    weight), times LOCATION_MATCH_BOOST when the job is in a desired location (or remote,
+    if "remote" is one). Users who need sponsorship don't see jobs that say they can't
+    sponsor. The top `limit` jobs are selected in SQL.
+
+    Called from the web frontend with a Supabase JWT.
+    """
+    try:
+        if not authorization or not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
+
+        token = authorization.split("Bearer ")[1]
+        user_response = supabase.client.auth.get_user(jwt=token)
+        if user_response.user is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        user_id = user_response.user.id
+
+        profile = user_repo.get_recommendation_profile(user_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="User profile not found")
+
+        resume_digest = profile["resume_digest"]
+        if not is_current_digest(resume_digest):
+            resume_digest = build_resume_digest(user_repo.get_resume_profile(user_id))
+            if resume_digest:
+                user_repo.update_resume_digest(user_id, resume_digest)
+
+        skills = list(dict.fromkeys(
+            canonical_skill(skill) for skill in (resume_digest or {}).get("skills") or []
+        ))
+        if not skills:
+            return JobRecommendationsResponse(jobs=[], resume_skills=[])
+
+        # Desired locations: "San Francisco, CA" matches on its first part
+        desired = [loc.strip() for loc in profile["desired_location"] or [] if loc and loc.strip()]
+        remote_ok = any("remote" in loc.lower() for loc in desired)
+        location_patterns = [
+            _like_pattern(loc.split(",")[0].strip()) for loc in desired if "remote" not in loc.lower()
+        ]
+        location_match = "COALESCE(dj.location ILIKE ANY(%s::text[]), false)"
+        if remote_ok:
+            location_match += " OR COALESCE(dj.is_remote, false)"
+
+        visa_condition = "AND dj.visa_sponsorship IS DISTINCT FROM false" if profile["visa_sponsorship"] else ""
+
+        query = f"""
+            WITH matches AS (
+                SELECT job_id, SUM(weight) AS matched_weight,
+                       array_agg(skill ORDER BY weight DESC, skill) AS matched_skills
+                FROM job_skill_index
+                WHERE skill = ANY(%s)
+                GROUP BY job_id
+            )
+            SELECT
+                dj.id,
+                dj.board_id,
+                cb.provider,
+                cb.company_name,
+                dj.external_id,
+                dj.title,
+                dj.location,
+                dj.is_remote,
+                dj.department,
+                dj.team,
+                dj.apply_url,
+                dj.description_snippet,
+                dj.posted_at,
+                m.matched_weight / sqrt(GREATEST(dj.skill_weight_total, 1))
+                    * CASE WHEN lm.location_match THEN %s ELSE 1 END AS score,
+                m.matched_skills,
+                lm.location_match
+            FROM matches m
+            JOIN discovered_jobs dj ON dj.id = m.job_id
+            JOIN company_boards cb ON dj.board_id = cb.id
+            CROSS JOIN LATERAL (SELECT {location_match} AS location_match) lm
+            WHERE dj.is_active = true AND cb.is_active = true {visa_condition}
+            ORDER BY score DESC, dj.posted_at DESC NULLS LAST
+            LIMIT %s
+        """
+
+        with supabase.get_raw_cursor() as cursor:
+            cursor.execute(query, (skills, LOCATION_MATCH_BOOST, location_patterns, limit))
+            rows = cursor.fetchall()
+
+        jobs = [
+            RecommendedJobResponse(
+                id=str(row[0]),
+                board_id=str(row[1]),
+                provider=JobBoardProvider(row[2]),
+                company_name=row[3],
+                external_id=row[4],
+                title=row[5],
+                location=row[6],
+                is_remote=row[7] if row[7] is not None else False,
+                department=row[8],
+                team=row[9],
+                apply_url=row[10],
+                description_snippet=row[11],
+                posted_at=row[12],
+                score=round(float(row[13]), 4),
+                matched_skills=row[14],
+                location_match=row[15],
+            )
+            for row in rows
+        ]
+
+        return JobRecommendationsResponse(jobs=jobs, resume_skills=skills)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Job recommendations failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Job recommendations failed")
+
+
+@router.get("/{job_id}", response_model=DiscoveredJobDetailResponse)
+def get_job(request: Request, job_id: UUID):
+    """
+    A single active discovered job with its full description, for expanding a listing card.
+
+    Cached and revalidated like GET /jobs.
+    """
+    return _cached_json_response(request, ("detail", job_id), lambda: _get_job(job_id))
+
+
+def _get_job(job_id: UUID) -> DiscoveredJobDetailResponse:
+    try:
+        with supabase.get_raw_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT
+                    dj.id,
+                    dj.board_id,
+                    cb.provider,
+                    cb.company_name,
+                    dj.external_id,
+                    dj.title,
+                    dj.location,
+                    dj.is_remote,
+                    dj.department,
+                    dj.team,
+                    dj.apply_url,
+                    dj.description_snippet,
+                    dj.posted_at,
+                    dj.description
+                FROM discovered_jobs dj
+                JOIN company_boards cb ON dj.board_id = cb.id
+                WHERE dj.id = %s AND dj.is_active = true AND cb.is_active = true
+                """,
+                (str(job_id),)
+            )
+            row = cursor.fetchone()
+
+    except Exception as e:
+        logger.error(f"Job lookup failed for {job_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Job lookup failed")
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    description = row[13]
+    # Greenhouse returns posting content entity-escaped (&lt;p&gt;...); serve it as HTML
+    if description and "&lt;" in description:
+        description = unescape(description)
+
+    return DiscoveredJobDetailResponse(
+        id=str(row[0]),
+        board_id=str(row[1]),
+        provider=JobBoardProvider(row[2]),
+        company_name=row[3],
+        external_id=row[4],
+        title=row[5],
+        location=row[6],
+        is_remote=row[7] if row[7] is not None else False,
+        department=row[8],
+        team=row[9],
+        apply_url=row[10],
+        description_snippet=row[11],
+        posted_at=row[12],
+        description=description,
+    )
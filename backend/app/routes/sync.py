@@ -2,19 +2,26 @@
 Sync endpoint for fetching jobs from discovered boards via provider APIs.
 """
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from psycopg2.extras import execute_values
+from typing import Dict, List, Optional
+import hashlib
 import logging
 import json
 
+from app.html_text import fragment_text, truncate_text
 from app.models import (
     SyncRunRequest,
     SyncRunResponse,
     BoardSyncResult,
     JobBoardProvider,
+    HTTPPoolStatsResponse,
 )
 from app.services.job_providers import get_provider, NormalizedJob
-from app.services.http_client import HTTPClientError
+from app.services.http_client import http_client, HTTPClientError, CircuitOpenError
+from app.services.jobs_cache import jobs_cache
 from app.services.supabase import Supabase
+from app.skill_vectors import extract_skills
+from app.structured_jd import infer_visa_sponsorship
 from app.utils import verify_internal_api_key
 
 logger = logging.getLogger(__name__)
@@ -24,6 +31,30 @@ supabase = Supabase()
 # Deactivate board after this many consecutive failures
 MAX_FAILURE_COUNT = 5
 
+# Plain-text description preview stored for the /jobs listing
+DESCRIPTION_SNIPPET_CHARS = 240
+
+# job_skill_index weight of a skill named in the posting title vs only in the description
+TITLE_SKILL_WEIGHT = 3
+DESCRIPTION_SKILL_WEIGHT = 1
+
+
+def job_skill_weights(title: str, description_text: str) -> Dict[str, int]:
+    """Skills a posting mentions -> job_skill_index weight (title mentions weigh more)."""
+    weights = {skill: DESCRIPTION_SKILL_WEIGHT for skill in extract_skills(description_text)}
+    for skill in extract_skills(title):
+        weights[skill] = TITLE_SKILL_WEIGHT
+    return weights
+
+
+def _skill_index_hash(weights: Dict[str, int]) -> str:
+    return hashlib.sha1(json.dumps(sorted(weights.items())).encode()).hexdigest()
+
+
+def _content_hash(job: NormalizedJob) -> str:
+    """Hash of the fields the snippet, sponsorship and skill index are derived from."""
+    return hashlib.sha1(f"{job.title}\0{job.description or ''}".encode()).hexdigest()
+
 
 @router.post("/run", response_model=SyncRunResponse)
 async def run_sync(
@@ -37,6 +68,8 @@ async def run_sync(
     - Upserts jobs to discovered_jobs table
     - Updates last_synced_at and failure tracking per board
     - Deactivates boards after MAX_FAILURE_COUNT consecutive failures
+    - Skips boards whose provider API circuit breaker is open (not counted as failures)
+    - Invalidates the cached /jobs responses after each board's jobs are committed
 
     Requires: X-Internal-API-Key header
     """
@@ -70,6 +103,7 @@ async def run_sync(
         total_jobs_created = 0
         total_jobs_updated = 0
         failed_boards = 0
+        skipped_boards = 0
 
         # Process boards sequentially (to avoid rate limits)
         for board_row in boards:
@@ -90,10 +124,15 @@ async def run_sync(
                 total_jobs_fetched += result.jobs_fetched
                 total_jobs_created += result.jobs_created
                 total_jobs_updated += result.jobs_updated
+            elif result.skipped:
+                skipped_boards += 1
             else:
                 failed_boards += 1
 
-        logger.info(f"Sync complete: {len(results)} boards, {total_jobs_fetched} jobs fetched, {failed_boards} failed")
+        logger.info(
+            f"Sync complete: {len(results)} boards, {total_jobs_fetched} jobs fetched, "
+            f"{failed_boards} failed, {skipped_boards} skipped (circuit open)"
+        )
 
         return SyncRunResponse(
             boards_processed=len(results),
@@ -101,6 +140,7 @@ async def run_sync(
             total_jobs_created=total_jobs_created,
             total_jobs_updated=total_jobs_updated,
             failed_boards=failed_boards,
+            skipped_boards=skipped_boards,
             results=results,
         )
 
@@ -111,6 +151,22 @@ async def run_sync(
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
 
 
+@router.get("/http-pool", response_model=HTTPPoolStatsResponse)
+async def get_http_pool_stats(
+    _: bool = Depends(verify_internal_api_key),
+):
+    """
+    Shared HTTP client connection pool usage, for sizing limit/limit_per_host.
+
+    - open: idle + acquired connections
+    - waiting: requests blocked on the connection limits
+    - hosts: the same counts per host:port
+
+    Requires: X-Internal-API-Key header
+    """
+    return http_client.pool_stats()
+
+
 async def sync_single_board(
     board_id: str,
     provider: JobBoardProvider,
@@ -128,18 +184,62 @@ async def sync_single_board(
         jobs_updated = 0
 
         with supabase.get_raw_cursor() as cursor:
-            # Get existing job external_ids for this board
+            # Get existing jobs for this board (the skill set each is indexed under, and
+            # the content it was derived from)
             cursor.execute(
-                "SELECT external_id FROM discovered_jobs WHERE board_id = %s",
+                "SELECT external_id, id, skill_index_hash, content_hash FROM discovered_jobs WHERE board_id = %s",
                 (board_id,)
             )
-            existing_ids = {row[0] for row in cursor.fetchall()}
+            existing = {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+            existing_ids = set(existing)
 
             # Track which jobs are still active
             seen_ids = set()
+            # job_id -> skill weights, for jobs whose job_skill_index rows must be rewritten
+            reindex: Dict[str, Dict[str, int]] = {}
 
             for job in jobs:
                 seen_ids.add(job.external_id)
+                content_hash = _content_hash(job)
+                previous = existing.get(job.external_id)
+
+                # Unchanged posting that is still indexed: refresh metadata only, without
+                # re-parsing the description (snippet, sponsorship and skills stay as stored)
+                if previous is not None and previous[1] is not None and previous[2] == content_hash:
+                    cursor.execute(
+                        """
+                        UPDATE discovered_jobs SET
+                            location = %s,
+                            is_remote = %s,
+                            department = %s,
+                            team = %s,
+                            apply_url = %s,
+                            posted_at = %s,
+                            raw_data = %s,
+                            last_seen_at = NOW(),
+                            is_active = true,
+                            updated_at = NOW()
+                        WHERE board_id = %s AND external_id = %s
+                        """,
+                        (
+                            job.location,
+                            job.is_remote,
+                            job.department,
+                            job.team,
+                            job.apply_url,
+                            job.posted_at,
+                            json.dumps(job.raw_data) if job.raw_data else None,
+                            board_id,
+                            job.external_id,
+                        )
+                    )
+                    jobs_updated += 1
+                    continue
+
+                text = fragment_text(job.description) if job.description else ""
+                snippet = truncate_text(text, DESCRIPTION_SNIPPET_CHARS) if text else None
+                skill_weights = job_skill_weights(job.title, text)
+                skill_hash = _skill_index_hash(skill_weights)
 
                 if job.external_id in existing_ids:
                     # Update existing job
@@ -153,6 +253,11 @@ async def sync_single_board(
                             team = %s,
                             apply_url = %s,
                             description = %s,
+                            description_snippet = %s,
+                            visa_sponsorship = %s,
+                            skill_index_hash = %s,
+                            skill_weight_total = %s,
+                            content_hash = %s,
                             posted_at = %s,
                             raw_data = %s,
                             last_seen_at = NOW(),
@@ -168,12 +273,20 @@ async def sync_single_board(
                             job.team,
                             job.apply_url,
                             job.description,
+                            snippet,
+                            infer_visa_sponsorship(text),
+                            skill_hash,
+                            sum(skill_weights.values()),
+                            content_hash,
                             job.posted_at,
                             json.dumps(job.raw_data) if job.raw_data else None,
                             board_id,
                             job.external_id,
                         )
                     )
+                    job_id, indexed_hash, _ = previous
+                    if indexed_hash != skill_hash:
+                        reindex[str(job_id)] = skill_weights
                     jobs_updated += 1
                 else:
                     # Insert new job
@@ -181,8 +294,11 @@ async def sync_single_board(
                         """
                         INSERT INTO discovered_jobs
                         (board_id, external_id, title, location, is_remote, department, team,
-                         apply_url, description, posted_at, raw_data, first_seen_at, last_seen_at, is_active)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), true)
+                         apply_url, description, description_snippet, visa_sponsorship,
+                         skill_index_hash, skill_weight_total, content_hash, posted_at, raw_data,
+                         first_seen_at, last_seen_at, is_active)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), true)
+                        RETURNING id
                         """,
                         (
                             board_id,
@@ -194,10 +310,16 @@ async def sync_single_board(
                             job.team,
                             job.apply_url,
                             job.description,
+                            snippet,
+                            infer_visa_sponsorship(text),
+                            skill_hash,
+                            sum(skill_weights.values()),
+                            content_hash,
                             job.posted_at,
                             json.dumps(job.raw_data) if job.raw_data else None,
                         )
                     )
+                    reindex[str(cursor.fetchone()[0])] = skill_weights
                     jobs_created += 1
 
             # Mark jobs no longer in API response as inactive
@@ -207,13 +329,38 @@ async def sync_single_board(
                 cursor.execute(
                     f"""
                     UPDATE discovered_jobs
-                    SET is_active = false, updated_at = NOW()
+                    SET is_active = false, skill_index_hash = NULL, updated_at = NOW()
                     WHERE board_id = %s AND external_id IN ({placeholders})
                     """,
                     [board_id] + list(stale_ids)
                 )
+                # Inactive jobs leave the recommendation index (re-added if they come back)
+                cursor.execute(
+                    "DELETE FROM job_skill_index WHERE job_id = ANY(%s::uuid[])",
+                    ([str(existing[external_id][0]) for external_id in stale_ids],)
+                )
                 logger.info(f"Marked {len(stale_ids)} stale jobs as inactive for board {board_identifier}")
 
+            # Rewrite job_skill_index rows only for new jobs and jobs whose skills changed
+            if reindex:
+                cursor.execute(
+                    "DELETE FROM job_skill_index WHERE job_id = ANY(%s::uuid[])",
+                    (list(reindex),)
+                )
+                rows = [
+                    (skill, job_id, weight)
+                    for job_id, skill_weights in reindex.items()
+                    for skill, weight in skill_weights.items()
+                ]
+                if rows:
+                    execute_values(
+                        cursor,
+                        "INSERT INTO job_skill_index (skill, job_id, weight) VALUES %s",
+                        rows,
+                        page_size=1000,
+                    )
+                logger.info(f"Reindexed skills of {len(reindex)} jobs for board {board_identifier}")
+
             # Update board sync status (success)
             cursor.execute(
                 """
@@ -229,6 +376,9 @@ async def sync_single_board(
 
             pass  # commit handled by get_raw_cursor context manager
 
+        # Committed: cached /jobs listings may now miss new jobs or show stale ones
+        jobs_cache.invalidate()
+
         return BoardSyncResult(
             board_id=board_id,
             provider=provider,
@@ -239,6 +389,20 @@ async def sync_single_board(
             success=True,
         )
 
+    except CircuitOpenError as e:
+        # Provider-wide outage, not this board's fault: skip without touching its failure count
+        logger.warning(f"Skipped board {board_identifier}: {str(e)}")
+        return BoardSyncResult(
+            board_id=board_id,
+            provider=provider,
+            board_identifier=board_identifier,
+            jobs_fetched=0,
+            jobs_created=0,
+            jobs_updated=0,
+            success=False,
+            skipped=True,
+            error=str(e)[:200],
+        )
     except HTTPClientError as e:
         # Handle API error with failure tracking
         return await handle_board_failure(
@@ -0,0 +1,210 @@
+"""
+Server-side application form parsing for speculative autofill planning.
+
+Produces field dicts in the same shape the browser extension extracts
+(ExtractedFormField), so a plan warmed at ingest time uses the same
+question_signatures the extension later sends for the live page.
+"""
+from typing import List, Dict, Any, Optional
+import json
+import logging
+import re
+
+from bs4 import BeautifulSoup
+
+from app.services.job_providers.ashby import extract_app_data
+
+logger = logging.getLogger(__name__)
+
+# Application page suffix per job board (JD URL + suffix = application form URL)
+APPLICATION_PATH_SUFFIXES = {
+    "lever": "/apply",
+    "ashby": "/application",
+}
+
+_SKIPPED_INPUT_TYPES = {"hidden", "submit", "button", "reset", "image"}
+
+# Ashby applicationForm field types -> extension inputType
+_ASHBY_INPUT_TYPES = {
+    "String": "text",
+    "Email": "email",
+    "Phone": "tel",
+    "File": "file",
+    "LongText": "textarea",
+    "ValueSelect": "select",
+    "MultiValueSelect": "checkbox",
+    "Boolean": "radio",
+    "Date": "date",
+    "Number": "number",
+    "Location": "text",
+    "SocialLink": "url",
+    "Url": "url",
+}
+
+
+def build_application_url(job_board: str, base_url: str) -> Optional[str]:
+    """Application form URL for a JD base URL, or None if the board has no separate form page."""
+    suffix = APPLICATION_PATH_SUFFIXES.get(job_board)
+    if not suffix:
+        return None
+    return base_url.rstrip("/") + suffix
+
+
+def _selector_for(element) -> Optional[str]:
+    """Same selector rules as the extension's generateSelector()."""
+    element_id = element.get("id")
+    if element_id:
+        if element_id[0].isdigit():
+            return f'[id="{element_id}"]'
+        return f"#{element_id}"
+    name = element.get("name")
+    if name:
+        return f'[name="{name}"]'
+    return None
+
+
+def _label_for(soup, element) -> Optional[str]:
+    """Same label resolution order as the extension's findLabelForInput()."""
+    element_id = element.get("id")
+    if element_id:
+        label = soup.find("label", attrs={"for": element_id})
+        if label:
+            return label.get_text(" ", strip=True)
+    parent = element.find_parent("label")
+    if parent:
+        return parent.get_text(" ", strip=True)
+    # Lever wraps each question as .application-question > .application-label + .application-field
+    question = element.find_parent(class_="application-question")
+    if question:
+        label = question.find(class_="application-label")
+        if label:
+            return label.get_text(" ", strip=True)
+    if element.get("aria-label"):
+        return element["aria-label"]
+    if element.get("placeholder"):
+        return element["placeholder"]
+    return None
+
+
+def _is_required(element, label: Optional[str]) -> bool:
+    return (
+        element.has_attr("required")
+        or element.get("aria-required") == "true"
+        or bool(label and ("*" in label or "✱" in label))
+    )
+
+
+def parse_html_application_form(html: str) -> List[Dict[str, Any]]:
+    """
+    Parse server-rendered form controls (Lever application pages) into
+    extension-style field dicts.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    fields: List[Dict[str, Any]] = []
+    groups: Dict[str, Dict[str, Any]] = {}
+
+    for element in soup.find_all(["input", "textarea", "select"]):
+        tag = element.name
+        input_type = (element.get("type") or "text").lower() if tag == "input" else tag
+        if input_type in _SKIPPED_INPUT_TYPES:
+            continue
+        label = _label_for(soup, element)
+        name = element.get("name")
+
+        if input_type in {"radio", "checkbox"} and name:
+            group = groups.get(name)
+            if group is None:
+                group = {
+                    "type": "radio" if input_type == "radio" else "checkbox-group",
+                    "inputType": input_type,
+                    "name": name,
+                    "label": name,
+                    "required": _is_required(element, label),
+                    "options": [],
+                    "selector": f'input[name="{name}"]',
+                }
+                # The question text sits on the group container, not the individual choice
+                question = element.find_parent(class_="application-question")
+                if question and question.find(class_="application-label"):
+                    group["label"] = question.find(class_="application-label").get_text(" ", strip=True)
+                groups[name] = group
+                fields.append(group)
+            group["options"].append({
+                "value": element.get("value") or "",
+                "label": label or element.get("value") or "",
+            })
+            continue
+
+        selector = _selector_for(element)
+        if not selector:
+            continue
+
+        field: Dict[str, Any] = {
+            "type": tag,
+            "inputType": input_type,
+            "name": name,
+            "id": element.get("id"),
+            "label": label,
+            "placeholder": element.get("placeholder"),
+            "required": _is_required(element, label),
+            "selector": selector,
+        }
+        if tag == "select":
+            field["options"] = [
+                {"value": opt.get("value") or opt.get_text(strip=True), "label": opt.get_text(strip=True)}
+                for opt in element.find_all("option")
+                if opt.get_text(strip=True) or opt.get("value")
+            ]
+        fields.append(field)
+
+    return fields
+
+
+def parse_ashby_application_form(html: str) -> List[Dict[str, Any]]:
+    """
+    Parse the applicationForm embedded in an Ashby page's window.__appData.
+    Ashby renders the form client-side, so the server HTML has no form controls.
+    """
+    app_data = extract_app_data(html)
+    if not app_data:
+        return []
+    posting = app_data.get("posting") or {}
+    form = posting.get("applicationForm") or app_data.get("applicationForm") or {}
+
+    fields: List[Dict[str, Any]] = []
+    for section in form.get("sections") or []:
+        for entry in section.get("fieldEntries") or []:
+            field = entry.get("field") or {}
+            path = field.get("path")
+            if not path:
+                continue
+            input_type = _ASHBY_INPUT_TYPES.get(field.get("type"), "text")
+            options = [
+                {"value": str(v.get("value") or v.get("label")), "label": v.get("label") or str(v.get("value"))}
+                for v in field.get("selectableValues") or []
+                if isinstance(v, dict)
+            ]
+            if field.get("type") == "Boolean" and not options:
+                options = [{"value": "Yes", "label": "Yes"}, {"value": "No", "label": "No"}]
+            fields.append({
+                "type": "textarea" if input_type == "textarea" else "input",
+                "inputType": input_type,
+                "name": path,
+                "id": path,
+                "label": field.get("title") or path,
+                "required": bool(entry.get("isRequired", not field.get("isNullable", True))),
+                "selector": f'[id="{path}"]' if path[0].isdigit() else f"#{path}",
+                "options": options,
+            })
+    return fields
+
+
+def parse_application_form(job_board: str, html: str) -> List[Dict[str, Any]]:
+    """Parse an application page into extension-style fields for the given job board."""
+    try:
+        if job_board == "ashby":
+            return parse_ashby_application_form(html)
+        return parse_html_application_form(html)
+    except Exception as e:
+        logger.warning(f"Failed to parse {job_board} application form: {str(e)}")
+        return []
@@ -6,12 +6,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '''..
 
 from langgraph.graph import StateGraph, START, END
 from app.models import AutofillAgentInput, AutofillAgentOutput
-from app.dag_utils import FormField, FormFieldAnswer, AutofillPlanJSON, RunStatus, AutofillPlanSummary, build_autofill_plan, summarize_autofill_plan, LLMAnswersResponse
+from app.dag_utils import FormField, FormFieldAnswer, AutofillPlanJSON, RunStatus, AutofillPlanSummary, build_autofill_plan, summarize_autofill_plan, LLMAnswersResponse, get_option_index, reuse_prior_answers
+from app.prompt_builder import PromptMetrics, build_answers_prompt
 from typing import TypedDict, List, Dict, Any, Optional
 from app.services.llm import LLM
 from app.services.supabase import Supabase
 import logging
-import re
 import json
 
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +30,7 @@ class AutofillAgentState(TypedDict):
     answers: Dict[str, FormFieldAnswer]
     plan_json: Optional[AutofillPlanJSON]
     plan_summary: Optional[AutofillPlanSummary]
+    prompt_metrics: Optional[PromptMetrics]
     status: RunStatus
     errors: List[str]
 
@@ -58,6 +59,7 @@ class DAG():
             "answers": {},
             "plan_json": None,
             "plan_summary": None,
+            "prompt_metrics": None,
             "status": "running",
             "errors": []
         }
@@ -110,169 +112,53 @@ class DAG():
                 logger.warning("generate_answers_node: no form_fields found")
                 return {"answers": {}}
 
-            # Minimal user + job context for LLM (avoid dumping entire dom_html)
-            user_ctx = {
-                "full_name": input_data.get("full_name"),
-                "first_name": input_data.get("first_name"),
-                "last_name": input_data.get("last_name"),
-                "email": input_data.get("email"),
-                "phone_number": input_data.get("phone_number"),
-                "linkedin_url": input_data.get("linkedin_url"),
-                "github_url": input_data.get("github_url"),
-                "portfolio_url": input_data.get("portfolio_url"),
-                "other_url": input_data.get("other_url"),
-                "address": input_data.get("address"),
-                "city": input_data.get("city"),
-                "state": input_data.get("state"),
-                "zip_code": input_data.get("zip_code"),
-                "country": input_data.get("country"),
-                "authorized_to_work_in_us": input_data.get("authorized_to_work_in_us"),
-                "visa_sponsorship": input_data.get("visa_sponsorship"),
-                "visa_sponsorship_type": input_data.get("visa_sponsorship_type"),
-                "desired_salary": input_data.get("desired_salary"),
-                "desired_location": input_data.get("desired_location"),
-                "gender": input_data.get("gender"),
-                "race": input_data.get("race"),
-                "veteran_status": input_data.get("veteran_status"),
-                "disability_status": input_data.get("disability_status"),
-            }
-
-            job_ctx = {
-                "job_title": input_data.get("job_title"),
-                "company": input_data.get("company"),
-                "job_posted": input_data.get("job_posted"),
-                "job_description": input_data.get("job_description"),
-                "required_skills": input_data.get("required_skills"),
-                "preferred_skills": input_data.get("preferred_skills"),
-                "education_requirements": input_data.get("education_requirements"),
-                "experience_requirements": input_data.get("experience_requirements"),
-                "keywords": input_data.get("keywords"),
-                "open_to_visa_sponsorship": input_data.get("open_to_visa_sponsorship"),
-                "job_site_type": input_data.get("job_site_type"),
-            }
-
-            # Send full resume context to improve answer quality.
-            resume_profile = input_data.get("resume_profile")
-            resume_ctx = None
-            try:
-                # resume_profile might be Pydantic model or dict
-                if resume_profile:
-                    if hasattr(resume_profile, "model_dump"):
-                        rp = resume_profile.model_dump()
-                    else:
-                        rp = resume_profile
-                    resume_ctx = rp
-            except Exception:
-                resume_ctx = None
-
-            # Provide a concise field spec list
-            fields_spec = [
-                {
-                    "question_signature": f.get("question_signature"),
-                    "label": f.get("label"),
-                    "input_type": f.get("input_type"),
-                    "required": f.get("required"),
-                    "options": f.get("options", []),
-                }
-                for f in form_fields
-            ]
-
-            prompt_obj = {
-                "task": f"Generate answers for ALL {len(fields_spec)} job application form fields. You MUST provide an answer for EVERY field.",
-                "critical_rules": [
-                    f"MANDATORY: Return exactly {len(fields_spec)} answers - one for each field in form_fields. No field can be omitted.",
-                    "MANDATORY: Set action='autofill' for ALL fields. Never use 'skip' or 'suggest'.",
-                    "If you don't know an answer, still use action='autofill' with value='' and confidence between 0.0-0.3.",
-                ],
-                "value_rules": [
-                    "For select/radio/checkbox with options: return EXACTLY one option string from the provided list (case-sensitive match).",
-                    "For select/radio with no perfect match: pick the closest option, set action='autofill' with lower confidence.",
-                    "For text/textarea: provide your best answer using user_ctx, resume_ctx, or job_ctx data.",
-                    "For missing demographic/EEO info: use value='' with confidence=0.1 (still action='autofill').",
-                    "Never invent sensitive data (SSN, bank details). Use empty string if truly unknown.",
-                ],
-                "context": {
-                    "page_url": input_data.get("page_url"),
-                    "user_ctx": user_ctx,
-                    "job_ctx": job_ctx,
-                    "resume_ctx": resume_ctx,
-                },
-                "form_fields": fields_spec,
-                "output_format": {
-                    "answers": {
-                        "<question_signature>": {
-                            "value": "string|number|boolean|''",
-                            "action": "autofill",
-                            "confidence": "0.0-1.0",
-                            "source": "profile|resume|jd|llm|unknown",
-                        }
-                    }
-                },
-                "final_reminder": f"You MUST return exactly {len(fields_spec)} answer objects. Every field gets action='autofill'.",
-            }
-
-            prompt = json.dumps(prompt_obj, ensure_ascii=False)
-
-            logger.debug("LLM prompt (generate_answers_node): %s", prompt)
-
-            llm = LLM()
-            response = llm.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_json_schema": LLMAnswersResponse.model_json_schema(),
-                },
-            )
+            # Delta planning: answers from the parent run are reused for unchanged fields
+            answers_out, pending_fields = reuse_prior_answers(form_fields, input_data.get("prior_plan_fields"))
+            if input_data.get("parent_run_id"):
+                logger.info(
+                    "Delta planning from parent run %s: reused %d answers, %d fields to plan",
+                    input_data.get("parent_run_id"), len(answers_out), len(pending_fields),
+                )
+
+            validated = None
+            prompt_metrics = None
+            # File inputs are answered locally, so only call the LLM if another field is pending
+            if any(f.get("input_type") != "file" for f in pending_fields):
+                # Compact prompt: null keys dropped, long text truncated to token budgets,
+                # only the resume sections relevant to these fields included
+                # Metrics are logged per run by the /autofill/plan route
+                prompt, prompt_metrics = build_answers_prompt(input_data, pending_fields)
+
+                logger.debug("LLM prompt (generate_answers_node): %s", prompt)
+
+                llm = LLM()
+                response = llm.client.models.generate_content(
+                    model="gemini-2.5-flash",
+                    contents=prompt,
+                    config={
+                        "response_mime_type": "application/json",
+                        "response_json_schema": LLMAnswersResponse.model_json_schema(),
+                    },
+                )
+
+                # Extract text robustly across SDK variants
+                resp_text = None
+                if hasattr(response, "text") and response.text:
+                    resp_text = response.text
+                else:
+                    # fallback for other response shapes
+                    try:
+                        resp_text = response.candidates[0].content.parts[0].text
+                    except Exception:
+                        resp_text = str(response)
+
+                logger.debug("LLM raw response (generate_answers_node): %s", resp_text)
 
-            # Extract text robustly across SDK variants
-            resp_text = None
-            if hasattr(response, "text") and response.text:
-                resp_text = response.text
-            else:
-                # fallback for other response shapes
-                try:
-                    resp_text = response.candidates[0].content.parts[0].text
-                except Exception:
-                    resp_text = str(response)
-
-            logger.debug("LLM raw response (generate_answers_node): %s", resp_text)
-
-            parsed = json.loads(resp_text)
-            validated = LLMAnswersResponse.model_validate(parsed)
-
-            answers_out: Dict[str, FormFieldAnswer] = {}
-
-            def _norm_option_text(text: Any) -> str:
-                text = "" if text is None else str(text)
-                text = text.strip().lower()
-                text = re.sub(r"\s+", " ", text)
-                text = re.sub(r"[^a-z0-9 ]+", "", text)
-                return text
-
-            def _match_option(value: Any, options: List[str]) -> Optional[str]:
-                if value is None:
-                    return None
-                target = _norm_option_text(value)
-                if not target:
-                    return None
-                for opt in options:
-                    if _norm_option_text(opt) == target:
-                        return opt
-                best = None
-                best_len = 0
-                for opt in options:
-                    norm_opt = _norm_option_text(opt)
-                    if not norm_opt:
-                        continue
-                    if target in norm_opt or norm_opt in target:
-                        if len(norm_opt) > best_len:
-                            best = opt
-                            best_len = len(norm_opt)
-                return best
+                parsed = json.loads(resp_text)
+                validated = LLMAnswersResponse.model_validate(parsed)
 
             # Normalize to your FormFieldAnswer schema
-            for f in form_fields:
+            for f in pending_fields:
                 sig = f.get("question_signature")
                 input_type = f.get("input_type")
 
@@ -295,7 +181,7 @@ class DAG():
                         }
                     continue
 
-                item = validated.answers.get(sig)
+                item = validated.answers.get(sig) if validated else None
 
                 if not item:
                     answers_out[sig] = {
@@ -314,7 +200,7 @@ class DAG():
                 value = item.value
                 options = f.get("options") or []
                 if input_type in {"select", "radio", "checkbox"} and options:
-                    match = _match_option(value, options)
+                    match = get_option_index(options).match(value, fuzzy=True)
                     if match is not None:
                         value = match
 
@@ -347,7 +233,7 @@ class DAG():
             )
             logger.debug("Generated answers (normalized): %s", json.dumps(answers_out, ensure_ascii=False))
 
-            return {"answers": answers_out}
+            return {"answers": answers_out, "prompt_metrics": prompt_metrics}
 
         except Exception as e:
             logger.error(f"Error in generate_answers_node: {str(e)}", exc_info=True)
@@ -371,6 +257,9 @@ class DAG():
         plan_json = build_autofill_plan(form_fields, answers, run_id, page_url)
         plan_summary = summarize_autofill_plan(plan_json)
         status: RunStatus = "failed" if errors else "completed"
+        # Speculative plans stay provisional until the extension confirms the live form
+        if status == "completed" and state.get("input_data", {}).get("provisional"):
+            status = "provisional"
 
         try:
             supabase = Supabase()
@@ -1,10 +1,17 @@
 """
 Shared HTTP client with exponential backoff retry for external API calls.
 """
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlsplit
 import aiohttp
 import asyncio
+import codecs
+import json
 import logging
-from typing import Optional, Dict, Any
+import os
+import time
+from typing import Optional, Dict, Any, List, Literal
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,44 @@ MAX_RETRIES = 3
 INITIAL_BACKOFF = 1  # seconds
 MAX_BACKOFF = 16  # seconds
 BACKOFF_MULTIPLIER = 2
+READ_CHUNK_SIZE = 64 * 1024  # bytes per read when streaming text/bytes bodies
+PREWARM_TIMEOUT = 5  # seconds per host
+
+# Connector defaults, sized for concurrent board sync (many hosts, a few connections each)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))  # seconds an idle connection stays open
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))  # seconds
+
+# Per-host circuit breaker: after this many consecutive failed attempts (429, 5xx,
+# connection errors, timeouts) the host is failed fast until the reset timeout passes,
+# then a single probe request decides whether it closes again
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("HTTP_CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("HTTP_CIRCUIT_RESET_TIMEOUT", "30"))  # seconds
+# Breakers kept (least recently used closed ones are dropped past this); ingest and
+# prefetch fetch arbitrary career sites, so the set of hosts is unbounded
+CIRCUIT_MAX_HOSTS = int(os.getenv("HTTP_CIRCUIT_MAX_HOSTS", "1024"))
+
+# Entries kept by the optional short-lived response cache (request(..., cache_ttl=...))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+
+@dataclass(frozen=True)
+class ConnectorConfig:
+    """TCP connector settings for the shared session"""
+    limit: int = HTTP_POOL_LIMIT  # total open connections (0 = unlimited)
+    limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST  # per (host, port, ssl) (0 = unlimited)
+    keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT
+    dns_cache_ttl: int = HTTP_DNS_CACHE_TTL
+
+    def build(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
 
 
 class HTTPClientError(Exception):
@@ -24,27 +69,250 @@ class HTTPClientError(Exception):
         self.retryable = retryable
 
 
+class CircuitOpenError(HTTPClientError):
+    """Raised without contacting the host while its circuit breaker is open"""
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.0f}s", retryable=True)
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one host.
+
+    closed    -> requests pass; CIRCUIT_FAILURE_THRESHOLD failures in a row open it
+    open      -> requests fail fast with CircuitOpenError until CIRCUIT_RESET_TIMEOUT passes
+    half_open -> one probe request is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def before_request(self) -> bool:
+        """
+        Raise CircuitOpenError unless a request may be sent now. Returns True
+        when the caller holds the half-open probe slot.
+        """
+        if self.state == "closed":
+            return False
+        if self.state == "open":
+            retry_in = self.opened_at + CIRCUIT_RESET_TIMEOUT - time.monotonic()
+            if retry_in > 0:
+                raise CircuitOpenError(self.host, retry_in)
+            self.state = "half_open"
+            logger.info(f"Circuit half-open for {self.host}, probing")
+        if self.probe_in_flight:
+            raise CircuitOpenError(self.host, 0)
+        self.probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"Circuit closed for {self.host}")
+        self.state = "closed"
+        self.failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == "half_open" or self.failures >= CIRCUIT_FAILURE_THRESHOLD:
+            if self.state != "open":
+                logger.warning(f"Circuit opened for {self.host} after {self.failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Free the half-open slot when the probe ended without an outcome (e.g. cancelled)."""
+        self.probe_in_flight = False
+        if self.state == "half_open":
+            self.state = "open"
+
+
 class HTTPClient:
     """Singleton HTTP client with retry logic"""
     _instance = None
     _session: Optional[aiohttp.ClientSession] = None
+    _connector_config: ConnectorConfig = ConnectorConfig()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._breakers = OrderedDict()
+            cls._instance._inflight = {}
+            cls._instance._response_cache = OrderedDict()
         return cls._instance
 
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        breaker = self._breakers.get(host)
+        if breaker is not None:
+            self._breakers.move_to_end(host)
+            return breaker
+        breaker = self._breakers[host] = CircuitBreaker(host)
+        if len(self._breakers) > CIRCUIT_MAX_HOSTS:
+            # Open and probing breakers are kept; a dropped closed one restarts at zero failures
+            excess = len(self._breakers) - CIRCUIT_MAX_HOSTS
+            evict = []
+            for old_host, old in self._breakers.items():
+                if len(evict) >= excess:
+                    break
+                if old_host != host and old.state == "closed" and not old.probe_in_flight:
+                    evict.append(old_host)
+            for old_host in evict:
+                del self._breakers[old_host]
+        return breaker
+
+    @staticmethod
+    async def _backoff(breaker: CircuitBreaker, delay: float) -> None:
+        """Sleep before a retry, unless the host's circuit has opened meanwhile."""
+        if breaker.state == "open":
+            raise CircuitOpenError(breaker.host, CIRCUIT_RESET_TIMEOUT)
+        await asyncio.sleep(delay)
+
+    def circuit_state(self, url: str) -> str:
+        """closed / open / half_open for the URL's host"""
+        breaker = self._breakers.get(urlsplit(url).netloc.lower())
+        return breaker.state if breaker else "closed"
+
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            # Idle connections are kept per host, so repeat fetches from the same
+            # career site or API skip DNS, TCP and TLS setup
+            self._session = aiohttp.ClientSession(timeout=timeout, connector=self._connector_config.build())
         return self._session
 
+    @property
+    def connector_config(self) -> ConnectorConfig:
+        return self._connector_config
+
+    async def configure(self, config: ConnectorConfig) -> None:
+        """
+        Replace the connector settings. An open session is closed (its idle
+        connections dropped) so the next request builds one with the new settings.
+        """
+        self._connector_config = config
+        await self.close()
+        logger.info(f"HTTP client connector configured: {config}")
+
+    async def prewarm(self, urls: List[str]) -> None:
+        """
+        Open a keep-alive connection to each URL's host (DNS lookup, TCP and TLS
+        handshake) so the first real request doesn't pay for it. Failures are
+        logged and ignored.
+        """
+        session = await self._get_session()
+        origins = list(dict.fromkeys(
+            f"{parts.scheme}://{parts.netloc}/" for parts in map(urlsplit, urls) if parts.scheme and parts.netloc
+        ))
+
+        async def warm(origin: str) -> bool:
+            try:
+                async with session.head(origin, timeout=aiohttp.ClientTimeout(total=PREWARM_TIMEOUT), allow_redirects=False):
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"HTTP prewarm failed for {origin}: {str(e)}")
+                return False
+
+        results = await asyncio.gather(*(warm(origin) for origin in origins))
+        logger.info(f"HTTP client prewarmed {sum(results)}/{len(origins)} hosts")
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Connection pool usage: idle (open, reusable), acquired (in use) and
+        waiting (requests blocked on limit/limit_per_host), in total and per host.
+        """
+        config = self._connector_config
+        stats: Dict[str, Any] = {
+            "session_open": False,
+            "limit": config.limit,
+            "limit_per_host": config.limit_per_host,
+            "keepalive_timeout": config.keepalive_timeout,
+            "dns_cache_ttl": config.dns_cache_ttl,
+            "open": 0,
+            "idle": 0,
+            "acquired": 0,
+            "waiting": 0,
+            "hosts": {},
+        }
+        if self._session is None or self._session.closed:
+            return stats
+        connector = self._session.connector
+        stats["session_open"] = True
+
+        # aiohttp has no public API for per-host pool state; read the connector's bookkeeping
+        hosts: Dict[str, Dict[str, int]] = {}
+
+        def host_entry(key) -> Dict[str, int]:
+            return hosts.setdefault(f"{key.host}:{key.port}", {"idle": 0, "acquired": 0, "waiting": 0})
+
+        for key, conns in getattr(connector, "_conns", {}).items():
+            if conns:
+                host_entry(key)["idle"] += len(conns)
+        for key, acquired in getattr(connector, "_acquired_per_host", {}).items():
+            if acquired:
+                host_entry(key)["acquired"] += len(acquired)
+        for key, waiters in getattr(connector, "_waiters", {}).items():
+            if waiters:
+                host_entry(key)["waiting"] += len(waiters)
+
+        stats["idle"] = sum(h["idle"] for h in hosts.values())
+        stats["acquired"] = len(getattr(connector, "_acquired", ()))
+        stats["waiting"] = sum(h["waiting"] for h in hosts.values())
+        stats["open"] = stats["idle"] + stats["acquired"]
+        stats["hosts"] = hosts
+        return stats
+
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
 
+    @staticmethod
+    async def _read_body(
+        response: aiohttp.ClientResponse,
+        response_type: Literal["text", "bytes"],
+        max_bytes: Optional[int],
+    ) -> Any:
+        """
+        Stream the body in chunks, failing as soon as it passes max_bytes. Text is
+        decoded incrementally, so the raw bytes are never held alongside the str.
+        """
+        if max_bytes is not None and response.content_length is not None and response.content_length > max_bytes:
+            raise HTTPClientError(
+                f"Response body too large: {response.content_length} bytes (limit {max_bytes})",
+                retryable=False
+            )
+
+        decoder = None
+        if response_type == "text":
+            try:
+                decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        parts = []
+        received = 0
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            received += len(chunk)
+            if max_bytes is not None and received > max_bytes:
+                raise HTTPClientError(
+                    f"Response body too large: over {max_bytes} bytes",
+                    retryable=False
+                )
+            parts.append(decoder.decode(chunk) if decoder else chunk)
+
+        if decoder:
+            parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
+        return b"".join(parts)
+
     async def request(
         self,
         method: str,
@@ -54,6 +322,10 @@ class HTTPClient:
         params: Optional[Dict[str, Any]] = None,
         timeout: Optional[int] = None,
         max_retries: int = MAX_RETRIES,
+        response_type: Literal["json", "text", "bytes"] = "json",
+        max_bytes: Optional[int] = None,
+        coalesce: Optional[bool] = None,
+        cache_ttl: Optional[float] = None,
     ) -> Any:
         """
         Make HTTP request with exponential backoff retry.
@@ -61,19 +333,100 @@ class HTTPClient:
         Retries on: 429 (rate limit), 500, 502, 503, 504, connection errors, timeouts
         Does NOT retry on: 400, 401, 403, 404
 
+        Identical requests (method, URL, params, body, headers, response mode) that
+        are in flight at the same time share one upstream call. The result is shared
+        too, so callers must treat it as read-only.
+
+        Args:
+            response_type: "json" (parsed), "text" (decoded using the response charset) or "bytes"
+            max_bytes: Cap on the text/bytes body; larger responses raise a non-retryable error
+            coalesce: Merge identical in-flight requests. Defaults to True for GET only;
+                pass True for idempotent POSTs (e.g. search APIs)
+            cache_ttl: Also serve this response from memory for cache_ttl seconds
+                (idempotent endpoints only). Errors are never cached
+
         Returns:
-            Parsed JSON response (dict or list)
+            Parsed JSON response (dict or list), or the body as str/bytes per response_type
 
         Raises:
+            CircuitOpenError: If the host's circuit breaker is open (also mid-retry,
+                instead of sleeping through the backoff)
             HTTPClientError: On non-retryable errors or after all retries exhausted
         """
+        if coalesce is None:
+            coalesce = method.upper() == "GET"
+        send_args = (method, url, headers, json_data, params, timeout, max_retries, response_type, max_bytes)
+        if not coalesce and not cache_ttl:
+            return await self._send(*send_args)
+
+        key = self._request_key(method, url, headers, json_data, params, timeout, max_retries, response_type, max_bytes)
+        if cache_ttl:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                expires_at, value = cached
+                if expires_at > time.monotonic():
+                    return value
+                del self._response_cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send(*send_args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done, cache_ttl))
+        else:
+            logger.debug(f"Coalesced {method} {url} onto an in-flight request")
+        # Shielded so one waiter giving up doesn't cancel the call for the others
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _request_key(method, url, headers, json_data, params, timeout, max_retries, response_type, max_bytes) -> tuple:
+        return (
+            method.upper(),
+            url,
+            json.dumps(params, sort_keys=True, default=str) if params else None,
+            json.dumps(json_data, sort_keys=True, default=str) if json_data is not None else None,
+            tuple(sorted(headers.items())) if headers else None,
+            timeout,
+            max_retries,
+            response_type,
+            max_bytes,
+        )
+
+    def _finish_inflight(self, key: tuple, task: asyncio.Task, cache_ttl: Optional[float]) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return  # exception() also marks it retrieved when every waiter has gone
+        if cache_ttl:
+            self._response_cache[key] = (time.monotonic() + cache_ttl, task.result())
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+                self._response_cache.popitem(last=False)
+
+    def clear_response_cache(self) -> None:
+        self._response_cache.clear()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        json_data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        timeout: Optional[int],
+        max_retries: int,
+        response_type: Literal["json", "text", "bytes"],
+        max_bytes: Optional[int],
+    ) -> Any:
+        """One request with retries, backoff and the host's circuit breaker (see request)."""
         session = await self._get_session()
+        breaker = self._breaker(url)
         backoff = INITIAL_BACKOFF
         last_error = None
 
         request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
 
         for attempt in range(max_retries + 1):
+            is_probe = breaker.before_request()
             try:
                 async with session.request(
                     method,
@@ -84,12 +437,16 @@ class HTTPClient:
                     timeout=request_timeout,
                 ) as response:
                     if response.status == 200:
-                        return await response.json()
+                        breaker.record_success()
+                        if response_type == "json":
+                            return await response.json()
+                        return await self._read_body(response, response_type, max_bytes)
 
                     response_text = await response.text()
 
                     # Check if retryable
                     if response.status in {429, 500, 502, 503, 504}:
+                        breaker.record_failure()
                         last_error = HTTPClientError(
                             f"HTTP {response.status}: {response_text[:200]}",
                             status_code=response.status,
@@ -109,11 +466,13 @@ class HTTPClient:
                                 f"Retryable error {response.status} for {url}, "
                                 f"attempt {attempt + 1}/{max_retries + 1}, waiting {backoff}s"
                             )
-                            await asyncio.sleep(backoff)
+                            await self._backoff(breaker, backoff)
                             backoff = min(backoff * BACKOFF_MULTIPLIER, MAX_BACKOFF)
                             continue
+                        raise last_error
 
-                    # Non-retryable error
+                    # Non-retryable error (the host itself is responding)
+                    breaker.record_success()
                     raise HTTPClientError(
                         f"HTTP {response.status}: {response_text[:200]}",
                         status_code=response.status,
@@ -121,27 +480,35 @@ class HTTPClient:
                     )
 
             except aiohttp.ClientError as e:
+                breaker.record_failure()
                 last_error = HTTPClientError(f"Connection error: {str(e)}", retryable=True)
                 if attempt < max_retries:
                     logger.warning(
                         f"Connection error for {url}, attempt {attempt + 1}/{max_retries + 1}, waiting {backoff}s"
                     )
-                    await asyncio.sleep(backoff)
+                    await self._backoff(breaker, backoff)
                     backoff = min(backoff * BACKOFF_MULTIPLIER, MAX_BACKOFF)
                     continue
                 raise last_error
 
             except asyncio.TimeoutError:
+                breaker.record_failure()
                 last_error = HTTPClientError("Request timed out", retryable=True)
                 if attempt < max_retries:
                     logger.warning(
                         f"Timeout for {url}, attempt {attempt + 1}/{max_retries + 1}, waiting {backoff}s"
                     )
-                    await asyncio.sleep(backoff)
+                    await self._backoff(breaker, backoff)
                     backoff = min(backoff * BACKOFF_MULTIPLIER, MAX_BACKOFF)
                     continue
                 raise last_error
 
+            except BaseException:
+                # Cancelled or failed without an outcome; don't leave the half-open slot taken
+                if is_probe:
+                    breaker.release_probe()
+                raise
+
         # All retries exhausted
         if last_error:
             raise last_error
@@ -1,15 +1,38 @@
 """
 Ashby job board API client.
 API: https://api.ashbyhq.com/posting-api/job-board/{boardName}
+
+The posting API only lists whole boards, so single postings are read from the
+window.__appData state embedded in the hosted posting page instead.
 """
 from typing import List, Optional
 from datetime import datetime
 from app.services.job_providers.base import BaseJobProvider, NormalizedJob
 from app.services.http_client import http_client
+import json
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+HOSTED_BOARD_URL = "https://jobs.ashbyhq.com"
+# Posting pages are a few hundred KB of HTML; anything far larger isn't one
+POSTING_PAGE_MAX_BYTES = 2 * 1024 * 1024
+
+_APP_DATA_RE = re.compile(r"window\.__appData\s*=\s*")
+
+
+def extract_app_data(html: str) -> Optional[dict]:
+    """The window.__appData object an Ashby hosted page embeds, or None."""
+    match = _APP_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+        return data if isinstance(data, dict) else None
+    except json.JSONDecodeError:
+        return None
+
 
 class AshbyProvider(BaseJobProvider):
 
@@ -45,6 +68,36 @@ class AshbyProvider(BaseJobProvider):
         logger.info(f"Fetched {len(jobs)} jobs from Ashby board {board_identifier}")
         return jobs
 
+    async def fetch_job(self, board_identifier: str, job_id: str) -> Optional[NormalizedJob]:
+        url = f"{HOSTED_BOARD_URL}/{board_identifier}/{job_id}"
+        logger.info(f"Fetching Ashby job page {url}")
+        html = await http_client.request("GET", url, response_type="text", max_bytes=POSTING_PAGE_MAX_BYTES)
+        return self.job_from_page(board_identifier, job_id, html)
+
+    def job_from_page(self, board_identifier: str, job_id: str, html: str) -> Optional[NormalizedJob]:
+        app_data = extract_app_data(html or "")
+        posting = (app_data or {}).get("posting")
+        if not isinstance(posting, dict) or str(posting.get("id") or job_id) != job_id:
+            return None
+        organization = app_data.get("organization") or {}
+        # Same shape as a posting-api listing entry, so _normalize_job handles both
+        raw = {
+            "id": job_id,
+            "title": posting.get("title"),
+            "location": posting.get("locationName"),
+            "department": posting.get("departmentName"),
+            "team": posting.get("teamName"),
+            "employmentType": posting.get("employmentType"),
+            "isRemote": posting.get("isRemote") or posting.get("workplaceType") == "Remote",
+            "descriptionHtml": posting.get("descriptionHtml"),
+            "descriptionPlain": posting.get("descriptionPlainText"),
+            "publishedAt": posting.get("publishedDate"),
+            "company_name": organization.get("name") if isinstance(organization, dict) else None,
+        }
+        if not raw["title"]:
+            return None
+        return self._normalize_job({k: v for k, v in raw.items() if v is not None}, board_identifier)
+
     def _normalize_job(self, raw: dict, board_identifier: str) -> NormalizedJob:
         """Convert Ashby API response to NormalizedJob"""
         # Ashby job structure:
@@ -2,11 +2,13 @@
 Abstract base class for job board provider API clients.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
+from app.job_urls import classify_job_url
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +67,38 @@ class BaseJobProvider(ABC):
         """Build the full API URL for fetching jobs"""
         pass
 
+    def parse_job_url(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Parse a posting URL on this provider's hosted board.
+
+        Returns:
+            (board_identifier, job_id), or None if the URL isn't a posting on this provider
+        """
+        job_url = classify_job_url(url)
+        if job_url.provider != self.provider_name or not job_url.job_id:
+            return None
+        return job_url.board_identifier, job_url.job_id
+
+    async def fetch_job(self, board_identifier: str, job_id: str) -> Optional[NormalizedJob]:
+        """
+        Fetch a single posting. The default scans the board listing;
+        override where the provider has a per-posting endpoint.
+
+        Raises:
+            HTTPClientError: On API errors
+        """
+        for job in await self.fetch_jobs(board_identifier):
+            if job.external_id == job_id:
+                return job
+        return None
+
+    def job_from_page(self, board_identifier: str, job_id: str, html: str) -> Optional[NormalizedJob]:
+        """
+        Parse a posting from its hosted page HTML, for providers whose pages embed
+        the posting data. Lets ingest skip the API call for a page it already has.
+        """
+        return None
+
     def extract_company_name(self, board_identifier: str, raw_response: dict) -> Optional[str]:
         """
         Extract company name from API response or infer from board identifier.
@@ -47,6 +47,12 @@ class GreenhouseProvider(BaseJobProvider):
         logger.info(f"Fetched {len(jobs)} jobs from Greenhouse board {board_identifier}")
         return jobs
 
+    async def fetch_job(self, board_identifier: str, job_id: str) -> Optional[NormalizedJob]:
+        url = f"{self.build_api_url(board_identifier)}/{job_id}"
+        logger.info(f"Fetching Greenhouse job from {url}")
+        raw = await http_client.request("GET", url)
+        return self._normalize_job(raw, board_identifier) if isinstance(raw, dict) else None
+
     def _normalize_job(self, raw: dict, board_identifier: str) -> NormalizedJob:
         """Convert Greenhouse API response to NormalizedJob"""
         # Greenhouse job structure:
@@ -0,0 +1,97 @@
+"""
+In-process response cache for the public /jobs endpoints.
+
+The unfiltered, newest-first listing is identical for every anonymous visitor, so
+serialized responses are kept for a short TTL keyed by the normalized filters. Each
+entry carries a content-hash ETag: clients revalidate with If-None-Match and get a
+304 when the body would be the same, even after the entry was rebuilt. sync_single_board
+calls invalidate() after committing a board's jobs so new and stale postings show up
+without waiting for the TTL.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+import hashlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+JOBS_CACHE_TTL = float(os.getenv("JOBS_CACHE_TTL", "30"))  # seconds
+JOBS_CACHE_MAX_ENTRIES = int(os.getenv("JOBS_CACHE_MAX_ENTRIES", "256"))
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check: a list of (possibly weak) tags, or *."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class JobsResponseCache:
+    """LRU of serialized responses with a TTL; safe to use from the threadpool."""
+
+    def __init__(self, ttl: float = JOBS_CACHE_TTL, max_entries: int = JOBS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by invalidate(); a response built from a query that started before
+        # the bump may predate the sync's commit and isn't stored
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, body: bytes, generation: int) -> CachedResponse:
+        entry = CachedResponse(body=body, etag=make_etag(body), expires_at=time.monotonic() + self.ttl)
+        if self.ttl <= 0:
+            return entry
+        with self._lock:
+            if generation != self._generation:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            dropped = len(self._entries)
+            self._entries.clear()
+        if dropped:
+            logger.debug(f"Jobs response cache invalidated ({dropped} entries)")
+
+
+jobs_cache = JobsResponseCache()
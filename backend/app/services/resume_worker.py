@@ -0,0 +1,163 @@
+"""
+Resume-processing worker pool.
+
+Uploads are queued on a bounded asyncio queue and handled by a fixed number
+of async workers. Each job runs its stages off the event loop:
+
+    download  (storage client, thread)      - skipped when the upload bytes are passed in
+    extract   (PyMuPDF, process pool)       - CPU-bound, so it gets its own processes
+    parse     (Gemini, thread)
+    write     (DB, thread)                  - the only stage that holds a pooled connection
+
+Each stage is timed and logged per job.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+
+from app.resume_pdf import extract_pdf_text
+from app.repositories import UserRepository
+from app.services.llm import LLM
+from app.services.supabase import Supabase
+from app.utils import extract_resume_profile
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RESUME_WORKER_CONCURRENCY = int(os.getenv("RESUME_WORKER_CONCURRENCY", "2"))
+RESUME_PDF_PROCESSES = int(os.getenv("RESUME_PDF_PROCESSES", "2"))
+RESUME_QUEUE_MAXSIZE = int(os.getenv("RESUME_QUEUE_MAXSIZE", "50"))
+
+
+class ResumeQueueFullError(Exception):
+    """Raised when the resume queue is at capacity"""
+    pass
+
+
+@dataclass
+class ResumeParseJob:
+    user_id: str
+    resume_path: str
+    file_bytes: Optional[bytes] = None  # the upload itself; downloaded from storage when absent
+    content_hash: Optional[str] = None  # sha256 of the file (users.resume_content_hash); the parse is cached under it
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class ResumeWorkerPool:
+    """Singleton pool of async resume workers backed by a PyMuPDF process pool"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._queue = None
+            cls._instance._workers = []
+            cls._instance._executor = None
+        return cls._instance
+
+    def start(self, supabase: Supabase, llm: LLM) -> None:
+        """Start the workers (from the app's startup hook, inside the running event loop)."""
+        if self._workers:
+            return
+        self._supabase = supabase
+        self._user_repo = UserRepository(supabase.db_pool)
+        self._llm = llm
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=RESUME_QUEUE_MAXSIZE)
+        # spawn: workers must not inherit the parent's DB pool / HTTP sessions
+        self._executor = ProcessPoolExecutor(
+            max_workers=RESUME_PDF_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._workers: List[asyncio.Task] = [
+            asyncio.create_task(self._worker(i)) for i in range(RESUME_WORKER_CONCURRENCY)
+        ]
+        logger.info(
+            f"Resume worker pool started: {RESUME_WORKER_CONCURRENCY} workers, "
+            f"{RESUME_PDF_PROCESSES} PDF processes, queue size {RESUME_QUEUE_MAXSIZE}"
+        )
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def has_capacity(self) -> bool:
+        return self._queue is not None and not self._queue.full()
+
+    def enqueue(self, job: ResumeParseJob) -> None:
+        """
+        Queue a resume for parsing.
+
+        Raises:
+            ResumeQueueFullError: If the queue is full (or the pool isn't running)
+        """
+        if self._queue is None:
+            raise ResumeQueueFullError("Resume worker pool is not running")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ResumeQueueFullError(f"Resume queue is full ({RESUME_QUEUE_MAXSIZE} pending)")
+        logger.info(f"Queued resume parse for user {job.user_id} (queue depth {self._queue.qsize()})")
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except Exception as e:
+                logger.error(f"Resume worker {worker_id} failed for user {job.user_id}: {str(e)}", exc_info=True)
+                try:
+                    content_hash = job.content_hash or (hashlib.sha256(job.file_bytes).hexdigest() if job.file_bytes else None)
+                    await asyncio.to_thread(self._user_repo.mark_resume_parse_failed, job.user_id, content_hash)
+                except Exception as mark_error:
+                    logger.error(f"Failed to mark resume parse failed for user {job.user_id}: {str(mark_error)}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job: ResumeParseJob) -> None:
+        timings: Dict[str, float] = {"queued": (time.perf_counter() - job.enqueued_at) * 1000}
+        loop = asyncio.get_running_loop()
+
+        stage_start = time.perf_counter()
+        file_bytes = job.file_bytes
+        if file_bytes is None:
+            file_bytes = await asyncio.to_thread(
+                self._supabase.client.storage.from_("user-documents").download, job.resume_path
+            )
+        timings["download"] = (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        resume_text = await loop.run_in_executor(self._executor, extract_pdf_text, file_bytes)
+        timings["extract"] = (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        parsed_resume = await asyncio.to_thread(extract_resume_profile, resume_text, self._llm)
+        timings["parse"] = (time.perf_counter() - stage_start) * 1000
+
+        content_hash = job.content_hash or hashlib.sha256(file_bytes).hexdigest()
+        stage_start = time.perf_counter()
+        stored = await asyncio.to_thread(
+            self._user_repo.save_parsed_resume,
+            job.user_id, content_hash, resume_text, parsed_resume.model_dump(),
+        )
+        timings["write"] = (time.perf_counter() - stage_start) * 1000
+
+        stage_summary = ", ".join(f"{stage}={ms:.0f}ms" for stage, ms in timings.items())
+        if stored:
+            logger.info(f"Successfully parsed and updated resume for user {job.user_id} ({stage_summary})")
+        else:
+            logger.info(f"Discarded resume parse for user {job.user_id}: resume replaced while parsing ({stage_summary})")
+
+
+# Global instance
+resume_worker_pool = ResumeWorkerPool()
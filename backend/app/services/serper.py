@@ -1,14 +1,25 @@
 """
 Serper.dev Google SERP API client for job board discovery.
 """
+import asyncio
 import os
-from typing import List
+import re
+from dataclasses import dataclass, field
+from itertools import product
+from typing import List, Optional, TYPE_CHECKING
 from app.services.http_client import http_client, HTTPClientError
 import logging
 
+if TYPE_CHECKING:
+    from app.repositories import SerpCacheRepository
+
 logger = logging.getLogger(__name__)
 
 SERPER_API_URL = "https://google.serper.dev/search"
+SERPER_MAX_NUM = 100  # results per page Serper accepts
+
+# How long a cached SERP page is reused before paying for it again
+SERP_CACHE_TTL_HOURS = float(os.getenv("SERP_CACHE_TTL_HOURS", "72"))
 
 # Provider-specific site filters for SERP queries
 PROVIDER_SITE_FILTERS = {
@@ -18,6 +29,49 @@ PROVIDER_SITE_FILTERS = {
 }
 
 
+@dataclass
+class SerpSearchResult:
+    """URLs from one search (all pages), with how many pages were paid for vs cached"""
+    urls: List[str] = field(default_factory=list)
+    paid_requests: int = 0
+    cache_hits: int = 0
+
+
+def normalize_query(query: str) -> str:
+    """Lowercased, whitespace-collapsed query; the form used for cache keys and dedupe."""
+    return " ".join(query.lower().split())
+
+
+def expand_query_plan(
+    seed: str,
+    roles: Optional[List[str]] = None,
+    locations: Optional[List[str]] = None,
+    max_queries: int = 10,
+) -> List[str]:
+    """
+    Expand a seed query into variants by role and location:
+    (seed, seed + role...) x (no location, + location...), in that order.
+
+    Variants with the same set of words are searched once (so a role already
+    in the seed, or reordered words, don't cost another paid call).
+    """
+    bases = [seed] + [f"{seed} {role}" for role in roles or []]
+    suffixes = [""] + list(locations or [])
+
+    plan: List[str] = []
+    seen = set()
+    for base, suffix in product(bases, suffixes):
+        query = normalize_query(f"{base} {suffix}")
+        words = frozenset(re.findall(r"\w+", query))
+        if not query or words in seen:
+            continue
+        seen.add(words)
+        plan.append(query)
+        if len(plan) >= max_queries:
+            break
+    return plan
+
+
 class SerperClient:
     """Serper.dev SERP API client for discovering job boards"""
     _instance = None
@@ -41,17 +95,23 @@ class SerperClient:
         query: str,
         provider: str,
         max_results: int = 50,
-    ) -> List[str]:
+        cache: Optional["SerpCacheRepository"] = None,
+    ) -> SerpSearchResult:
         """
         Search for job board URLs using Serper.dev.
 
+        Results past SERPER_MAX_NUM are fetched page by page (stopping early when
+        a page comes back short). With a cache, each page is looked up in
+        serp_cache first and only missing or expired pages are paid for.
+
         Args:
             query: Search query (e.g., "software engineer jobs")
             provider: Job board provider to filter ('ashby', 'lever', 'greenhouse')
-            max_results: Maximum results to return (Serper max is 100)
+            max_results: Maximum results to return
+            cache: serp_cache repository (None = always call Serper)
 
         Returns:
-            List of discovered URLs
+            Discovered URLs (deduped, in rank order) and paid/cached page counts
 
         Raises:
             ValueError: If SERPER_API_KEY not configured
@@ -64,6 +124,40 @@ class SerperClient:
             raise ValueError(f"Unknown provider: {provider}. Valid options: {list(PROVIDER_SITE_FILTERS.keys())}")
 
         site_filter = PROVIDER_SITE_FILTERS[provider]
+        query = normalize_query(query)
+        num = min(max_results, SERPER_MAX_NUM)
+        pages = -(-max_results // num)
+
+        result = SerpSearchResult()
+        seen = set()
+        for page in range(1, pages + 1):
+            urls = None
+            if cache:
+                urls = await asyncio.to_thread(cache.get_page, query, site_filter, num, page, SERP_CACHE_TTL_HOURS)
+            if urls is not None:
+                result.cache_hits += 1
+            else:
+                urls = await self._search_page(query, site_filter, num, page)
+                result.paid_requests += 1
+                if cache:
+                    await asyncio.to_thread(cache.save_page, query, site_filter, num, page, urls)
+
+            for url in urls:
+                if url not in seen:
+                    seen.add(url)
+                    result.urls.append(url)
+            if len(urls) < num:
+                break  # last page of results
+        # Pages keep a fixed size so their offsets line up, so the last one can overshoot
+        del result.urls[max_results:]
+
+        logger.info(
+            f"Found {len(result.urls)} URLs from Serper for {provider} "
+            f"({result.paid_requests} paid pages, {result.cache_hits} cached)"
+        )
+        return result
+
+    async def _search_page(self, query: str, site_filter: str, num: int, page: int) -> List[str]:
         full_query = f"{query} {site_filter}"
 
         headers = {
@@ -73,10 +167,11 @@ class SerperClient:
 
         payload = {
             "q": full_query,
-            "num": min(max_results, 100),  # Serper max is 100
+            "num": num,
+            "page": page,
         }
 
-        logger.info(f"Searching Serper for: {full_query}")
+        logger.info(f"Searching Serper for: {full_query} (page {page})")
 
         try:
             response = await http_client.request(
@@ -84,6 +179,7 @@ class SerperClient:
                 SERPER_API_URL,
                 headers=headers,
                 json_data=payload,
+                coalesce=True,  # same query from concurrent discovery runs -> one paid call
             )
 
             # Extract URLs from organic results
@@ -93,12 +189,10 @@ class SerperClient:
                 link = result.get("link")
                 if link:
                     urls.append(link)
-
-            logger.info(f"Found {len(urls)} URLs from Serper for {provider}")
             return urls
 
         except HTTPClientError as e:
-            logger.error(f"Serper API error for {provider}: {e}")
+            logger.error(f"Serper API error for {full_query}: {e}")
             raise
 
 
@@ -0,0 +1,214 @@
+"""
+Offline skill similarity for resume matching.
+
+Exact keyword checks miss synonyms and spelling variants ("k8s" vs "Kubernetes",
+"Postgres" vs "PostgreSQL", "React.js" vs "React"). Two cheap layers close most
+of that gap without a model download or GPU:
+
+- an alias table maps common abbreviations and variants to one canonical skill;
+- every canonical skill gets a hashed character-trigram vector (feature hashing,
+  L2-normalized), so near-spellings land close together under cosine similarity.
+
+Vectors are a pure function of the term, so they are memoized per term rather
+than stored per user or per job: resumes and JDs draw from a small shared
+vocabulary, and a JD's terms are warmed at ingest. Scoring a JD against a
+resume is one matrix product over the cached vectors.
+
+extract_skills finds the same canonical skills in posting text, for the
+job_skill_index that /jobs/recommendations ranks from.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, Sequence, Set
+import re
+import zlib
+
+import numpy as np
+
+SKILL_VECTOR_DIM = 1024
+SKILL_VECTOR_CACHE_SIZE = 16384
+
+# Cosine at or above this counts as the same skill. Spelling variants score ~0.8-0.9
+# ("micro services"/"microservices" 0.85, "spring boot"/"springboot" 0.80); related but
+# different skills stay below ~0.7 ("react native"/"react" 0.67, "java"/"javascript" 0.47)
+SEMANTIC_MATCH_THRESHOLD = 0.75
+# Multi-word terms that share most of their trigrams can still be different skills
+# ("project management"/"product management" 0.78, "web services"/"amazon web services"
+# 0.80, "spring"/"spring boot" 0.77). Above the threshold they must also agree word for
+# word: the same words once spaces are dropped, or the same number of words with every
+# word matching one of the other term's at this cosine ("procesing"/"processing" 0.84,
+# "project"/"product" 0.43)
+TOKEN_MATCH_THRESHOLD = 0.7
+
+# Variant (after normalize_skill) -> canonical skill
+SKILL_ALIASES: Dict[str, str] = {
+    "k8s": "kubernetes", "kube": "kubernetes",
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "py": "python", "python3": "python",
+    "golang": "go",
+    "postgres": "postgresql", "psql": "postgresql", "pg": "postgresql",
+    "mongo": "mongodb",
+    "reactjs": "react", "react js": "react",
+    "node": "node.js", "nodejs": "node.js", "node js": "node.js",
+    "vuejs": "vue", "vue js": "vue",
+    "nextjs": "next.js", "next js": "next.js",
+    "angularjs": "angular",
+    "c sharp": "c#", "csharp": "c#",
+    "cpp": "c++", "cplusplus": "c++",
+    "aws": "amazon web services",
+    "gcp": "google cloud", "google cloud platform": "google cloud",
+    "azure cloud": "azure", "microsoft azure": "azure",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "llm": "large language models", "llms": "large language models",
+    "ci cd": "continuous integration", "cicd": "continuous integration", "ci": "continuous integration",
+    "tf": "tensorflow",
+    "sklearn": "scikit learn", "scikit": "scikit learn",
+    "rest": "rest api", "restful": "rest api", "restful api": "rest api", "rest apis": "rest api",
+    "gql": "graphql",
+    "oop": "object oriented programming",
+    "tdd": "test driven development",
+    "ux": "user experience", "ui": "user interface",
+    "db": "databases", "database": "databases",
+    "sre": "site reliability engineering",
+    "iac": "infrastructure as code",
+    "gh actions": "github actions",
+    "dotnet": ".net", ".net core": ".net",
+}
+
+# Canonical skills recognized in job postings for the recommendation index. Extraction
+# only looks for these (and their aliases), so the index stays a few rows per job
+KNOWN_SKILLS = frozenset({
+    "python", "java", "javascript", "typescript", "go", "rust", "c++", "c#", "ruby", "php",
+    "kotlin", "swift", "scala", "elixir", "haskell", "clojure", "perl", "r", "matlab", "julia",
+    "objective c", "dart", "lua", "bash", "sql", "nosql", "graphql",
+    "react", "react native", "angular", "vue", "svelte", "next.js", "node.js", "express",
+    "django", "flask", "fastapi", "rails", "ruby on rails", "spring boot", "laravel", ".net",
+    "html", "css", "tailwind", "redux", "webpack", "jquery", "flutter", "android", "ios",
+    "postgresql", "mysql", "sqlite", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb",
+    "snowflake", "bigquery", "redshift", "databricks", "oracle", "kafka", "rabbitmq", "spark",
+    "hadoop", "airflow", "dbt", "flink", "etl", "data pipelines", "data warehousing",
+    "amazon web services", "google cloud", "azure", "kubernetes", "docker", "terraform",
+    "ansible", "jenkins", "github actions", "continuous integration", "linux", "serverless",
+    "microservices", "distributed systems", "rest api", "grpc", "websockets",
+    "machine learning", "deep learning", "artificial intelligence", "natural language processing",
+    "computer vision", "large language models", "pytorch", "tensorflow", "keras", "scikit learn",
+    "pandas", "numpy", "statistics", "data analysis", "data science", "tableau", "power bi",
+    "excel", "looker", "a b testing", "recommendation systems",
+    "object oriented programming", "test driven development", "unit testing", "selenium",
+    "cypress", "jest", "pytest", "site reliability engineering", "infrastructure as code",
+    "observability", "prometheus", "grafana", "datadog", "security", "networking",
+    "figma", "user experience", "user interface", "product management", "agile", "scrum", "jira",
+    "salesforce", "sap", "blockchain", "solidity", "embedded systems", "fpga", "verilog",
+})
+
+# Aliases and skills that are also everyday words or letters in posting prose ("go to
+# market", "Plan C", "a REST period", "send your CV"); only matched as resume skills
+_AMBIGUOUS_IN_TEXT = frozenset({
+    "go", "c", "r", "rest", "cv", "pg", "ts", "tf", "dl", "db", "ci", "kube", "node",
+    "py", "js", "excel", "security", "networking", "statistics", "agile", "express", "spark",
+})
+
+_NON_SKILL_CHARS_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, with punctuation other than + and # (and a leading .) collapsed to single spaces."""
+    text = skill.lower().strip()
+    lead = "." if text.startswith(".") else ""
+    return lead + " ".join(_NON_SKILL_CHARS_RE.sub(" ", text[len(lead):]).split())
+
+
+def canonical_skill(skill: str) -> str:
+    normalized = normalize_skill(skill)
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+# Normalized phrase found in text -> canonical skill
+_TEXT_SKILL_LOOKUP: Dict[str, str] = {
+    phrase: canonical
+    for phrase, canonical in [(normalize_skill(skill), skill) for skill in KNOWN_SKILLS] + list(SKILL_ALIASES.items())
+    if canonical in KNOWN_SKILLS and phrase not in _AMBIGUOUS_IN_TEXT
+}
+_MAX_SKILL_WORDS = max(len(phrase.split()) for phrase in _TEXT_SKILL_LOOKUP)
+
+
+def extract_skills(text: str) -> Set[str]:
+    """Canonical KNOWN_SKILLS mentioned in free text (a posting title or description)."""
+    words = normalize_skill(text).split()
+    found = set()
+    for i in range(len(words)):
+        for n in range(1, min(_MAX_SKILL_WORDS, len(words) - i) + 1):
+            canonical = _TEXT_SKILL_LOOKUP.get(" ".join(words[i:i + n]))
+            if canonical:
+                found.add(canonical)
+    return found
+
+
+@lru_cache(maxsize=SKILL_VECTOR_CACHE_SIZE)
+def skill_vector(term: str) -> np.ndarray:
+    """
+    L2-normalized hashed trigram vector of a canonical skill (read-only).
+
+    Trigrams are taken per word with boundary markers, so word order doesn't matter
+    and short words still contribute. crc32 picks the slot and a second hash bit the
+    sign, which keeps collisions from biasing cosine upwards.
+    """
+    vector = np.zeros(SKILL_VECTOR_DIM, dtype=np.float32)
+    for word in term.split():
+        padded = f"#{word}#"
+        for i in range(max(1, len(padded) - 2)):
+            h = zlib.crc32(padded[i:i + 3].encode())
+            vector[h % SKILL_VECTOR_DIM] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector.setflags(write=False)
+    return vector
+
+
+def skill_matrix(terms: Sequence[str]) -> np.ndarray:
+    """Stacked skill vectors, shape (len(terms), SKILL_VECTOR_DIM)."""
+    if not terms:
+        return np.zeros((0, SKILL_VECTOR_DIM), dtype=np.float32)
+    return np.stack([skill_vector(term) for term in terms])
+
+
+def warm_skill_vectors(skills: Iterable[str]) -> None:
+    """Compute and cache vectors ahead of matching (called at JD ingest)."""
+    for skill in skills:
+        if skill:
+            skill_vector(canonical_skill(skill))
+
+
+def _tokens_agree(a: str, b: str) -> bool:
+    """Word-level check for two terms whose whole-term vectors are similar."""
+    if a.replace(" ", "") == b.replace(" ", ""):
+        return True
+    a_words, b_words = a.split(), b.split()
+    if len(a_words) != len(b_words):
+        return False
+    if len(a_words) == 1:
+        return True
+    return all(
+        any(x == y or float(skill_vector(x) @ skill_vector(y)) >= TOKEN_MATCH_THRESHOLD for y in others)
+        for words, others in ((a_words, b_words), (b_words, a_words))
+        for x in words
+    )
+
+
+def best_similarities(query_terms: Sequence[str], candidate_terms: Sequence[str]) -> np.ndarray:
+    """
+    For each query term, the highest cosine similarity to any candidate term. Pairs
+    at or above SEMANTIC_MATCH_THRESHOLD whose words don't agree (_tokens_agree) count as 0.
+    """
+    if not query_terms or not candidate_terms:
+        return np.zeros(len(query_terms), dtype=np.float32)
+    similarities = skill_matrix(query_terms) @ skill_matrix(candidate_terms).T
+    for i, j in zip(*np.nonzero(similarities >= SEMANTIC_MATCH_THRESHOLD)):
+        if not _tokens_agree(query_terms[i], candidate_terms[j]):
+            similarities[i, j] = 0.0
+    return similarities.max(axis=1)
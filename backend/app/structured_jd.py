@@ -0,0 +1,248 @@
+"""
+Structured-data fast path for JD extraction.
+
+Deterministic sources are tried before the LLM: schema.org JobPosting JSON-LD,
+the provider's public API for Greenhouse/Lever/Ashby postings (via
+get_provider), and OpenGraph tags. The LLM is only asked for the JD fields
+those sources can't supply, with the posting description as its input; when
+the structured data already carries the title, company and description (skills
+come from the posting's own list or are extracted from its text), ingest
+finishes without an LLM call.
+"""
+from html import unescape
+from typing import Optional, List, Dict, Any
+import asyncio
+import logging
+import os
+import re
+import time
+
+from app.content_isolation import find_job_posting_json_ld, job_posting_description_text, isolate_job_content, JD_CONTENT_TOKEN_BUDGET
+from app.html_text import html_to_text
+from app.job_urls import classify_job_url
+from app.models import JD
+from app.prompt_builder import truncate_to_tokens
+from app.services.job_providers import get_provider, NormalizedJob
+from app.services.llm import LLM
+from app.skill_vectors import extract_skills
+from app.utils import extract_jd_fields, infer_job_site_type
+
+logger = logging.getLogger(__name__)
+
+# Concurrent JD LLM calls across all ingests (batch ingest fans out many at once)
+JD_LLM_CONCURRENCY = int(os.getenv("JD_LLM_CONCURRENCY", "4"))
+_llm_semaphore = asyncio.Semaphore(JD_LLM_CONCURRENCY)
+
+# Without these the JD isn't usable downstream (listing, resume match), so the LLM fills them
+FAST_PATH_REQUIRED_FIELDS = ("job_title", "company", "job_description", "required_skills")
+LLM_FIELDS = (
+    "job_title", "company", "job_posted", "job_description", "required_skills", "preferred_skills",
+    "education_requirements", "experience_requirements", "keywords", "open_to_visa_sponsorship",
+)
+
+_META_RE = re.compile(r"<meta\s[^>]*>", re.IGNORECASE)
+_META_ATTR_RE = re.compile(r"""(property|name|content)\s*=\s*("([^"]*)"|'([^']*)')""", re.IGNORECASE)
+_SKILL_SPLIT_RE = re.compile(r"\s*[,;\n•]\s*")
+_DEGREE_RE = re.compile(r"\b(degree|bachelor'?s?|master'?s?|ph\.?d|b\.?s\.?|m\.?s\.?|diploma)\b", re.IGNORECASE)
+_YEARS_RE = re.compile(r"\b\d+\+?\s*(years?|yrs)\b", re.IGNORECASE)
+_NO_SPONSORSHIP_RE = re.compile(
+    r"(not|unable to|cannot|can't|won't|will not|do not|does not|doesn't|don't)\s+(be able to\s+)?"
+    r"(provide|offer|sponsor|support)[^.]{0,40}(visa|sponsorship)|no (visa )?sponsorship|"
+    r"without (the need for )?(visa )?sponsorship",
+    re.IGNORECASE,
+)
+_SPONSORSHIP_RE = re.compile(
+    r"(will|can|able to|happy to|we) (provide |offer )?sponsor|sponsorship (is )?available|"
+    r"visa sponsorship (is )?(provided|offered)",
+    re.IGNORECASE,
+)
+
+
+def _as_list(value: Any) -> List[str]:
+    """JSON-LD text-or-list properties (skills, qualifications, ...) as a clean list of strings."""
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else [value]
+    out: List[str] = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("name") or item.get("credentialCategory") or item.get("description")
+            if item is None:
+                continue
+        text = str(item)
+        if "<" in text or "&lt;" in text:
+            text = html_to_text(unescape(text))
+        out.extend(part.strip() for part in _SKILL_SPLIT_RE.split(text) if part.strip())
+    return out
+
+
+def _experience_requirements(value: Any) -> List[str]:
+    if isinstance(value, dict) and value.get("monthsOfExperience"):
+        try:
+            years = float(value["monthsOfExperience"]) / 12
+            return [f"{years:g}+ years of experience"]
+        except (TypeError, ValueError):
+            return []
+    return _as_list(value)
+
+
+def fields_from_json_ld(posting: dict) -> Dict[str, Any]:
+    organization = posting.get("hiringOrganization")
+    company = organization.get("name") if isinstance(organization, dict) else organization
+    fields: Dict[str, Any] = {
+        "job_title": posting.get("title"),
+        "company": company,
+        "job_posted": posting.get("datePosted"),
+        "job_description": job_posting_description_text(posting),
+        "required_skills": _as_list(posting.get("skills")),
+        "education_requirements": _as_list(posting.get("educationRequirements")),
+        "experience_requirements": _experience_requirements(posting.get("experienceRequirements")),
+    }
+    return {k: v for k, v in fields.items() if v}
+
+
+def fields_from_provider_job(provider_name: str, board_identifier: str, job: NormalizedJob) -> Dict[str, Any]:
+    description = job.description or ""
+    if "&lt;" in description:
+        description = unescape(description)
+    description = html_to_text(description) if "<" in description else description
+
+    # Lever keeps requirements/responsibilities in separate lists
+    for section in job.raw_data.get("lists") or []:
+        if isinstance(section, dict) and section.get("content"):
+            description += f"\n{section.get('text') or ''}\n{html_to_text(section['content'])}"
+
+    provider = get_provider(provider_name)
+    fields: Dict[str, Any] = {
+        "job_title": job.title if job.title != "Unknown" else None,
+        "company": job.raw_data.get("company_name") or provider.extract_company_name(board_identifier, {}),
+        "job_posted": job.posted_at.date().isoformat() if job.posted_at else None,
+        "job_description": description.strip(),
+    }
+    return {k: v for k, v in fields.items() if v}
+
+
+def fields_from_open_graph(html: str) -> Dict[str, Any]:
+    meta: Dict[str, str] = {}
+    for tag in _META_RE.finditer(html[:200_000]):
+        attrs = {m.group(1).lower(): m.group(3) if m.group(3) is not None else m.group(4) for m in _META_ATTR_RE.finditer(tag.group(0))}
+        key = attrs.get("property") or attrs.get("name")
+        if key and attrs.get("content") and key.lower() not in meta:
+            meta[key.lower()] = unescape(attrs["content"]).strip()
+    fields: Dict[str, Any] = {
+        "job_title": meta.get("og:title") or meta.get("twitter:title"),
+        "company": meta.get("og:site_name"),
+    }
+    return {k: v for k, v in fields.items() if v}
+
+
+def infer_visa_sponsorship(text: str) -> Optional[bool]:
+    """True/False when the posting states its sponsorship stance, else None."""
+    if not text or ("sponsor" not in text.lower()):
+        return None
+    if _NO_SPONSORSHIP_RE.search(text):
+        return False
+    if _SPONSORSHIP_RE.search(text):
+        return True
+    return None
+
+
+async def _provider_lookup(url: str, html: str) -> Dict[str, Any]:
+    job_url = classify_job_url(url)
+    if not job_url.provider or not job_url.job_id:
+        return {}
+    provider = get_provider(job_url.provider)
+    try:
+        # Ashby pages embed the posting; only call the provider when the page doesn't
+        job = await asyncio.to_thread(provider.job_from_page, job_url.board_identifier, job_url.job_id, html) if html else None
+        if job is None:
+            job = await provider.fetch_job(job_url.board_identifier, job_url.job_id)
+    except Exception as e:
+        logger.warning(f"Provider lookup failed for {url}: {str(e)}")
+        return {}
+    return fields_from_provider_job(job_url.provider, job_url.board_identifier, job) if job else {}
+
+
+def _merge_missing(known: Dict[str, Any], found: Dict[str, Any]) -> None:
+    for key, value in found.items():
+        if key not in known:
+            known[key] = value
+
+
+def _json_ld_fields(html: str) -> Dict[str, Any]:
+    posting = find_job_posting_json_ld(html)
+    return fields_from_json_ld(posting) if posting else {}
+
+
+def _complete_from_page(known: Dict[str, Any], sources: List[str], html: str, cleaned_content: Optional[str]) -> Optional[str]:
+    """
+    Fill what the page itself can give (OpenGraph, sponsorship, skills). Returns the
+    content the LLM should read when required fields are still missing; otherwise
+    derives the remaining fields without it and returns None.
+    """
+    og_fields = fields_from_open_graph(html)
+    if og_fields and any(k not in known for k in og_fields):
+        _merge_missing(known, og_fields)
+        sources.append("opengraph")
+
+    description = known.get("job_description")
+    if description:
+        visa = infer_visa_sponsorship(description)
+        if visa is not None:
+            known["open_to_visa_sponsorship"] = visa
+        if "required_skills" not in known:
+            # Provider APIs don't list skills; the same extractor that builds job_skill_index
+            skills = extract_skills(f"{known.get('job_title') or ''}\n{description}")
+            if skills:
+                known["required_skills"] = sorted(skills)
+    if known.get("required_skills") and "keywords" not in known:
+        known["keywords"] = list(dict.fromkeys(known["required_skills"]))
+
+    if any(f not in known for f in FAST_PATH_REQUIRED_FIELDS):
+        # The description (when known) is the posting body; otherwise isolate it from the page
+        return truncate_to_tokens(description, JD_CONTENT_TOKEN_BUDGET) if description else isolate_job_content(html, cleaned_content)
+
+    # Everything essential came from structured data; derive the rest without the LLM
+    lines = description.split("\n")
+    known.setdefault("preferred_skills", [])
+    known.setdefault("education_requirements", [line for line in lines if _DEGREE_RE.search(line)][:5])
+    known.setdefault("experience_requirements", [line for line in lines if _YEARS_RE.search(line)][:5])
+    known.setdefault("job_posted", None)
+    return None
+
+
+async def extract_jd_fast_path(html: str, cleaned_content: Optional[str], url: str, llm: LLM) -> JD:
+    """
+    Extract a JD from structured data first (JSON-LD, provider API, OpenGraph),
+    calling the LLM only for fields those sources didn't supply.
+
+    Parsing, text extraction and tokenizing run in worker threads, so concurrent
+    ingests (batch ingest) don't queue behind each other on the event loop; only
+    the LLM calls are bounded by JD_LLM_CONCURRENCY.
+    """
+    start = time.perf_counter()
+    sources: List[str] = []
+
+    known = await asyncio.to_thread(_json_ld_fields, html)
+    if known:
+        sources.append("json-ld")
+
+    if any(f not in known for f in ("job_title", "company", "job_posted", "job_description")):
+        provider_fields = await _provider_lookup(url, html)
+        if provider_fields:
+            _merge_missing(known, provider_fields)
+            sources.append("provider-api")
+
+    content = await asyncio.to_thread(_complete_from_page, known, sources, html, cleaned_content)
+    if content is not None:
+        missing = [f for f in LLM_FIELDS if f not in known]
+        context = {k: v for k, v in known.items() if k != "job_description"}
+        async with _llm_semaphore:
+            # Blocking SDK call; keep it off the event loop so other ingests proceed
+            known.update(await asyncio.to_thread(extract_jd_fields, content, llm, missing, context, url))
+        logger.info(f"JD fast path: {sources or ['none']} supplied {len(LLM_FIELDS) - len(missing)} fields, LLM filled {missing}")
+    else:
+        logger.info(f"JD fast path: extracted from {sources} without LLM in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    known["job_site_type"] = infer_job_site_type(url)
+    return JD.model_validate(known)
@@ -1,43 +1,46 @@
 import logging
 import re
-import html
 import json
-from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+from pydantic import create_model
 from app.services.llm import LLM
 from app.services.supabase import Supabase
 from app.models import JD, ExtractedResumeModel
-import fitz
+from app.html_text import html_to_text
+from app.job_urls import classify_job_url, normalize_url, CANONICAL_BOARD_HOSTS
 
 logger = logging.getLogger(__name__)
 
 # initiate supabase client
 supabase = Supabase()
 
-def extract_jd(content: str, llm: LLM, url: str = None) -> JD:
-    logger.info(f"Extracting JD from the given content: {len(content)} chars")
+def extract_jd_fields(content: str, llm: LLM, fields: list[str], known: dict, url: str = None) -> dict:
+    """
+    Ask the LLM for only the given JD fields; fields already derived from structured
+    data are passed as context so the model stays consistent with them.
+    """
+    logger.info(f"Extracting JD fields {fields} from the given content: {len(content)} chars")
+    partial_model = create_model(
+        "JDPartial",
+        **{name: (JD.model_fields[name].annotation, ...) for name in fields},
+    )
     url_context = f"\n    Job Posting URL: {url}\n" if url else ""
+    known_context = json.dumps(known, ensure_ascii=False, default=str)
     prompt = f"""
-    You are an expert job description scraper. Below attached is the raw HTML content of a job posting link, now I need you to synthesize the raw content and give me a structured JSON output without any extra text and codefences. 
+    You are an expert job description scraper. Below attached is the content of a job posting and the fields already known about it. Give me a structured JSON output with ONLY these fields: {", ".join(fields)}. No extra text and codefences.
     {url_context}
-    Raw HTML Content:
+    Known fields:
+    {known_context}
+
+    Job Posting Content:
     {content}
 
-    Expected JSON Output:
-    ```json
-    {{
-        "job_title": Title of the job, return as a string,
-        "company": Title of the company, return as a string,
-        "job_posted": Date of the job posting, return as a string,
-        "job_description": Job Description of the given job posting, return as a string,
-        "required_skills": List of required skills for the job, return as a list of strings,
-        "preferred_skills": List of preferred skills for the job, return as a list of strings,
-        "education_requirements": List of education requirements for the job, return as a list of strings,
-        "experience_requirements": List of experience requirements for the job, return as a list of strings,
-        "keywords": List of keywords for the job, return as a list of strings,
-        "job_site_type": One of: linkedin, job-board, y-combinator, careers page,
-        "open_to_visa_sponsorship": true/false - check if the company is open to US Work visa sponsorship, return as a boolean
-    }}
-    ```
+    Field definitions:
+    - required_skills / preferred_skills: lists of skills, return as lists of strings
+    - education_requirements / experience_requirements: lists of requirements, return as lists of strings
+    - keywords: list of keywords for the job, return as a list of strings
+    - open_to_visa_sponsorship: true/false - whether the company is open to US work visa sponsorship, null if the posting doesn't say
+    - job_title, company, job_description: strings
+    - job_posted: the posting date as a string, null if the posting doesn't say
     """
 
     response = llm.client.models.generate_content(
@@ -45,217 +48,97 @@ def extract_jd(content: str, llm: LLM, url: str = None) -> JD:
         contents=prompt,
         config={
             "response_mime_type": "application/json",
-            "response_json_schema": JD.model_json_schema(),
+            "response_json_schema": partial_model.model_json_schema(),
         }
     )
-    extracted_jd = JD.model_validate_json(response.text)
-    # logger.info(f"LLM response: {extracted_jd}")
-    return extracted_jd
+    return partial_model.model_validate_json(response.text).model_dump()
 
 
 def infer_job_site_type(url: str) -> str:
     try:
-        hostname = urlparse(url).netloc.lower()
+        return classify_job_url(url).site_type
     except Exception:
-        hostname = ""
-
-    if "linkedin.com" in hostname:
-        return "linkedin"
-    if "ycombinator.com" in hostname:
-        return "y-combinator"
-    if any(
-        domain in hostname
-        for domain in (
-            "boards.greenhouse.io",
-            "job-boards.greenhouse.io",
-            "jobs.ashbyhq.com",
-            "jobs.lever.co",
-        )
-    ):
-        return "job-board"
-    return "careers page"
+        return "careers page"
 
 
 def clean_content(content: str) -> str:
-    # Remove script tags and their content (multiline)
-    cleaned = re.sub(r"<script[^>]*>.*?</script>", "", content, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Remove style tags and their content (multiline)
-    cleaned = re.sub(r"<style[^>]*>.*?</style>", "", cleaned, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Remove JavaScript code patterns (window.*, function definitions, etc.)
-    cleaned = re.sub(r"window\.\w+\s*=\s*\{[^}]*\}", "", cleaned, flags=re.DOTALL)
-    cleaned = re.sub(r"window\.__\w+\s*=\s*\{[^}]*\}", "", cleaned, flags=re.DOTALL)
-    cleaned = re.sub(r"\(\([^)]*\)\s*=>\s*\{[^}]*\}\)\([^)]*\)", "", cleaned, flags=re.DOTALL)
-    
-    # Remove HTML tags using regex
-    cleaned = re.sub(r"<[^>]*>", "", cleaned)
-    
-    # Decode HTML entities
-    cleaned = html.unescape(cleaned)
-    
-    # Normalize whitespace (multiple spaces/newlines → single space/newline)
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = re.sub(r"\n\s*\n", "\n", cleaned)
-    cleaned = cleaned.strip()
-    
+    # Single pass over the DOM: drops script/style/noscript/svg, keeps block-level
+    # line breaks, decodes entities and collapses whitespace as text is emitted
+    cleaned = html_to_text(content)
+
     logger.info(f"Cleaned content length: {len(cleaned)} chars (original: {len(content)} chars)")
     return cleaned
 
 
-def normalize_url(url: str) -> str:
-    """
-    Normalize a URL by:
-    - Removing tracking parameters (utm_*, gh_src, source, ref, etc.)
-    - Normalizing trailing slashes
-    - Removing fragments
-    - Lowercasing the scheme and netloc
-    - Sorting query parameters
-    
-    This helps prevent duplicate entries from URLs that differ only by tracking params.
+def extract_resume_profile(resume_text: str, llm: LLM) -> ExtractedResumeModel:
     """
-    try:
-        parsed = urlparse(url)
-        
-        # Normalize scheme and netloc (lowercase)
-        scheme = parsed.scheme.lower()
-        netloc = parsed.netloc.lower()
-        
-        # Remove fragment
-        fragment = ""
-        
-        # Normalize path (remove trailing slash unless it's root)
-        path = parsed.path.rstrip('/') or '/'
-        
-        # Filter out tracking parameters from query string
-        tracking_params = {
-            'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
-            'utm_id', 'utm_source_platform', 'utm_creative_format',
-            'gh_src', 'source', 'ref', 'referrer', 'referer',
-            'fbclid', 'gclid', 'msclkid', 'twclid',
-            'li_fat_id', 'trackingId', 'trk', 'trkInfo',
-            '_ga', '_gid', 'mc_cid', 'mc_eid',
-            'icid', 'ncid', 'ncid', 'ncid',
-            'campaign_id', 'ad_id', 'adgroup_id'
-        }
-        
-        if parsed.query:
-            query_params = parse_qs(parsed.query, keep_blank_values=False)
-            # Remove tracking parameters
-            filtered_params = {
-                k: v for k, v in query_params.items() 
-                if k.lower() not in tracking_params
-            }
-            # Sort parameters for consistency
-            query = urlencode(sorted(filtered_params.items()), doseq=True)
-        else:
-            query = ""
-        
-        # Reconstruct URL
-        normalized = urlunparse((scheme, netloc, path, parsed.params, query, fragment))
-        
-        logger.debug(f"Normalized URL: {url} -> {normalized}")
-        return normalized
-        
-    except Exception as e:
-        logger.warning(f"Failed to normalize URL {url}: {str(e)}, returning original")
-        return url
+    Parse extracted resume text into a structured profile using the LLM.
 
-def parse_resume(user_id: str, resume_url: str, llm: LLM):
-    """
-    This functions parses the resume located at resume_url and updates the user's profile with resume extracted information
-    
-    :param user_id: User ID of the user whose resume is to be parsed
-    :type user_id: str
-    :param resume_url: URL of the resume to be parsed
-    :type resume_url: str
+    :param resume_text: Plain text extracted from the resume PDF
+    :type resume_text: str
     """
-    try:
-        # fetch the resume from supabase storage
-        with supabase.get_raw_cursor() as cursor:
-            cursor.execute("SELECT resume FROM public.users WHERE id = %s", (user_id,))
-            resume_path = cursor.fetchone()[0]
-            resume_file = supabase.client.storage.from_("user-documents").download(resume_path)
-            # read the resume file using fitz
-            doc = fitz.open(stream=resume_file, filetype="pdf")
-            extracted_resume_text = ""
-            for page in doc:
-                extracted_resume_text += page.get_text()
-            doc.close()
-
-            # Use LLM to parse the resume text
-            prompt = f"""
-            You are an expert resume parser. Below is the extracted text from a user's resume. Please extract the following information and return it in a structured JSON format without any extra text or codefences.
-
-            Resume Text:
-            {extracted_resume_text}
-
-            Expected JSON Output:
-            ```json
+    prompt = f"""
+    You are an expert resume parser. Below is the extracted text from a user's resume. Please extract the following information and return it in a structured JSON format without any extra text or codefences.
+
+    Resume Text:
+    {resume_text}
+
+    Expected JSON Output:
+    ```json
+    {{
+        "summary": "Summary of the user's professional background, return as a string",
+        "skills": ["List of skills mentioned in the resume, return as a list of strings"],
+        "experience": [
             {{
-                "summary": "Summary of the user's professional background, return as a string",
-                "skills": ["List of skills mentioned in the resume, return as a list of strings"],
-                "experience": [
-                    {{
-                        "company": "Company Name",
-                        "position": "Job Title",
-                        "location": "City, State or City, Country",
-                        "start_date": "YYYY-MM-DD",
-                        "end_date": "YYYY-MM-DD or null if current",
-                        "description": "Job responsibilities and achievements as a string"
-                    }}
-                ],
-                "education": [
-                    {{
-                        "institution": "Institution Name",
-                        "degree": "Degree Name",
-                        "field_of_study": "Field of Study",
-                        "start_date": "YYYY-MM-DD",
-                        "end_date": "YYYY-MM-DD or null if current",
-                        "description": "Description of academic achievements or coursework as a string"
-                    }}
-                ],
-                "certifications": [
-                    {{
-                        "name": "Certification Name",
-                        "issuing_organization": "Organization Name",
-                        "issue_date": "YYYY-MM-DD",
-                        "expiration_date": "YYYY-MM-DD or null if no expiration",
-                        "credential_id": "Credential ID or null",
-                        "credential_url": "URL to credential or null"
-                    }}
-                ],
-                "projects": [
-                    {{
-                        "name": "Project Name",
-                        "description": "Project description as a string",
-                        "link": "URL to project or null"
-                    }}
-                ]
+                "company": "Company Name",
+                "position": "Job Title",
+                "location": "City, State or City, Country",
+                "start_date": "YYYY-MM-DD",
+                "end_date": "YYYY-MM-DD or null if current",
+                "description": "Job responsibilities and achievements as a string"
             }}
-            ```
-            """
-
-            response = llm.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_json_schema": ExtractedResumeModel.model_json_schema(),
-                }
-            )
-            parsed_resume = ExtractedResumeModel.model_validate_json(response.text)
-            resume_data = json.dumps(parsed_resume.model_dump())
+        ],
+        "education": [
+            {{
+                "institution": "Institution Name",
+                "degree": "Degree Name",
+                "field_of_study": "Field of Study",
+                "start_date": "YYYY-MM-DD",
+                "end_date": "YYYY-MM-DD or null if current",
+                "description": "Description of academic achievements or coursework as a string"
+            }}
+        ],
+        "certifications": [
+            {{
+                "name": "Certification Name",
+                "issuing_organization": "Organization Name",
+                "issue_date": "YYYY-MM-DD",
+                "expiration_date": "YYYY-MM-DD or null if no expiration",
+                "credential_id": "Credential ID or null",
+                "credential_url": "URL to credential or null"
+            }}
+        ],
+        "projects": [
+            {{
+                "name": "Project Name",
+                "description": "Project description as a string",
+                "link": "URL to project or null"
+            }}
+        ]
+    }}
+    ```
+    """
 
-            # Update user's profile in the database with parsed resume data
-            update_query = "UPDATE public.users SET resume_text = %s, resume_profile = %s, resume_parse_status = 'Completed', resume_parsed_at = NOW() WHERE id = %s"
-            cursor.execute(update_query, (extracted_resume_text, resume_data, user_id))
-            pass  # commit handled by get_raw_cursor context manager
-            logger.info(f"Successfully parsed and updated resume for user {user_id}")
+    response = llm.client.models.generate_content(
+        model="gemini-2.5-flash",
+        contents=prompt,
+        config={
+            "response_mime_type": "application/json",
+            "response_json_schema": ExtractedResumeModel.model_json_schema(),
+        }
+    )
+    return ExtractedResumeModel.model_validate_json(response.text)
 
-    except Exception as e:
-        logger.error(f"Error parsing resume for user {user_id} from {resume_url}: {str(e)}")
-    
 
 def check_if_job_application_belongs_to_user(user_id: str, job_application_id: str, supabase: Supabase) -> bool:
     """
@@ -316,22 +199,8 @@ from typing import Optional
 
 # ===== Job Board URL Parsing for Discovery =====
 
-# Regex patterns for canonical board root URLs (not deep links)
-BOARD_URL_PATTERNS = {
-    "ashby": re.compile(r"^https?://jobs\.ashbyhq\.com/([a-zA-Z0-9_-]+)/?$"),
-    "lever": re.compile(r"^https?://jobs\.lever\.co/([a-zA-Z0-9_-]+)/?$"),
-    "greenhouse": re.compile(r"^https?://boards\.greenhouse\.io/([a-zA-Z0-9_-]+)/?$"),
-}
-
-# Patterns for deep links (to reject)
-DEEP_LINK_PATTERNS = [
-    r"/jobs/",
-    r"/apply",
-    r"/application",
-    r"/job/",
-    r"/posting/",
-    r"/\d+$",  # Ends with numeric ID
-]
+# Board identifiers accepted from discovery (canonical board root URLs only)
+BOARD_IDENTIFIER_RE = re.compile(r"[a-zA-Z0-9_-]+")
 
 
 @dataclass
@@ -351,7 +220,7 @@ def parse_job_board_url(url: str) -> ParsedBoardUrl:
     Valid:
       - https://jobs.ashbyhq.com/{boardName}
       - https://jobs.lever.co/{site}
-      - https://boards.greenhouse.io/{token}
+      - https://boards.greenhouse.io/{token} (or job-boards.greenhouse.io; canonicalized to boards.)
 
     Invalid (deep links):
       - https://jobs.ashbyhq.com/company/jobs/123
@@ -362,55 +231,45 @@ def parse_job_board_url(url: str) -> ParsedBoardUrl:
         ParsedBoardUrl with validation result
     """
     try:
-        parsed = urlparse(url)
-        hostname = parsed.netloc.lower()
-        path = parsed.path
-
-        # Clean URL for matching
-        clean_url = f"{parsed.scheme}://{hostname}{path}".rstrip("/")
-
-        # Check for deep link patterns (reject these)
-        for pattern in DEEP_LINK_PATTERNS:
-            if re.search(pattern, path, re.IGNORECASE):
-                return ParsedBoardUrl(
-                    is_valid=False,
-                    rejection_reason=f"Deep link detected (pattern: {pattern})"
-                )
-
-        # Try matching each provider pattern
-        for provider, pattern in BOARD_URL_PATTERNS.items():
-            match = pattern.match(clean_url)
-            if match:
-                board_identifier = match.group(1)
-
-                # Additional validation: identifier should be reasonable
-                if len(board_identifier) < 2 or len(board_identifier) > 100:
-                    return ParsedBoardUrl(
-                        is_valid=False,
-                        rejection_reason=f"Board identifier length invalid: {len(board_identifier)}"
-                    )
-
-                # Build canonical URL
-                if provider == "ashby":
-                    canonical = f"https://jobs.ashbyhq.com/{board_identifier}"
-                elif provider == "lever":
-                    canonical = f"https://jobs.lever.co/{board_identifier}"
-                elif provider == "greenhouse":
-                    canonical = f"https://boards.greenhouse.io/{board_identifier}"
-                else:
-                    canonical = clean_url
-
-                return ParsedBoardUrl(
-                    is_valid=True,
-                    provider=provider,
-                    board_identifier=board_identifier,
-                    canonical_url=canonical,
-                )
-
-        # No pattern matched
+        job_url = classify_job_url(url)
+
+        if not job_url.provider:
+            return ParsedBoardUrl(
+                is_valid=False,
+                rejection_reason="URL does not match any supported job board pattern"
+            )
+
+        # Reject deep links (postings, application pages, other sub-pages)
+        board_identifier = job_url.board_identifier
+        if job_url.page_type != "board":
+            return ParsedBoardUrl(
+                is_valid=False,
+                rejection_reason=f"Deep link detected (page type: {job_url.page_type})"
+            )
+        if board_identifier.isdigit():
+            return ParsedBoardUrl(
+                is_valid=False,
+                rejection_reason="Deep link detected (numeric ID)"
+            )
+
+        if not BOARD_IDENTIFIER_RE.fullmatch(board_identifier):
+            return ParsedBoardUrl(
+                is_valid=False,
+                rejection_reason="URL does not match any supported job board pattern"
+            )
+
+        # Additional validation: identifier should be reasonable
+        if len(board_identifier) < 2 or len(board_identifier) > 100:
+            return ParsedBoardUrl(
+                is_valid=False,
+                rejection_reason=f"Board identifier length invalid: {len(board_identifier)}"
+            )
+
         return ParsedBoardUrl(
-            is_valid=False,
-            rejection_reason="URL does not match any supported job board pattern"
+            is_valid=True,
+            provider=job_url.provider,
+            board_identifier=board_identifier,
+            canonical_url=f"https://{CANONICAL_BOARD_HOSTS[job_url.provider]}/{board_identifier}",
         )
 
     except Exception as e:
@@ -469,51 +328,19 @@ def extract_job_url_info(url: str) -> dict:
     :return: dict with keys: job_board, base_url, page_type
     """
     try:
-        parsed = urlparse(url)
-        hostname = parsed.netloc.lower()
-        path = parsed.path
-
-        # Detect job board and determine page type
-        if "jobs.lever.co" in hostname:
-            job_board = "lever"
-            if path.rstrip('/').endswith('/apply'):
-                page_type = "application"
-                # Strip /apply from path to get base URL
-                base_path = path.rstrip('/').rsplit('/apply', 1)[0]
-            else:
-                page_type = "jd"
-                base_path = path
-        elif "jobs.ashbyhq.com" in hostname:
-            job_board = "ashby"
-            if path.rstrip('/').endswith('/application'):
-                page_type = "application"
-                # Strip /application from path to get base URL
-                base_path = path.rstrip('/').rsplit('/application', 1)[0]
-            else:
-                page_type = "jd"
-                base_path = path
-        elif "boards.greenhouse.io" in hostname or "job-boards.greenhouse.io" in hostname:
-            job_board = "greenhouse"
+        job_url = classify_job_url(url)
+
+        if job_url.provider in ("lever", "ashby"):
+            page_type = "application" if job_url.page_type == "application" else "jd"
+        elif job_url.provider == "greenhouse":
             page_type = "combined"
-            base_path = path
         else:
-            job_board = "other"
             page_type = "unknown"
-            base_path = path
-
-        # Reconstruct base URL with normalized path
-        base_url = urlunparse((
-            parsed.scheme.lower(),
-            hostname,
-            base_path.rstrip('/') or '/',
-            '',  # params
-            '',  # query (strip for matching)
-            ''   # fragment
-        ))
 
         return {
-            "job_board": job_board,
-            "base_url": base_url,
+            "job_board": job_url.provider or "other",
+            # Application suffix (Lever /apply, Ashby /application), query and fragment stripped
+            "base_url": job_url.base_url,
             "page_type": page_type
         }
 
@@ -0,0 +1,71 @@
+"""
+Benchmark clean_content: the single-pass html_to_text extractor against the
+previous regex-chain implementation, reporting time and peak memory per page.
+
+    python -m benchmarks.clean_content_bench [--corpus DIR] [--repeat N]
+"""
+import argparse
+import html
+import re
+import time
+import tracemalloc
+
+from app.html_text import html_to_text
+from benchmarks.corpus import load_corpus
+
+
+def legacy_clean_content(content: str) -> str:
+    """clean_content as it was before the single-pass extractor."""
+    cleaned = re.sub(r"<script[^>]*>.*?</script>", "", content, flags=re.DOTALL | re.IGNORECASE)
+    cleaned = re.sub(r"<style[^>]*>.*?</style>", "", cleaned, flags=re.DOTALL | re.IGNORECASE)
+    cleaned = re.sub(r"window\.\w+\s*=\s*\{[^}]*\}", "", cleaned, flags=re.DOTALL)
+    cleaned = re.sub(r"window\.__\w+\s*=\s*\{[^}]*\}", "", cleaned, flags=re.DOTALL)
+    cleaned = re.sub(r"\(\([^)]*\)\s*=>\s*\{[^}]*\}\)\([^)]*\)", "", cleaned, flags=re.DOTALL)
+    cleaned = re.sub(r"<[^>]*>", "", cleaned)
+    cleaned = html.unescape(cleaned)
+    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = re.sub(r"\n\s*\n", "\n", cleaned)
+    return cleaned.strip()
+
+
+def _measure(fn, content: str, repeat: int) -> tuple[float, int, str]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(content)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of captured .html job pages (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(f"{'page':<28}{'size KB':>9}{'old ms':>9}{'new ms':>9}{'old peak KB':>13}{'new peak KB':>13}{'old chars':>11}{'new chars':>11}")
+    totals = [0.0, 0.0, 0, 0]
+    for name, content in corpus:
+        old_ms, old_peak, old_out = _measure(legacy_clean_content, content, args.repeat)
+        new_ms, new_peak, new_out = _measure(html_to_text, content, args.repeat)
+        totals[0] += old_ms
+        totals[1] += new_ms
+        totals[2] = max(totals[2], old_peak)
+        totals[3] = max(totals[3], new_peak)
+        print(
+            f"{name[:27]:<28}{len(content) / 1024:>9.0f}{old_ms:>9.2f}{new_ms:>9.2f}"
+            f"{old_peak / 1024:>13.0f}{new_peak / 1024:>13.0f}{len(old_out):>11}{len(new_out):>11}"
+        )
+    print(
+        f"\n{len(corpus)} pages: total old {totals[0]:.1f} ms, new {totals[1]:.1f} ms; "
+        f"max peak old {totals[2] / 1024:.0f} KB, new {totals[3] / 1024:.0f} KB"
+    )
+
+
+if __name__ == "__main__":
+    main()
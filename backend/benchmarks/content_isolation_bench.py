@@ -0,0 +1,44 @@
+"""
+Benchmark and regression check for select_main_content: how much of each cleaned
+page the density pick keeps and how long it takes, plus a bullet-list posting
+whose headings, location/salary line and one-word skill bullets must all survive
+(the process exits non-zero if any is dropped).
+
+    python -m benchmarks.content_isolation_bench [--corpus DIR] [--repeat N]
+"""
+import argparse
+import sys
+import time
+
+from app.content_isolation import select_main_content
+from app.html_text import html_to_text
+from benchmarks.corpus import BULLET_JD_EXPECTED_LINES, generate_bullet_jd_page, load_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of captured .html job pages (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(f"{'page':<28}{'cleaned words':>15}{'kept words':>12}{'ms':>8}")
+    for name, content in corpus:
+        cleaned = html_to_text(content)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            isolated = select_main_content(cleaned)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name[:27]:<28}{len(cleaned.split()):>15}{len(isolated.split()):>12}{best * 1000:>8.2f}")
+
+    isolated_lines = set(select_main_content(html_to_text(generate_bullet_jd_page())).split("\n"))
+    missing = [line for line in BULLET_JD_EXPECTED_LINES if line not in isolated_lines]
+    if missing:
+        print(f"\nBullet-list posting: dropped {missing}")
+        sys.exit(1)
+    print(f"\nBullet-list posting: all {len(BULLET_JD_EXPECTED_LINES)} header and bullet lines kept")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Job page corpus for the benchmarks.
+
+Pages are loaded from a directory of captured .html files when one is given
+(save pages from the browser or the extension's dom_html), otherwise a
+synthetic corpus is generated that mimics the structure of the boards the
+app ingests: large inline script/state blobs, SVG icons, navigation, cookie
+banners, the posting body and a "similar jobs" footer.
+
+URL corpora are loaded from a file with one URL per line, otherwise a
+synthetic mix of board roots, postings, application pages, SERP deep links,
+LinkedIn/YC links and company careers pages is generated, with tracking
+parameters, fragments and mixed-case hosts sprinkled in.
+"""
+from pathlib import Path
+from typing import List, Tuple
+import json
+import random
+
+_BOARDS = ("greenhouse", "lever", "ashby", "workday", "careers")
+
+_PARAGRAPH_WORDS = (
+    "we are looking for an engineer to design build and operate distributed systems "
+    "you will collaborate with product and design to ship features used by millions "
+    "experience with python go kubernetes postgres and cloud infrastructure is preferred "
+    "our team values ownership clear communication and thoughtful code review &amp; mentoring"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_PARAGRAPH_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _script_blob(rng: random.Random, kb: int) -> str:
+    state = {"jobs": [{"id": i, "title": _paragraph(rng, 6), "body": _paragraph(rng, 40)} for i in range(kb)]}
+    return (
+        f"<script>window.__appData = {json.dumps(state)};</script>"
+        "<script>((w) => { w.dataLayer = w.dataLayer || []; })(window)</script>"
+        "<script type=\"application/javascript\">function track(e){if(e<1){return e}return track(e-1)}</script>"
+    )
+
+
+def _svg_icon() -> str:
+    return (
+        '<svg width="24" height="24" viewBox="0 0 24 24"><title>icon</title>'
+        '<path d="M12 2L2 7l10 5 10-5-10-5z"/><path d="M2 17l10 5 10-5"/></svg>'
+    )
+
+
+def generate_page(seed: int, script_kb: int = 200, sections: int = 8) -> str:
+    rng = random.Random(seed)
+    board = _BOARDS[seed % len(_BOARDS)]
+    head = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>Senior Software Engineer - {board.title()} Co</title>"
+        "<style>body{font-family:sans-serif} .nav>li{display:inline-block}</style>"
+        f"{_script_blob(rng, script_kb // 4)}</head>"
+    )
+    nav = "<nav><ul>" + "".join(f"<li><a href=\"/{i}\">{_svg_icon()}Link {i}</a></li>" for i in range(20)) + "</ul></nav>"
+    cookie = "<div class=\"cookie-banner\"><p>We use cookies &amp; similar technologies.</p><button>Accept</button></div>"
+    body_sections = []
+    for s in range(sections):
+        items = "".join(f"<li>{_paragraph(rng, 14)}</li>" for _ in range(6))
+        body_sections.append(f"<section><h2>Section {s}</h2><p>{_paragraph(rng, 60)}</p><ul>{items}</ul></section>")
+    similar = "<aside><h3>Similar jobs</h3><ul>" + "".join(
+        f"<li><a href=\"/jobs/{i}\">{_paragraph(rng, 5)}</a></li>" for i in range(30)
+    ) + "</ul></aside>"
+    footer = "<footer><p>&copy; 2025 Company &mdash; All rights reserved.</p><noscript>Enable JavaScript</noscript></footer>"
+    tail = _script_blob(rng, script_kb // 2)
+    return (
+        f"{head}<body>{nav}{cookie}<main><h1>Senior Software Engineer</h1>"
+        f"{''.join(body_sections)}</main>{similar}{footer}{tail}</body></html>"
+    )
+
+
+# A posting in the shape most boards render: short header lines, a prose intro, then
+# sections of terse bullets (one-word skills included) under short headings
+BULLET_JD_EXPECTED_LINES = (
+    "Backend Engineer, Payments", "San Francisco, CA or Remote (US)", "$160,000 - $190,000",
+    "Requirements", "Python", "Go", "PostgreSQL", "Kubernetes", "5+ years building APIs",
+    "Nice to have", "Kafka", "Terraform", "Benefits", "401(k) matching",
+)
+
+
+def generate_bullet_jd_page(seed: int = 0) -> str:
+    """A job page whose posting is mostly short header and bullet lines."""
+    rng = random.Random(seed)
+    nav = "<nav><ul>" + "".join(f"<li><a href=\"/{i}\">Link {i}</a></li>" for i in range(12)) + "</ul></nav>"
+    cookie = "<div class=\"cookie-banner\"><p>We use cookies &amp; similar technologies.</p><button>Accept</button></div>"
+
+    def bullets(items):
+        return "<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+
+    posting = (
+        "<h1>Backend Engineer, Payments</h1><div>San Francisco, CA or Remote (US)</div><div>$160,000 - $190,000</div>"
+        f"<h2>About the role</h2><p>{_paragraph(rng, 70)}</p><p>{_paragraph(rng, 50)}</p>"
+        "<h2>Requirements</h2>" + bullets(["Python", "Go", "PostgreSQL", "Kubernetes", "5+ years building APIs"])
+        + "<h2>Nice to have</h2>" + bullets(["Kafka", "Terraform"])
+        + f"<h2>Benefits</h2>" + bullets(["Health, dental, vision", "401(k) matching", "Remote stipend"])
+    )
+    similar = "<aside><h3>Similar jobs</h3><ul>" + "".join(
+        f"<li><a href=\"/jobs/{i}\">{_paragraph(rng, 5)}</a></li>" for i in range(15)
+    ) + "</ul></aside>"
+    footer = "<footer><p>&copy; 2025 Company &mdash; All rights reserved.</p></footer>"
+    return (
+        "<!DOCTYPE html><html><head><title>Backend Engineer, Payments - Acme</title></head>"
+        f"<body>{nav}{cookie}<main>{posting}</main>{similar}{footer}</body></html>"
+    )
+
+
+def load_corpus(directory: str | None = None, synthetic_pages: int = 20) -> List[Tuple[str, str]]:
+    """(name, html) pairs from a directory of captured pages, or a synthetic corpus."""
+    if directory:
+        paths = sorted(Path(directory).glob("*.htm*"))
+        return [(p.name, p.read_text(encoding="utf-8", errors="replace")) for p in paths]
+    return [
+        (f"synthetic-{i:02d}.html", generate_page(i, script_kb=100 + (i % 5) * 400))
+        for i in range(synthetic_pages)
+    ]
+
+
+_URL_TEMPLATES = (
+    "https://jobs.lever.co/{board}",
+    "https://jobs.lever.co/{board}/{uuid}",
+    "https://jobs.lever.co/{board}/{uuid}/apply",
+    "https://jobs.ashbyhq.com/{board}",
+    "https://jobs.ashbyhq.com/{board}/{uuid}",
+    "https://jobs.ashbyhq.com/{board}/{uuid}/application",
+    "https://boards.greenhouse.io/{board}",
+    "https://boards.greenhouse.io/{board}/jobs/{num}",
+    "https://job-boards.greenhouse.io/{board}/jobs/{num}",
+    "https://job-boards.greenhouse.io/{board}",
+    "https://boards.greenhouse.io/{board}/jobs/{num}/apply",
+    "https://jobs.lever.co/{board}/jobs/{num}",
+    "https://www.linkedin.com/jobs/view/{num}",
+    "https://www.ycombinator.com/companies/{board}/jobs/{num}",
+    "https://careers.{board}.com/jobs/{num}/senior-software-engineer",
+    "https://{board}.com/careers/",
+)
+_URL_SUFFIXES = (
+    "", "", "", "/", "?gh_src=abc123", "?utm_source=linkedin&utm_medium=social",
+    "?lever-source=LinkedIn&ref=hn", "#app", "?gh_jid={num}&utm_campaign=spring", "?t=1&page=2",
+)
+
+
+def generate_urls(count: int = 50_000, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    urls = []
+    for _ in range(count):
+        board = rng.choice(("stripe", "openai", "acme-co", "notion", "ramp", "figma", "1password", "linear_app"))
+        url = rng.choice(_URL_TEMPLATES).format(
+            board=board,
+            uuid="%08x-%04x-%04x-%04x-%012x" % tuple(rng.getrandbits(b) for b in (32, 16, 16, 16, 48)),
+            num=rng.randrange(10**6, 10**8),
+        )
+        url += rng.choice(_URL_SUFFIXES).format(num=rng.randrange(10**6, 10**8))
+        if rng.random() < 0.1:
+            scheme, rest = url.split("://", 1)
+            host, _, path = rest.partition("/")
+            url = f"{scheme}://{host.upper()}/{path}"
+        urls.append(url)
+    return urls
+
+
+def load_urls(path: str | None = None, synthetic_count: int = 50_000) -> List[str]:
+    """URLs from a file (one per line), or a synthetic corpus."""
+    if path:
+        return [line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    return generate_urls(synthetic_count)
@@ -0,0 +1,139 @@
+"""
+Benchmark resume-match keyword scoring: the cached per-user resume index with a
+compiled JD keyword set (keyword_match.match_keywords) against the previous
+substring scan of the resume text per keyword, on synthetic resume digests and
+JD keyword sets drawn from the skill vocabulary. Also checks the vector fallback on
+pairs that must (spelling variants) and must not (different skills) match; the
+process exits non-zero if any check fails.
+
+    python -m benchmarks.resume_match_bench [--resumes N] [--keywords N] [--repeat N]
+"""
+from collections import Counter
+import argparse
+import random
+import sys
+import time
+
+from app.keyword_match import compile_keywords, match_keywords, resume_index_cache
+from app.skill_vectors import KNOWN_SKILLS, SKILL_ALIASES, SEMANTIC_MATCH_THRESHOLD, best_similarities, canonical_skill
+
+# (JD keyword, resume skill) pairs for the vector fallback
+SEMANTIC_MATCHES = (
+    ("micro services", "microservices"), ("springboot", "spring boot"), ("java script", "javascript"),
+    ("natural language procesing", "natural language processing"), ("data sciences", "data science"),
+    ("postgressql", "postgresql"), ("full stack", "fullstack"), ("k8s", "kubernetes"),
+)
+SEMANTIC_NON_MATCHES = (
+    ("project management", "product management"), ("amazon web services", "web services"),
+    ("spring boot", "spring"), ("react native", "react"), ("java", "javascript"),
+    ("object oriented design", "object oriented programming"), ("sql server", "sql"),
+)
+
+_FILLER = (
+    "built and operated services for a good team of engineers reviewing code shipping features "
+    "owning on call improving latency and reliability across regions mentoring interns"
+).split()
+
+
+def legacy_match(keywords, resume_digest):
+    """The resume-match keyword loop as it was before keyword_match."""
+    resume_skills_lower = resume_digest.get("skills") or []
+    resume_text = resume_digest.get("keyword_text") or ""
+    jd_keywords = list(set(k.lower().strip() for k in keywords))
+    matched, unmatched = [], []
+    for kw in jd_keywords:
+        if not kw:
+            continue
+        if kw in resume_skills_lower or kw in resume_text:
+            matched.append(kw)
+        else:
+            unmatched.append(kw)
+    return matched, unmatched
+
+
+def _corpus(rng: random.Random, resumes: int, keywords: int):
+    vocabulary = sorted(KNOWN_SKILLS) + sorted(SKILL_ALIASES)
+    digests, keyword_sets = [], []
+    for _ in range(resumes):
+        skills = rng.sample(vocabulary, 25)
+        words = []
+        for _ in range(40):
+            words += rng.sample(_FILLER, 6) + [rng.choice(vocabulary)]
+        digests.append({"skills": skills, "keyword_text": " ".join(words)})
+        keyword_sets.append(rng.sample(vocabulary, keywords))
+    return digests, keyword_sets
+
+
+def _semantic_failures():
+    failures = []
+    for expected, pairs in ((True, SEMANTIC_MATCHES), (False, SEMANTIC_NON_MATCHES)):
+        for keyword, skill in pairs:
+            similarity = float(best_similarities([canonical_skill(keyword)], [canonical_skill(skill)])[0])
+            if (similarity >= SEMANTIC_MATCH_THRESHOLD) != expected:
+                failures.append((keyword, skill, similarity, expected))
+    return failures
+
+
+def _throughput(fn, pairs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for keywords, digest in pairs:
+            fn(keywords, digest)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pairs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--keywords", type=int, default=40, help="JD keywords per match")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    digests, keyword_sets = _corpus(random.Random(0), args.resumes, args.keywords)
+    pairs = list(zip(keyword_sets, digests))
+
+    def new_match(keywords, digest, user_ids={id(d): f"user-{i}" for i, d in enumerate(digests)}):
+        return match_keywords(keywords, resume_index_cache.get(user_ids[id(digest)], digest))
+
+    print(f"{len(pairs)} resume/JD pairs, {args.keywords} keywords each")
+    old_us = _throughput(legacy_match, pairs, args.repeat)
+    resume_index_cache._entries.clear()
+    compile_keywords.cache_clear()
+    start = time.perf_counter()
+    for keywords, digest in pairs:
+        new_match(keywords, digest)
+    cold_us = (time.perf_counter() - start) / len(pairs) * 1e6
+    warm_us = _throughput(new_match, pairs, args.repeat)
+    print(f"  legacy substring scan    {old_us:>9.1f} us/match")
+    print(f"  cold (index + compile)   {cold_us:>9.1f} us/match")
+    print(f"  warm (cached per user)   {warm_us:>9.1f} us/match  ({old_us / warm_us:.1f}x)")
+
+    # Substring hits inside longer words ("go" in "good", "java" in "javascript") are
+    # the expected differences; whole-token matches are the same for both
+    diffs: Counter = Counter()
+    examples = {}
+    for keywords, digest in pairs:
+        old = set(legacy_match(keywords, digest)[0])
+        new = set(new_match(keywords, digest)[0])
+        for kw in old - new:
+            diffs["legacy only"] += 1
+            examples.setdefault("legacy only", kw)
+        for kw in new - old:
+            diffs["new only"] += 1
+            examples.setdefault("new only", kw)
+    print("Differences from legacy matches:" if diffs else "Differences from legacy matches: none")
+    for reason, count in diffs.most_common():
+        print(f"  {reason:<12} {count:>7}  e.g. {examples[reason]!r}")
+
+    failures = _semantic_failures()
+    for keyword, skill, similarity, expected in failures:
+        print(f"  vector fallback: {keyword!r} vs {skill!r} scored {similarity:.2f}, expected {'a match' if expected else 'no match'}")
+    if failures:
+        sys.exit(1)
+    print(f"Vector fallback: {len(SEMANTIC_MATCHES)} variant pairs match, {len(SEMANTIC_NON_MATCHES)} different-skill pairs don't")
+
+
+if __name__ == "__main__":
+    main()
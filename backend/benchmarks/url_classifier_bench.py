@@ -0,0 +1,153 @@
+"""
+Benchmark job URL classification: one classify_job_url call against the
+previous per-purpose helpers (parse_job_board_url's deep-link regexes and
+provider patterns, extract_job_url_info's and infer_job_site_type's hostname
+checks, and the providers' posting-URL regexes), reporting throughput and
+where the two disagree.
+
+    python -m benchmarks.url_classifier_bench [--urls FILE] [--count N] [--repeat N]
+"""
+from collections import Counter
+from urllib.parse import urlparse, urlunparse
+import argparse
+import re
+import time
+
+from app.job_urls import classify_job_url
+from benchmarks.corpus import load_urls
+
+LEGACY_BOARD_URL_PATTERNS = {
+    "ashby": re.compile(r"^https?://jobs\.ashbyhq\.com/([a-zA-Z0-9_-]+)/?$"),
+    "lever": re.compile(r"^https?://jobs\.lever\.co/([a-zA-Z0-9_-]+)/?$"),
+    "greenhouse": re.compile(r"^https?://boards\.greenhouse\.io/([a-zA-Z0-9_-]+)/?$"),
+}
+LEGACY_DEEP_LINK_PATTERNS = [r"/jobs/", r"/apply", r"/application", r"/job/", r"/posting/", r"/\d+$"]
+LEGACY_JOB_URL_RES = {
+    "ashby": re.compile(r"^https?://jobs\.ashbyhq\.com/([^/?#]+)/([0-9a-f-]{36})", re.IGNORECASE),
+    "lever": re.compile(r"^https?://jobs\.lever\.co/([^/?#]+)/([0-9a-f-]{36})", re.IGNORECASE),
+    "greenhouse": re.compile(r"^https?://(?:job-)?boards\.greenhouse\.io/([^/?#]+)/jobs/(\d+)", re.IGNORECASE),
+}
+
+
+def legacy_parse_job_board_url(url: str):
+    """parse_job_board_url as it was: (provider, board_identifier) or None."""
+    parsed = urlparse(url)
+    hostname = parsed.netloc.lower()
+    path = parsed.path
+    clean_url = f"{parsed.scheme}://{hostname}{path}".rstrip("/")
+    for pattern in LEGACY_DEEP_LINK_PATTERNS:
+        if re.search(pattern, path, re.IGNORECASE):
+            return None
+    for provider, pattern in LEGACY_BOARD_URL_PATTERNS.items():
+        match = pattern.match(clean_url)
+        if match:
+            return (provider, match.group(1)) if 2 <= len(match.group(1)) <= 100 else None
+    return None
+
+
+def legacy_extract_job_url_info(url: str) -> dict:
+    parsed = urlparse(url)
+    hostname = parsed.netloc.lower()
+    path = parsed.path
+    if "jobs.lever.co" in hostname:
+        job_board = "lever"
+        if path.rstrip('/').endswith('/apply'):
+            page_type, base_path = "application", path.rstrip('/').rsplit('/apply', 1)[0]
+        else:
+            page_type, base_path = "jd", path
+    elif "jobs.ashbyhq.com" in hostname:
+        job_board = "ashby"
+        if path.rstrip('/').endswith('/application'):
+            page_type, base_path = "application", path.rstrip('/').rsplit('/application', 1)[0]
+        else:
+            page_type, base_path = "jd", path
+    elif "boards.greenhouse.io" in hostname or "job-boards.greenhouse.io" in hostname:
+        job_board, page_type, base_path = "greenhouse", "combined", path
+    else:
+        job_board, page_type, base_path = "other", "unknown", path
+    base_url = urlunparse((parsed.scheme.lower(), hostname, base_path.rstrip('/') or '/', '', '', ''))
+    return {"job_board": job_board, "base_url": base_url, "page_type": page_type}
+
+
+def legacy_infer_job_site_type(url: str) -> str:
+    hostname = urlparse(url).netloc.lower()
+    if "linkedin.com" in hostname:
+        return "linkedin"
+    if "ycombinator.com" in hostname:
+        return "y-combinator"
+    if any(d in hostname for d in ("boards.greenhouse.io", "job-boards.greenhouse.io", "jobs.ashbyhq.com", "jobs.lever.co")):
+        return "job-board"
+    return "careers page"
+
+
+def legacy_parse_job_url(url: str):
+    """The providers' parse_job_url, tried in registry order: (provider, board, job_id) or None."""
+    for provider, pattern in LEGACY_JOB_URL_RES.items():
+        match = pattern.match(url)
+        if match:
+            return provider, match.group(1), match.group(2).lower()
+    return None
+
+
+def legacy_classify(url: str) -> tuple:
+    """Everything discovery, ingest and status lookups derive from a URL, the old way."""
+    return (
+        legacy_parse_job_board_url(url),
+        legacy_extract_job_url_info(url),
+        legacy_infer_job_site_type(url),
+        legacy_parse_job_url(url),
+    )
+
+
+def _throughput(fn, urls, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url in urls:
+            fn(url)
+        best = min(best, time.perf_counter() - start)
+    return len(urls) / best
+
+
+def _disagreements(urls) -> Counter:
+    """Counts of (field, example URL) where the classifier and the legacy helpers differ."""
+    diffs: Counter = Counter()
+    examples = {}
+    for url in urls:
+        old_board, old_info, old_site, old_posting = legacy_classify(url)
+        new = classify_job_url(url)
+        checks = {
+            "board root": old_board == ((new.provider, new.board_identifier) if new.page_type == "board" else None),
+            "site type": old_site == new.site_type,
+            "posting": old_posting == ((new.provider, new.board_identifier, new.job_id) if new.job_id else None),
+            "job board": old_info["job_board"] == (new.provider or "other"),
+        }
+        for field, same in checks.items():
+            if not same:
+                diffs[field] += 1
+                examples.setdefault(field, url)
+    for field, url in examples.items():
+        print(f"  {field:<11} {diffs[field]:>7} differ, e.g. {url}")
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", help="file with one URL per line (default: synthetic corpus)")
+    parser.add_argument("--count", type=int, default=50_000, help="synthetic corpus size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    urls = load_urls(args.urls, args.count)
+    old_rate = _throughput(legacy_classify, urls, args.repeat)
+    new_rate = _throughput(classify_job_url, urls, args.repeat)
+    print(f"{len(urls)} URLs")
+    print(f"  legacy helpers   {old_rate:>12,.0f} URLs/s")
+    print(f"  classify_job_url {new_rate:>12,.0f} URLs/s  ({new_rate / old_rate:.1f}x)")
+    print("Disagreements (legacy vs classifier):")
+    if not _disagreements(urls):
+        print("  none")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+-- Precomputed resume digest (normalized skills, years of experience, latest role,
+-- education summary, token-budgeted summary string), built after resume parsing.
+-- Consumed by the autofill prompt builder and /extension/resume-match.
+ALTER TABLE public.users ADD COLUMN IF NOT EXISTS resume_digest jsonb;
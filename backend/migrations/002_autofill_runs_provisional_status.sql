@@ -0,0 +1,5 @@
+-- Speculative autofill plans warmed at ingest time are stored as 'provisional'
+-- and promoted to 'completed' by /extension/autofill/plan once the live form is confirmed.
+ALTER TABLE public.autofill_runs DROP CONSTRAINT IF EXISTS autofill_runs_status_check;
+ALTER TABLE public.autofill_runs ADD CONSTRAINT autofill_runs_status_check
+  CHECK (status = ANY (ARRAY['running'::text, 'completed'::text, 'failed'::text, 'submitted'::text, 'provisional'::text]));
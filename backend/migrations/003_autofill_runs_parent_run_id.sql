@@ -0,0 +1,5 @@
+-- Delta planning: a run planned from a previous run for the same job application
+-- (next page of a multi-page form, or a form that revealed more fields) points at it.
+ALTER TABLE public.autofill_runs ADD COLUMN IF NOT EXISTS parent_run_id uuid REFERENCES public.autofill_runs(id);
+CREATE INDEX IF NOT EXISTS autofill_runs_job_application_created_idx
+  ON public.autofill_runs (job_application_id, user_id, created_at DESC);
@@ -0,0 +1,12 @@
+-- Content-addressed cache of resume parses: an upload whose sha256 matches a file the
+-- user already uploaded reuses the stored text/profile instead of re-running PDF
+-- extraction and the Gemini parse.
+CREATE TABLE IF NOT EXISTS public.resume_parse_cache (
+  user_id uuid NOT NULL,
+  content_hash text NOT NULL,
+  resume_text text,
+  resume_profile jsonb NOT NULL,
+  created_at timestamp with time zone DEFAULT now(),
+  CONSTRAINT resume_parse_cache_pkey PRIMARY KEY (user_id, content_hash),
+  CONSTRAINT resume_parse_cache_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,12 @@
+-- Persistent cache of Serper.dev result pages for job board discovery. Each row is one
+-- paid SERP call (query + site filter + page size + page number); discovery reuses a
+-- row younger than SERP_CACHE_TTL_HOURS instead of paying for the same page again.
+CREATE TABLE IF NOT EXISTS public.serp_cache (
+  query text NOT NULL,
+  site_filter text NOT NULL,
+  num integer NOT NULL,
+  page integer NOT NULL DEFAULT 1,
+  urls jsonb NOT NULL DEFAULT '[]'::jsonb,
+  fetched_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT serp_cache_pkey PRIMARY KEY (query, site_filter, num, page)
+);
@@ -0,0 +1,5 @@
+-- run_discovery upserts boards with ON CONFLICT (provider, board_identifier), which needs
+-- a unique index on that pair. Discovery already deduplicated boards by it, so existing
+-- data satisfies the constraint.
+CREATE UNIQUE INDEX IF NOT EXISTS company_boards_provider_board_identifier_key
+  ON public.company_boards (provider, board_identifier);
@@ -0,0 +1,30 @@
+-- normalize_url now maps job-boards.greenhouse.io to boards.greenhouse.io and also drops
+-- the lever-source, lever-origin, trackingId and trkInfo parameters. Rewrite keys stored
+-- by the previous version so re-ingesting or re-planning those jobs still finds the
+-- existing rows.
+UPDATE public.job_applications
+SET normalized_url = regexp_replace(normalized_url, '^(https?://)job-boards\.greenhouse\.io/', '\1boards.greenhouse.io/')
+WHERE normalized_url ~ '^https?://job-boards\.greenhouse\.io/';
+
+UPDATE public.autofill_runs
+SET page_url = regexp_replace(page_url, '^(https?://)job-boards\.greenhouse\.io/', '\1boards.greenhouse.io/')
+WHERE page_url ~ '^https?://job-boards\.greenhouse\.io/';
+
+-- Stored keys have no fragment and a sorted query, so dropping pieces keeps the order
+-- normalize_url would produce; the '?' goes too when nothing is left.
+CREATE FUNCTION pg_temp.strip_new_tracking_params(url text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT split_part(url, '?', 1) || coalesce('?' || (
+        SELECT string_agg(piece, '&' ORDER BY position)
+        FROM regexp_split_to_table(split_part(url, '?', 2), '&') WITH ORDINALITY AS q(piece, position)
+        WHERE lower(split_part(piece, '=', 1)) NOT IN ('lever-source', 'lever-origin', 'trackingid', 'trkinfo')
+    ), '')
+$$;
+
+UPDATE public.job_applications
+SET normalized_url = pg_temp.strip_new_tracking_params(normalized_url)
+WHERE normalized_url ~* '[?&](lever-source|lever-origin|trackingid|trkinfo)=';
+
+UPDATE public.autofill_runs
+SET page_url = pg_temp.strip_new_tracking_params(page_url)
+WHERE page_url ~* '[?&](lever-source|lever-origin|trackingid|trkinfo)=';
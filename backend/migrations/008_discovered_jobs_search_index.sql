@@ -0,0 +1,28 @@
+-- Search index for the public /jobs listing.
+--
+-- search_vector is regenerated with weights so ts_rank orders title matches above
+-- department/team, location and description matches (A > B > C > D). GIN indexes serve
+-- the full-text match and, through pg_trgm, the ILIKE '%...%' substring filters on
+-- location and company name; the partial index serves the default newest-first order.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.discovered_jobs DROP COLUMN IF EXISTS search_vector;
+ALTER TABLE public.discovered_jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(department, '') || ' ' || coalesce(team, '')), 'B') ||
+  setweight(to_tsvector('english', coalesce(location, '')), 'C') ||
+  setweight(to_tsvector('english', coalesce(description, '')), 'D')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS discovered_jobs_search_vector_idx
+  ON public.discovered_jobs USING gin (search_vector);
+
+CREATE INDEX IF NOT EXISTS discovered_jobs_location_trgm_idx
+  ON public.discovered_jobs USING gin (location gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS company_boards_company_name_trgm_idx
+  ON public.company_boards USING gin (company_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS discovered_jobs_active_posted_at_idx
+  ON public.discovered_jobs (posted_at DESC NULLS LAST)
+  WHERE is_active = true;
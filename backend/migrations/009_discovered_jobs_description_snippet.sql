@@ -0,0 +1,5 @@
+-- Plain-text description preview for the /jobs listing, computed by sync_single_board
+-- (tags and entities stripped, cut at a word boundary). The listing returns this instead
+-- of the full provider HTML; GET /jobs/{job_id} serves the full description. Existing
+-- rows get their snippet on the next sync of their board.
+ALTER TABLE public.discovered_jobs ADD COLUMN IF NOT EXISTS description_snippet text;
@@ -0,0 +1,22 @@
+-- Inverted index of skills mentioned in active discovered jobs, for /jobs/recommendations.
+--
+-- sync_single_board extracts known skills from each posting's title (weight 3) and
+-- description (weight 1) and rewrites a job's rows only when that set changes
+-- (skill_index_hash); rows of jobs that go stale are removed. Recommendations look up
+-- the user's skills by the primary key and aggregate per job, instead of scanning
+-- discovered_jobs. skill_weight_total normalizes scores so postings that list every
+-- technology don't outrank focused ones; visa_sponsorship is the stance stated in the
+-- description (NULL when it doesn't say).
+ALTER TABLE public.discovered_jobs ADD COLUMN IF NOT EXISTS skill_index_hash text;
+ALTER TABLE public.discovered_jobs ADD COLUMN IF NOT EXISTS skill_weight_total integer NOT NULL DEFAULT 0;
+ALTER TABLE public.discovered_jobs ADD COLUMN IF NOT EXISTS visa_sponsorship boolean;
+
+CREATE TABLE IF NOT EXISTS public.job_skill_index (
+  skill text NOT NULL,
+  job_id uuid NOT NULL,
+  weight smallint NOT NULL DEFAULT 1,
+  CONSTRAINT job_skill_index_pkey PRIMARY KEY (skill, job_id) INCLUDE (weight),
+  CONSTRAINT job_skill_index_job_id_fkey FOREIGN KEY (job_id) REFERENCES public.discovered_jobs(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS job_skill_index_job_id_idx ON public.job_skill_index (job_id);
@@ -0,0 +1,5 @@
+-- sha256 of the user's current resume file, written in the same UPDATE that stores the
+-- upload's path. The resume worker only stores a parse whose file hash still matches, so
+-- a slow parse of an older upload can't overwrite a newer one, even when both uploads
+-- had the same filename (and so the same storage path).
+ALTER TABLE public.users ADD COLUMN IF NOT EXISTS resume_content_hash text;
@@ -0,0 +1,4 @@
+-- Hash of the title and description a job was last processed from. sync_single_board
+-- skips text extraction, snippet, sponsorship and skill extraction for postings whose
+-- content hasn't changed since the previous sync, and only refreshes their metadata.
+ALTER TABLE public.discovered_jobs ADD COLUMN IF NOT EXISTS content_hash text;
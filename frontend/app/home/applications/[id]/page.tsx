@@ -15,6 +15,7 @@ import {
   Globe,
   CheckCircle2,
   XCircle,
+  HelpCircle,
   FileText,
   Sparkles,
   Send,
@@ -30,7 +31,7 @@ interface JobApplication {
   status: string
   application_date: string
   job_site_type: string
-  open_to_visa_sponsorship: boolean
+  open_to_visa_sponsorship: boolean | null
   url: string
   job_description: string
   required_skills: string[]
@@ -407,16 +408,21 @@ export default function ApplicationDetailPage() {
             <div className="flex items-center justify-between">
               <span className="text-sm text-muted-foreground">Visa Sponsorship</span>
               <span className="flex items-center gap-1.5">
-                {application.open_to_visa_sponsorship ? (
+                {application.open_to_visa_sponsorship === true ? (
                   <>
                     <CheckCircle2 className="h-4 w-4 text-green-600" />
                     <span className="text-sm text-green-600">Available</span>
                   </>
-                ) : (
+                ) : application.open_to_visa_sponsorship === false ? (
                   <>
                     <XCircle className="h-4 w-4 text-muted-foreground" />
                     <span className="text-sm text-muted-foreground">Not available</span>
                   </>
+                ) : (
+                  <>
+                    <HelpCircle className="h-4 w-4 text-muted-foreground" />
+                    <span className="text-sm text-muted-foreground">Not stated</span>
+                  </>
                 )}
               </span>
             </div>
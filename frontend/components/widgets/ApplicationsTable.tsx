@@ -26,7 +26,7 @@ import {
   DropdownMenuItem,
   DropdownMenuTrigger,
 } from "@/components/ui/dropdown-menu"
-import { CheckCircle2, XCircle, ExternalLink, Search, MoreHorizontal, ArrowUpDown, ChevronLeft, ChevronRight, Eye } from "lucide-react"
+import { CheckCircle2, XCircle, HelpCircle, ExternalLink, Search, MoreHorizontal, ArrowUpDown, ChevronLeft, ChevronRight, Eye } from "lucide-react"
 import Link from "next/link"
 
 interface JobApplication {
@@ -36,7 +36,7 @@ interface JobApplication {
   status: string
   application_date: string
   job_site_type: string
-  open_to_visa_sponsorship: boolean
+  open_to_visa_sponsorship: boolean | null
   url: string
 }
 
@@ -256,10 +256,14 @@ export function ApplicationsTable({ applications }: ApplicationsTableProps) {
                       <span className="capitalize text-sm">{app.job_site_type}</span>
                     </TableCell>
                     <TableCell>
-                      {app.open_to_visa_sponsorship ? (
-                        <CheckCircle2 className="h-5 w-5 text-green-600" />
+                      {app.open_to_visa_sponsorship === true ? (
+                        <CheckCircle2 className="h-5 w-5 text-green-600" aria-label="Sponsorship available" />
+                      ) : app.open_to_visa_sponsorship === false ? (
+                        <XCircle className="h-5 w-5 text-muted-foreground/50" aria-label="Sponsorship not available" />
                       ) : (
-                        <XCircle className="h-5 w-5 text-muted-foreground/50" />
+                        <span title="Not stated in the posting">
+                          <HelpCircle className="h-5 w-5 text-muted-foreground/30" aria-label="Sponsorship not stated" />
+                        </span>
                       )}
                     </TableCell>
                     <TableCell>
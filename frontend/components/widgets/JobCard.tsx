@@ -93,9 +93,9 @@ export function JobCard({ job }: JobCardProps) {
         )}
 
         {/* Description preview */}
-        {job.description && (
+        {job.description_snippet && (
           <p className="text-sm text-muted-foreground line-clamp-2 mb-4">
-            {job.description.replace(/<[^>]*>/g, "").slice(0, 150)}
+            {job.description_snippet}
           </p>
         )}
 
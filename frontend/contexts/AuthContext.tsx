@@ -17,7 +17,7 @@ interface JobApplication {
   user_id: string
   job_title: string
   company: string
-  job_posted: string
+  job_posted: string | null
   job_description: string
   url: string
   required_skills: string[]
@@ -26,7 +26,7 @@ interface JobApplication {
   experience_requirements: string[]
   keywords: string[]
   job_site_type: string
-  open_to_visa_sponsorship: boolean
+  open_to_visa_sponsorship: boolean | null
   status: string
   notes: string | null
   application_date: string
@@ -17,10 +17,29 @@ export interface DiscoveredJob {
   department: string | null;
   team: string | null;
   apply_url: string;
-  description: string | null;
+  /** Plain-text preview; the full description comes from GET /jobs/{id} */
+  description_snippet: string | null;
   posted_at: string | null;
 }
 
+/** GET /jobs/{id} */
+export interface DiscoveredJobDetail extends DiscoveredJob {
+  /** Full posting body as HTML */
+  description: string | null;
+}
+
+/** GET /jobs/recommendations */
+export interface RecommendedJob extends DiscoveredJob {
+  score: number;
+  matched_skills: string[];
+  location_match: boolean;
+}
+
+export interface JobRecommendationsResponse {
+  jobs: RecommendedJob[];
+  resume_skills: string[];
+}
+
 export interface JobsListResponse {
   jobs: DiscoveredJob[];
   total_count: number;
@@ -35,13 +35,15 @@ CREATE TABLE public.autofill_runs (
   dom_captured_at timestamp with time zone DEFAULT now(),
   plan_json jsonb,
   plan_summary jsonb,
-  status text NOT NULL DEFAULT 'planned'::text CHECK (status = ANY (ARRAY['running'::text, 'completed'::text, 'failed'::text, 'submitted'::text])),
+  status text NOT NULL DEFAULT 'planned'::text CHECK (status = ANY (ARRAY['running'::text, 'completed'::text, 'failed'::text, 'submitted'::text, 'provisional'::text])),
   created_at timestamp with time zone DEFAULT now(),
   updated_at timestamp with time zone DEFAULT now(),
   dom_html_hash text,
+  parent_run_id uuid,
   CONSTRAINT autofill_runs_pkey PRIMARY KEY (id),
   CONSTRAINT autofill_runs_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id),
-  CONSTRAINT autofill_runs_job_application_id_fkey FOREIGN KEY (job_application_id) REFERENCES public.job_applications(id)
+  CONSTRAINT autofill_runs_job_application_id_fkey FOREIGN KEY (job_application_id) REFERENCES public.job_applications(id),
+  CONSTRAINT autofill_runs_parent_run_id_fkey FOREIGN KEY (parent_run_id) REFERENCES public.autofill_runs(id)
 );
 CREATE TABLE public.extension_connect_codes (
   id uuid NOT NULL DEFAULT gen_random_uuid(),
@@ -78,6 +80,24 @@ CREATE TABLE public.job_applications (
   CONSTRAINT job_applications_pkey PRIMARY KEY (id),
   CONSTRAINT job_applications_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id)
 );
+CREATE TABLE public.resume_parse_cache (
+  user_id uuid NOT NULL,
+  content_hash text NOT NULL,
+  resume_text text,
+  resume_profile jsonb NOT NULL,
+  created_at timestamp with time zone DEFAULT now(),
+  CONSTRAINT resume_parse_cache_pkey PRIMARY KEY (user_id, content_hash),
+  CONSTRAINT resume_parse_cache_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE
+);
+CREATE TABLE public.serp_cache (
+  query text NOT NULL,
+  site_filter text NOT NULL,
+  num integer NOT NULL,
+  page integer NOT NULL DEFAULT 1,
+  urls jsonb NOT NULL DEFAULT '[]'::jsonb,
+  fetched_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT serp_cache_pkey PRIMARY KEY (query, site_filter, num, page)
+);
 CREATE TABLE public.site_configs (
   site_key text NOT NULL,
   config jsonb NOT NULL,
@@ -124,8 +144,10 @@ CREATE TABLE public.users (
   disability_status text,
   resume_text text,
   resume_profile jsonb,
+  resume_digest jsonb,
   resume_parsed_at timestamp with time zone,
   resume_parse_status text,
+  resume_content_hash text,
   CONSTRAINT users_pkey PRIMARY KEY (id),
   CONSTRAINT users_id_fkey FOREIGN KEY (id) REFERENCES auth.users(id)
 );
\ No newline at end of file